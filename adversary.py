@@ -0,0 +1,132 @@
+import letterutils
+
+from gamesession import GameSession, MAX_GUESSES
+
+
+class CandidateIndex:
+    '''
+    The answers that are still consistent with every guess in an adversarial game, held as packed words (see letterutils.encode_word).
+    Each guess splits the candidates into buckets by their packed score (see letterutils.score_code), and the index
+    shrinks to the bucket it keeps, so later guesses only score the answers that are left.
+    Usage:
+        index = CandidateIndex(possible_answers)
+        index.narrow(letterutils.encode_word("raise"))    # packed score of the largest bucket
+        len(index)                                         # number of answers still possible
+    '''
+
+    __slots__ = ("_codes", "_all_correct")
+
+    def __init__(self, possible_answers):
+        '''
+        Arguments:
+            possible_answers: the answers to start from. Must all be the same length
+        Raises: ValueError if there are no answers or they are of different lengths
+        '''
+        if possible_answers == None or len(possible_answers) == 0:
+            raise ValueError("No answers to choose from")
+
+        length = len(possible_answers[0])
+        if any(len(answer) != length for answer in possible_answers):
+            raise ValueError("Answers must all be the same length")
+
+        self._codes = [letterutils.encode_word(answer) for answer in possible_answers]
+        self._all_correct = letterutils.all_correct(length)
+
+
+    def __len__(self):
+        return len(self._codes)
+
+
+    @property
+    def codes(self):
+        ''' List of the packed answers still possible '''
+        return self._codes
+
+
+    def words(self):
+        '''
+        Gets the answers still possible
+        Returns: list of words
+        '''
+        return [letterutils.decode_word(code) for code in self._codes]
+
+
+    def buckets(self, word_code):
+        '''
+        Groups the candidates by the score a guess would get against each of them
+        Arguments:
+            word_code: the packed guess
+        Returns: dictionary of packed score to the list of packed answers giving that score
+        '''
+        score_code = letterutils.score_code
+        buckets = {}
+        for answer_code in self._codes:
+            score = score_code(word_code, answer_code)
+            bucket = buckets.get(score)
+            if bucket == None:
+                buckets[score] = [answer_code]
+            else:
+                bucket.append(answer_code)
+        return buckets
+
+
+    def narrow(self, word_code):
+        '''
+        Keeps the largest bucket of candidates for a guess (see buckets).
+        Ties go to the bucket that reveals least: a win is only given up when there's no other choice,
+        then the lowest score (fewest correct letters) is kept
+        Arguments:
+            word_code: the packed guess
+        Returns: the packed score of the bucket that was kept
+        '''
+        all_correct = self._all_correct
+        buckets = self.buckets(word_code)
+        score = max(buckets, key=lambda score: (len(buckets[score]), score != all_correct, -score))
+        self._codes = buckets[score]
+        return score
+
+
+class AdversarialSession(GameSession):
+    '''
+    A GameSession that doesn't pick its answer up front ("Absurdle").
+    After each guess it keeps the largest group of possible answers consistent with all of the feedback so far (see CandidateIndex),
+    so the player only wins once the answers have been narrowed down to the word they guess.
+    The answer reported by the session is always one of the remaining candidates.
+    Usage:
+        session = AdversarialSession(possible_answers, word_index)
+        session.submit_guess("raise")
+        session.candidate_count
+    '''
+
+    __slots__ = ("_candidates",)
+
+    def __init__(self, possible_answers, word_index=None, max_guesses=MAX_GUESSES, hard=False):
+        '''
+        Arguments:
+            possible_answers: the answers that the game could end up using. Must all be the same length
+            [optional] word_index: the WordIndex used to validate guesses. If missing then any naively valid word is accepted
+            [optional] max_guesses: the number of guesses allowed
+            [optional] hard: hard mode, where every guess must be consistent with all of the hints revealed so far
+        '''
+        candidates = CandidateIndex(possible_answers)
+        super().__init__(possible_answers[0], word_index, max_guesses, hard)
+        self._candidates = candidates
+        self._answer_code = candidates.codes[0]
+
+
+    @property
+    def candidate_count(self):
+        ''' The number of answers still consistent with every guess '''
+        return len(self._candidates)
+
+
+    @property
+    def candidates(self):
+        ''' The CandidateIndex of the answers still possible '''
+        return self._candidates
+
+
+    def _score(self, word_code):
+        score_code = self._candidates.narrow(word_code)
+        self._answer_code = self._candidates.codes[0]
+        return score_code
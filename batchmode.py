@@ -0,0 +1,152 @@
+import letterutils
+import sys
+
+# Read/write buffer size used when streaming files
+BUFFER_SIZE = 1 << 20
+
+# Most logs only use a few thousand distinct words and answers so packed words and scores are memoised,
+# up to this many entries each (the caches are simply emptied when they fill up, to keep memory use constant)
+MAX_CACHED = 1 << 16
+
+# Digit string for every packed score (see letterutils.encode_score), so formatting a score is a lookup.
+# Built for each word length the first time it's used
+_score_strings = {}
+
+
+def score_strings(length):
+    '''
+    Gets the digit strings for every packed score of a word length
+    Arguments:
+        length: the number of letters
+    Returns: tuple of digit strings, indexed by packed score
+    '''
+    strings = _score_strings.get(length)
+    if strings == None:
+        strings = tuple(letterutils.score_to_string(letterutils.decode_score(code, length))
+                        for code in range(letterutils.all_correct(length) + 1))
+        _score_strings[length] = strings
+    return strings
+
+
+def read_lines(stream):
+    '''
+    Reads a stream one line at a time, skipping blank lines and # comments
+    Arguments:
+        stream: the text stream to read
+    Returns: generator of (line number, line) tuples, with the line stripped of surrounding whitespace
+    '''
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if len(line) == 0 or line.startswith("#"):
+            continue
+        yield (line_number, line)
+
+
+def score_lines(lines):
+    '''
+    Scores each line of a batch. Every line holds an answer followed by one or more guesses, so either
+    a single "answer guess" pair or a whole game transcript "answer guess1 guess2 ..."
+    Answers can be any supported length (see letterutils.is_supported_length), with guesses of the same length
+    Arguments:
+        lines: iterable of (line number, line) tuples (see read_lines)
+    Returns: generator of (line number, answer, list of (guess, packed score) tuples, error) tuples. On success error is None,
+             otherwise it describes why the line couldn't be scored
+    '''
+    # Scores are kept packed (see letterutils.score_code) rather than going through score_word's lists of LetterStates
+    encode_word = letterutils.encode_word
+    score_code = letterutils.score_code
+    is_valid = letterutils.is_word_naively_valid
+    word_codes = {}
+    scores = {}
+
+    def encode(word):
+        code = word_codes.get(word)
+        if code == None:
+            if len(word_codes) >= MAX_CACHED:
+                word_codes.clear()
+            code = encode_word(word)
+            word_codes[word] = code
+        return code
+
+    # Memo keys hold the packed guess above the packed answer, with room for the longest supported words
+    shift = letterutils.BITS_PER_LETTER * letterutils.MAX_WORD_LENGTH
+
+    def score(guess, answer_code):
+        guess_code = encode(guess)
+        key = (guess_code << shift) | answer_code
+        code = scores.get(key)
+        if code == None:
+            if len(scores) >= MAX_CACHED:
+                scores.clear()
+            code = score_code(guess_code, answer_code)
+            scores[key] = code
+        return code
+
+    for line_number, line in lines:
+        words = line.lower().split()
+        if len(words) < 2:
+            yield (line_number, None, [], "expected an answer followed by at least one guess")
+            continue
+
+        answer = words[0]
+        length = len(answer) if letterutils.is_supported_length(len(answer)) else letterutils.WORD_LENGTH
+        invalid = [word for word in words if not is_valid(word, length)]
+        if len(invalid) > 0:
+            yield (line_number, answer, [], f"invalid word: {invalid[0]}")
+            continue
+
+        answer_code = encode(answer)
+        yield (line_number, answer, [(guess, score(guess, answer_code)) for guess in words[1:]], None)
+
+
+def format_results(results):
+    '''
+    Formats scored lines as compact plain-text, one output line per input line:
+        <answer> <guess> <score> [<guess> <score> ...]
+    where each score has one digit per letter (0 = wrong, 1 = wrong place, 2 = correct, see letterutils.score_to_string).
+    Lines that couldn't be scored become "ERR <line number> <reason>"
+    Arguments:
+        results: iterable of scored lines (see score_lines)
+    Returns: generator of output lines, including their line endings
+    '''
+    for line_number, answer, guesses, error in results:
+        if error != None:
+            yield f"ERR {line_number} {error}\n"
+        else:
+            strings = score_strings(len(answer))
+            yield answer + "".join([f" {guess} {strings[score]}" for guess, score in guesses]) + "\n"
+
+
+def process(input_stream, output_stream):
+    '''
+    Streams a batch of guesses from one stream to another. Only one line is held in memory at a time
+    so arbitrarily large inputs can be processed.
+    Arguments:
+        input_stream: the text stream to read the answers and guesses from
+        output_stream: the text stream to write the results to
+    Returns: the number of lines that couldn't be scored
+    '''
+    errors = 0
+    for line in format_results(score_lines(read_lines(input_stream))):
+        if line.startswith("ERR "):
+            errors += 1
+        output_stream.write(line)
+    output_stream.flush()
+    return errors
+
+
+def run(path):
+    '''
+    Scores a batch file (or stdin) and writes the results to stdout
+    Arguments:
+        path: the file to read, or "-" for stdin
+    Returns: the number of lines that couldn't be scored
+    '''
+    output_stream = open(sys.stdout.fileno(), "w", buffering=BUFFER_SIZE, encoding="ascii", errors="replace", closefd=False)
+    if path == "-":
+        input_stream = open(sys.stdin.fileno(), buffering=BUFFER_SIZE, encoding="utf-8", errors="replace", closefd=False)
+    else:
+        input_stream = open(path, buffering=BUFFER_SIZE, encoding="utf-8", errors="replace")
+
+    with input_stream, output_stream:
+        return process(input_stream, output_stream)
@@ -0,0 +1,94 @@
+import numpy as np
+
+# Number of guesses to score per vectorised block (keeps the temporary arrays small)
+CHUNK_SIZE = 256
+
+
+def encode_words(words):
+    '''
+    Converts a list of equal length words into an (n, length) array of letter values (a=0 ... z=25)
+    Arguments:
+        words: the words to encode (any case). If this is already an encoded array it is returned unchanged
+    Returns: the (n, length) uint8 array
+    Raises: ValueError if the words are of different lengths or contain characters other than a-z | A-Z
+    '''
+    if isinstance(words, np.ndarray):
+        return words
+
+    if len(words) == 0:
+        return np.zeros((0, 5), dtype=np.uint8)
+
+    length = len(words[0])
+    try:
+        data = "".join(words).lower().encode("ascii")
+    except UnicodeEncodeError:
+        raise ValueError("Words must only contain the letters a-z")
+    if len(data) != length * len(words):
+        raise ValueError("Words must all be the same length")
+
+    letters = np.frombuffer(data, dtype=np.uint8).reshape(len(words), length) - np.uint8(ord("a"))
+    if (letters > 25).any():
+        raise ValueError("Words must only contain the letters a-z")
+    return letters
+
+
+def score_matrix(guesses, answers):
+    '''
+    Scores every guess against every answer, matching the two-pass algorithm used by letterutils.score_word
+    (so repeated letters only score WRONG_PLACE as many times as they appear unmatched in the answer).
+    Arguments:
+        guesses: list of n guess words, or an array from encode_words
+        answers: list of m answer words, or an array from encode_words
+    Returns: (n, m) array of base-3 packed scores (see letterutils.encode_score). uint8 for words of up to 5 letters, otherwise uint16
+    '''
+    guess_letters = encode_words(guesses)
+    answer_letters = encode_words(answers)
+
+    num_guesses = guess_letters.shape[0]
+    num_answers = answer_letters.shape[0]
+    length = guess_letters.shape[1]
+    if num_answers > 0 and answer_letters.shape[1] != length:
+        raise ValueError("Guesses and answers must be the same length")
+
+    # 3^5 scores fit in a byte, longer words need two
+    dtype = np.uint8 if 3 ** length <= 256 else np.uint16
+    patterns = np.empty((num_guesses, num_answers), dtype=dtype)
+
+    answer_block = answer_letters[None, :, :]
+    for start in range(0, num_guesses, CHUNK_SIZE):
+        guess_block = guess_letters[start:start + CHUNK_SIZE][:, None, :]
+        correct = guess_block == answer_block
+        not_correct = ~correct
+
+        codes = np.zeros((guess_block.shape[0], num_answers), dtype=dtype)
+        for i in range(length):
+            letter = guess_block[:, :, i]
+
+            # How many of this letter in the answer haven't been used up by a correct match?
+            available = np.zeros(codes.shape, dtype=np.uint8)
+            for j in range(length):
+                available += (answer_block[:, :, j] == letter) & not_correct[:, :, j]
+
+            # How many earlier (non-correct) guesses of this letter have already claimed one?
+            claimed = np.zeros(codes.shape, dtype=np.uint8)
+            for k in range(i):
+                claimed += (guess_block[:, :, k] == letter) & not_correct[:, :, k]
+
+            wrong_place = not_correct[:, :, i] & (available > claimed)
+            digit = correct[:, :, i].astype(np.uint8) * np.uint8(2) + wrong_place
+            codes += digit * dtype(3 ** i)
+
+        patterns[start:start + guess_block.shape[0]] = codes
+
+    return patterns
+
+
+def score_batch(guess, answers):
+    '''
+    Scores a single guess against many answers at once
+    Arguments:
+        guess: the guessed word
+        answers: list of m answer words, or an array from encode_words
+    Returns: (m,) array of base-3 packed scores (see letterutils.encode_score and score_matrix)
+    '''
+    return score_matrix([guess], answers)[0]
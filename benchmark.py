@@ -0,0 +1,277 @@
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# Number of times each benchmark is repeated. The median time is reported
+DEFAULT_REPEAT = 5
+
+# Number of guesses scored against every answer by the scoring benchmark (-full scores every valid word)
+DEFAULT_SCORE_GUESSES = 100
+
+# Allowed slowdown before compare_results reports a regression
+DEFAULT_TOLERANCE = 0.10
+
+WORDPY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordpy.py")
+
+
+def measure(function, repeat=DEFAULT_REPEAT):
+    '''
+    Times a function
+    Arguments:
+        function: the function to time. Called with no arguments
+        [optional] repeat: the number of times to call it
+    Returns: the list of wall times taken by each call, in seconds
+    '''
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def make_result(name, times, operations):
+    '''
+    Summarises the timings of a benchmark
+    Arguments:
+        name: the name of the benchmark
+        times: the wall time of each run in seconds
+        operations: the number of operations performed by each run
+    Returns: dictionary of the results, ready to be written as json
+    '''
+    median = statistics.median(times)
+    return {
+        "name": name,
+        "operations": operations,
+        "runs": len(times),
+        "median_seconds": median,
+        "min_seconds": min(times),
+        "max_seconds": max(times),
+        "ops_per_second": operations / median if median > 0 else 0.0
+    }
+
+
+def bench_score_word(answers, valid_words, guesses, repeat):
+    ''' Times letterutils.score_word over every (guess, answer) pair '''
+    import letterutils
+
+    guesses = valid_words[:guesses] if guesses != None else valid_words
+    score_word = letterutils.score_word
+
+    def run():
+        for guess in guesses:
+            for answer in answers:
+                score_word(guess, answer)
+
+    return make_result("score_word", measure(run, repeat), len(guesses) * len(answers))
+
+
+def bench_is_valid_word(game, valid_words, repeat):
+    ''' Times Game.is_valid_word over the full dictionary '''
+    def run():
+        is_valid_word = game.is_valid_word
+        for word in valid_words:
+            is_valid_word(word)
+
+    return make_result("is_valid_word", measure(run, repeat), len(valid_words))
+
+
+def bench_format_word(answers, repeat):
+    ''' Times letterutils.format_word rendering of every answer, with and without colour '''
+    import letterutils
+
+    states = list(letterutils.LetterState)
+    rows = [(answer, [states[(i + j) % len(states)] for j in range(len(answer))]) for i, answer in enumerate(answers)]
+
+    results = []
+    for name, color in [("format_word", True), ("format_word_plain", False)]:
+        def run():
+            for word, word_state in rows:
+                letterutils.format_word(word, word_state, color)
+
+        results.append(make_result(name, measure(run, repeat), len(rows)))
+    return results
+
+
+def bench_game_construction(config, repeat):
+    '''
+    Times creating a Game and loading its word lists, both from disk and with the lists already held by another game.
+    Games only load their word lists when they're first needed, so the lists are touched explicitly
+    to keep these timings comparable with results from before construction became lazy
+    '''
+    import wordlist
+
+    from game import Game
+
+    def load_game():
+        game = Game(config)
+        game.word_index
+        game.possible_answers
+        game.close()
+
+    def cold():
+        wordlist.clear_cache()
+        load_game()
+
+    results = [make_result("game_construction_cold", measure(cold, repeat), 1)]
+
+    # Lists are evicted once no game is using them, so keep one game holding them for the warm runs
+    holder = Game(config)
+    holder.word_index
+    results.append(make_result("game_construction_warm", measure(load_game, repeat), 1))
+    holder.close()
+    return results
+
+
+def bench_startup(repeat):
+    ''' Times launching a new interpreter that imports wordpy.py and prints its usage '''
+    def run():
+        subprocess.run([sys.executable, WORDPY_PATH, "-?"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       cwd=os.path.dirname(WORDPY_PATH), check=False)
+
+    return make_result("startup", measure(run, repeat), 1)
+
+
+def git_revision():
+    '''
+    Gets the current git commit, so results from different commits can be told apart
+    Returns: the commit hash, or None if it isn't available
+    '''
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(WORDPY_PATH), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_benchmarks(repeat=DEFAULT_REPEAT, score_guesses=DEFAULT_SCORE_GUESSES, startup=True):
+    '''
+    Runs the whole benchmark suite
+    Arguments:
+        [optional] repeat: the number of times to repeat each benchmark
+        [optional] score_guesses: the number of guesses to score against every answer. None scores every valid word
+        [optional] startup: whether to include the (slow) interpreter startup benchmark
+    Returns: dictionary of the results, ready to be written as json
+    '''
+    import wordlist
+
+    from game import Game, ANSWERS_PATH, VALID_WORDS_PATH
+    from gameconfig import GameConfig
+
+    answers = wordlist.load_word_list(ANSWERS_PATH)
+    valid_words = wordlist.load_word_list(VALID_WORDS_PATH)
+    config = GameConfig(word="eager")
+
+    benchmarks = []
+    benchmarks.extend(bench_game_construction(config, repeat))
+    benchmarks.append(bench_score_word(answers, valid_words, score_guesses, repeat))
+    benchmarks.append(bench_is_valid_word(Game(config), valid_words, repeat))
+    benchmarks.extend(bench_format_word(answers, repeat))
+    if startup:
+        benchmarks.append(bench_startup(repeat))
+
+    return {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "benchmarks": benchmarks
+    }
+
+
+def compare_results(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    '''
+    Compares two sets of benchmark results
+    Arguments:
+        baseline: the earlier results (see run_benchmarks)
+        current: the new results
+        [optional] tolerance: the fractional slowdown allowed before a benchmark counts as a regression
+    Returns: list of (name, baseline median, current median, ratio, is regression) tuples for the benchmarks in both
+    '''
+    previous = {benchmark["name"]: benchmark for benchmark in baseline["benchmarks"]}
+    comparisons = []
+    for benchmark in current["benchmarks"]:
+        old = previous.get(benchmark["name"])
+        if old == None or old["operations"] != benchmark["operations"]:
+            continue
+
+        ratio = benchmark["median_seconds"] / old["median_seconds"] if old["median_seconds"] > 0 else 1.0
+        comparisons.append((benchmark["name"], old["median_seconds"], benchmark["median_seconds"], ratio, ratio > 1.0 + tolerance))
+    return comparisons
+
+
+def print_usage():
+    print("Usage: python benchmark.py [-full] [-nostartup] [-repeat <n>] [-output <file>] [-compare <file>]\n" +
+          "   -full             : scores every valid word against every answer (slow)\n" +
+          "   -nostartup        : skips the interpreter startup benchmark\n" +
+          "   -repeat <n>       : runs each benchmark n times (default " + str(DEFAULT_REPEAT) + ")\n" +
+          "   -output <file>    : writes the json results to a file rather than stdout\n" +
+          "   -compare <file>   : compares the results with an earlier json results file")
+
+
+def main():
+    '''
+    Runs the benchmarks and writes the results as json
+    Returns: the process exit code. 1 if -compare found a regression
+    '''
+    repeat = DEFAULT_REPEAT
+    score_guesses = DEFAULT_SCORE_GUESSES
+    startup = True
+    output_path = None
+    compare_path = None
+
+    args = sys.argv[1:]
+    try:
+        i = 0
+        while i < len(args):
+            match args[i]:
+                case "-full":
+                    score_guesses = None
+                case "-nostartup":
+                    startup = False
+                case "-repeat":
+                    i += 1
+                    repeat = int(args[i])
+                    if repeat <= 0:
+                        raise ValueError("repeat must be positive")
+                case "-output":
+                    i += 1
+                    output_path = args[i]
+                case "-compare":
+                    i += 1
+                    compare_path = args[i]
+                case _:
+                    raise ValueError(f"Unknown option: {args[i]}")
+            i += 1
+    except (IndexError, ValueError):
+        print_usage()
+        return 2
+
+    results = run_benchmarks(repeat, score_guesses, startup)
+    text = json.dumps(results, indent=2)
+    if output_path != None:
+        with open(output_path, "w") as output_file:
+            output_file.write(text + "\n")
+    else:
+        print(text)
+
+    if compare_path == None:
+        return 0
+
+    with open(compare_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressed = False
+    for name, old, new, ratio, regression in compare_results(baseline, results):
+        flag = "  REGRESSION" if regression else ""
+        print(f"{name:24} {old * 1000:10.3f}ms -> {new * 1000:10.3f}ms  x{ratio:.2f}{flag}", file=sys.stderr)
+        regressed = regressed or regression
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
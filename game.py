@@ -1,14 +1,18 @@
 import colorama
-import json
+import instrumentation
 import letterutils
-import os
-import random
 import string
+import sys
+import wordlist
 
 from colorama import Fore, Back, Style
-from datetime import date
 from enum import Enum
+from gamesession import GameSession, pick_answer
 from letterutils import LetterState
+from renderer import Renderer
+
+ANSWERS_PATH = "./data/answers.json"
+VALID_WORDS_PATH = "./data/valid_words.json"
 
 class GameState(Enum):
     ''' Valid game states '''
@@ -39,45 +43,86 @@ class Game:
         self._config = config
         self._words = None
         self._answers = None
-
-        if not self._load_word_lists():
-            raise ValueError("Error loading word lists")
-
-        self._start()
-
-        # Initialise colorama
-        colorama.init(autoreset=True)
+        self._shared_lists = []
+        self._word_index = None
+        self._session = None
+        self._solver = None
+        self._history = None
+        self._renderer = Renderer()
 
 
     @property
     def valid_words(self):
         ''' List of valid words '''
-        return self._words["words"]
+        self._ensure_word_lists()
+        return self._words
 
 
     @property
     def possible_answers(self):
         ''' List of all possible answers '''
-        return self._answers["words"]
+        self._ensure_word_lists()
+        return self._answers
+
+
+    def _ensure_word_lists(self):
+        '''
+        Loads the word lists the first time they're needed, rather than when the game is created,
+        so that nothing is read from disk until the player actually starts guessing
+        Raises: ValueError if the word lists can't be loaded, or there are no answers of the configured length
+        '''
+        if self._word_index != None:
+            return
+        if not self._load_word_lists():
+            raise ValueError("Error loading word lists")
+        if len(self._answers) == 0:
+            self.close()
+            raise ValueError(f"No {self._config.length}-letter words in {self._config.dictionary or ANSWERS_PATH}")
 
 
     def _load_word_lists(self):
         '''
-        Loads the json files containing the valid words and valid answers
+        Loads the lists of valid words and valid answers, only keeping the words of the configured length.
+        A custom dictionary (-dict) is used as both the answers and the valid words.
+        The lists are shared between all Game instances so they are only read from disk once.
         Returns: True for success, False for failure
         '''
+        answers_path = self._config.dictionary or ANSWERS_PATH
+        words_path = self._config.dictionary or VALID_WORDS_PATH
+        length = self._config.length
 
         try:
-            with open("./data/answers.json") as answers_file:
-                self._answers = json.load(answers_file)
-            with open("./data/valid_words.json") as words_file:
-                self._words = json.load(words_file)
+            with instrumentation.timer("wordlist.load"):
+                self._shared_lists = [wordlist.acquire(answers_path, length), wordlist.acquire(words_path, length)]
+                answers, words = self._shared_lists
+                self._answers = answers.words
+                self._words = words.words
+                # The lookup index means validating guesses doesn't need to scan the whole word list
+                self._word_index = words.index
         except Exception as ex:
+            self.close()
             return False
 
         return True
 
 
+    def close(self):
+        '''
+        Hands the shared word lists back to the registry (see wordlist.acquire), so they can be freed once no game is using them
+        '''
+        for shared_list in self._shared_lists:
+            wordlist.release(shared_list)
+        self._shared_lists = []
+        self._word_index = None
+
+
+    @property
+    def word_index(self):
+        ''' Lookup index over the valid words '''
+        self._ensure_word_lists()
+        return self._word_index
+
+
     def is_valid_word(self, word):
         '''
         Is the specified word a valid dictionary word?
@@ -86,56 +131,70 @@ class Game:
         Returns: True if the word is valid, False if it is not
         '''
 
-        if letterutils.is_word_naively_valid(word) == False:
-            return False
+        return self.word_index.contains(word)
 
-        return word.lower() in self.valid_words
+
+    def validate_many(self, words):
+        '''
+        Are the specified words valid dictionary words?
+        Arguments:
+            words: An iterable of words to validate
+        Returns: A list of booleans, one per word, True where the word is valid
+        '''
+
+        return self.word_index.validate_many(words)
 
 
     def _pick_answer(self):
         '''
-        Picks a new answer for the game.
-        If the user forced a word via the command-line then that word will be used.
-        Otherwise we use today's date (or the command-line forced date) to pick a random answer from the answers list.
+        Picks a new answer for the game (see gamesession.pick_answer)
         Returns: the answer for this run of the game
         '''
-        if self._config.word != None:
-            return self._config.word.lower()
-        else:
-            # If random is True then use the default seed of the current system time.
-            # If it's False then let's seed using a date
-            if self._config.random == False:
-                # Pick a random answer based on today's (or the forced) date
-                # This isn't what Wordle does ~(it just iterates through an unordered list), and we can end up with
-                # the same answer on multiple days, but it's fine for now.
-                # It also prevents someone trivially looking up the next word in the data file and cheating that way.
-                days_since_epoch = self._config.date - date(1970, 1, 1)
-                days_since_epoch.days
-                random.seed(days_since_epoch.days)
+        return pick_answer(self._config, self.possible_answers)
 
-            return self.possible_answers[random.randrange(0, len(self.possible_answers))]
+
+    @property
+    def session(self):
+        ''' The GameSession holding the state of the current game. None until the first game starts '''
+        return self._session
 
 
     def _start(self):
         '''
         Starts a new instance of the game and (re)initialises any per-game state
         '''
-        self._answer = self._pick_answer()
-        self._guess_number = 1
-        self._won = False
-        self._guesses = [
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]),
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]),
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]),
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]),
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]),
-            ("     ", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE])]
+        if self._config.boards > 1:
+            from multiboard import MultiBoardSession, pick_answers
+            self._session = MultiBoardSession(pick_answers(self._config, self.possible_answers, self._config.boards), self.word_index)
+        elif self._config.absurdle:
+            from adversary import AdversarialSession
+            self._session = AdversarialSession(self.possible_answers, self.word_index, hard=self._config.hard)
+        else:
+            self._session = GameSession(self._pick_answer(), self.word_index, hard=self._config.hard)
 
 
     def run(self):
         '''
         Runs the main game state machine. Exists when game is finished / user quits.
         '''
+        # Initialise colorama. This is left until the game actually runs so that creating a Game stays cheap
+        colorama.init(autoreset=True)
+
+        # Colour is no use when we're being piped to a file or another program so use plain-text tiles instead
+        letterutils.set_color(sys.stdout.isatty())
+
+        # Queued games are written out and the word lists handed back however the game ends, including Ctrl + C
+        try:
+            self._run_states()
+        finally:
+            if self._history != None:
+                self._history.close()
+                self._history = None
+            self.close()
+
+
+    def _run_states(self):
+        ''' Runs the state machine until the user quits '''
         while True:
             match self._state:
                 case GameState.INTRO:
@@ -173,10 +232,10 @@ class Game:
         self._state = new_state
 
 
-    def _print_logo(self):
-        ''' Prints out the game logo to the console'''
+    def _draw_logo(self):
+        ''' Draws the game logo '''
 
-        print(  Fore.BLACK + Back.GREEN +
+        self._renderer.write(Fore.BLACK + Back.GREEN +
                     "[W]" + Back.BLACK + " " + Back.WHITE +
                     "[O]" + Back.BLACK + " " + Back.WHITE +
                     "[R]" + Back.BLACK + " " + Back.WHITE +
@@ -184,13 +243,15 @@ class Game:
                     "[Py]")
 
     def _prompt_for_input(self):
-        ''' Reusable user prompt for moving around the game states '''
+        ''' Reusable user prompt for moving around the game states. Completes and draws the current frame '''
 
-        print("\nPress [enter] to play")
-        print("\nType 'help' for how to play")
-        print("Type 'quit' or press [Ctrl + D] to quit")
+        self._renderer.write("\nPress [enter] to play")
+        self._renderer.write("\nType 'help' for how to play")
+        self._renderer.write("Type 'quit' or press [Ctrl + D] to quit")
+        self._renderer.present()
         try:
-            command = input()
+            with instrumentation.timer("input"):
+                command = input()
         except EOFError:
             self._change_state(GameState.QUIT)
             return True
@@ -211,8 +272,8 @@ class Game:
         ''' Prints the intro information to the console '''
 
         while True:
-            os.system("clear")
-            self._print_logo()
+            self._renderer.begin_frame()
+            self._draw_logo()
 
             if self._prompt_for_input() == True:
                 break
@@ -221,35 +282,42 @@ class Game:
         ''' Prints the help information to the console '''
 
         while True:
-            os.system("clear")
-            self._print_logo()
-
-            print(Style.BRIGHT + "\nHOW TO PLAY")
-            print("------------------------------")
-            print("Guess the WORDPy in 6 tries")
-            print("Each guess must be a valid 5-letter word. Hit the enter button to submit.")
-            print("After each guess, the color of the tiles will change to show how close your guess was to the word.")
-            print("------------------------------")
-            print("\nExamples")
-            print("\n" + letterutils.format_word("WEARY", [LetterState.CORRECT, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]))
-            print("The letter W is in the word and in the correct spot.")
-            print("\n" + letterutils.format_word("PILLS", [LetterState.NONE, LetterState.WRONG_PLACE,LetterState.NONE,LetterState.NONE,LetterState.NONE]))
-            print("The letter I is in the word but in the wrong spot.")
-            print("\n" + letterutils.format_word("VAGUE", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.WRONG,LetterState.NONE]))
-            print("The letter U is not in the word in any spot.")
-            print("\n------------------------------")
-            print("A new WORDPy will be available each day")
-            print("------------------------------")
+            self._renderer.begin_frame()
+            self._draw_logo()
+
+            self._renderer.write("")
+            self._renderer.write(Style.BRIGHT + "HOW TO PLAY")
+            self._renderer.write("------------------------------")
+            self._renderer.write("Guess the WORDPy in 6 tries")
+            self._renderer.write(f"Each guess must be a valid {self._config.length}-letter word. Hit the enter button to submit.")
+            self._renderer.write("After each guess, the color of the tiles will change to show how close your guess was to the word.")
+            self._renderer.write("------------------------------")
+            self._renderer.write("\nExamples")
+            self._renderer.write("\n" + letterutils.format_word("WEARY", [LetterState.CORRECT, LetterState.NONE,LetterState.NONE,LetterState.NONE,LetterState.NONE]))
+            self._renderer.write("The letter W is in the word and in the correct spot.")
+            self._renderer.write("\n" + letterutils.format_word("PILLS", [LetterState.NONE, LetterState.WRONG_PLACE,LetterState.NONE,LetterState.NONE,LetterState.NONE]))
+            self._renderer.write("The letter I is in the word but in the wrong spot.")
+            self._renderer.write("\n" + letterutils.format_word("VAGUE", [LetterState.NONE, LetterState.NONE,LetterState.NONE,LetterState.WRONG,LetterState.NONE]))
+            self._renderer.write("The letter U is not in the word in any spot.")
+            self._renderer.write("\n------------------------------")
+            self._renderer.write("A new WORDPy will be available each day")
+            self._renderer.write("------------------------------")
 
             if self._prompt_for_input() == True:
                 break
 
 
     def _draw_grid(self):
-        ''' Draws the current game grid to the console '''
+        ''' Draws the current game grid to the console. Multi-board games draw their boards side by side '''
 
-        for guess in self._guesses:
-            print(letterutils.format_word(guess[0], guess[1]))
+        if self._config.boards > 1:
+            boards = [[letterutils.format_word(word, score) for word, score in board.guesses] for board in self._session.boards]
+            self._renderer.write_columns(boards, self._session.length * 3)
+            self._renderer.write(f"\nSolved {self._session.solved}/{len(boards)}  Guess {min(self._session.guess_number, self._session.max_guesses)}/{self._session.max_guesses}")
+            return
+
+        for guess in self._session.guesses:
+            self._renderer.write(letterutils.format_word(guess[0], guess[1]))
 
     def _draw_used_letters(self):
         '''
@@ -258,71 +326,117 @@ class Game:
         This is useful as a reminder for the user as it can be quite hard without this reference
         '''
 
-        print("Used letters: ", end="")
-
-        # Create a dictionary of all letters
-        used_letters = {}
-        for letter in string.ascii_uppercase:
-            used_letters[letter] = LetterState.NONE
+        self._renderer.write("Used letters: " + letterutils.format_word(string.ascii_uppercase, self._session.used_letters()))
 
-        # Iterate over the player's guesses and determine the overall state of each letter
-        # Correct overrides wrong place, which overrides wrong, which overrides none.
-        # The value of some of these (wrong place vs correct)
-        for guess in self._guesses:
-            guess_word = guess[0].upper()
-            guess_state = guess[1]
-            for i in range(len(guess_word)):
-                letter = guess_word[i]
 
-                if letter not in string.ascii_uppercase:
-                    continue
-
-                state = guess_state[i]
-                # If we've already recorded this letter then we only want to update it if this is a
-                # correct match (as there may have been a partial match already).
-                # We don't want to overwrite correct matches with partial ones!
-                if used_letters[letter] == LetterState.NONE or state == LetterState.CORRECT:
-                    used_letters[letter] = state
+    def _draw_hint(self):
+        '''
+        Draws the solver's suggestion for the next guess
+        '''
 
-        print(letterutils.format_word(string.ascii_uppercase, list(used_letters.values())))
+        # The solver is only created on first use as it needs to load (or build) the pattern table
+        # Custom dictionaries get their own table so they don't replace the (costly to rebuild) default one
+        if self._solver == None:
+            from patterntable import DEFAULT_TABLE_PATH, table_path_for
+            from solver import Solver
+            if self._config.dictionary:
+                table_path = table_path_for(self._config.dictionary, self._config.length)
+            else:
+                table_path = DEFAULT_TABLE_PATH
+            self._solver = Solver(self.possible_answers, self.valid_words, table_path=table_path)
+
+        guesses = self._session.guesses
+        letters = self._session.letters
+        suggestion = self._solver.best_guess(guesses, letters, self._session.hard)
+        if suggestion == None:
+            self._renderer.write("Hint: none of the possible answers match your guesses")
+        else:
+            num_candidates = len(self._solver.candidates(guesses, letters))
+            self._renderer.write(f"Hint: try {suggestion.upper()} ({num_candidates} possible answers)")
 
 
     def _show_game(self):
         ''' Draws the current game state to the console and prompts the user for input '''
 
-        # Draw 5 x 6 grid of guesses
-        os.system("clear")
+        # Draw the grid of guesses (word length x 6)
+        self._renderer.begin_frame()
         self._draw_grid()
-        print("")
+        self._renderer.write("")
         self._draw_used_letters()
-        print("")
+        self._renderer.write("")
+        if self._config.hint:
+            self._draw_hint()
+            self._renderer.write("")
+        self._renderer.present()
 
         # Prompt user for guess
         word = ""
         while True:
             try:
-                word = input("Enter guess: ").lower()
+                with instrumentation.timer("input"):
+                    word = input("Enter guess: ").lower()
             except EOFError:
                 self._change_state(GameState.QUIT)
                 break
 
-            # Validate word
-            if self.is_valid_word(word):
+            # Validate and score the word
+            with instrumentation.timer("validate"):
+                valid = self._session.is_valid_word(word)
+                respects_hints = valid and self._session.respects_hints(word)
+            if not valid:
+                instrumentation.count("guesses.invalid")
+                print("Invalid word. Try again...")
+                continue
+            if not respects_hints:
+                instrumentation.count("guesses.hard_mode_rejected")
+                print("Hard mode: your guess must use all of the revealed hints. Try again...")
+                continue
+
+            with instrumentation.timer("score"):
+                self._session.submit_guess(word)
+            instrumentation.count("guesses")
+
+            if self._session.finished:
+                self._record_result()
+
+            # Have we guessed all the letters correctly?
+            if self._session.won:
+                # We've won!!!
+                self._change_state(GameState.WON)
+            elif self._session.lost:
+                # We've lost!!!
+                self._change_state(GameState.LOST)
+            break
+
+
+    def _record_result(self):
+        '''
+        Adds the finished game to the history store (if the -history option was used).
+        Games are queued and written in batches so this doesn't hold up the end of the game
+        '''
+        if self._config.history == None:
+            return
 
-                guess = letterutils.score_word(word, self._answer)
-                self._guesses[self._guess_number - 1] = guess
-                self._guess_number += 1
+        if self._history == None:
+            from history import HistoryStore
+            self._history = HistoryStore(self._config.history)
+        self._history.record_session(self._session, self._config.date)
 
-                # Have we guessed all the letters correctly?
-                if all(item == LetterState.CORRECT for item in guess[1]):
-                    # We've won!!!
-                    self._change_state(GameState.WON)
-                elif self._guess_number > 6:
-                    # We've lost!!!
-                    self._change_state(GameState.LOST)
-                break
-            else:
-                print("Invalid word. Try again...")
+
+    def _draw_statistics(self):
+        '''
+        Draws the player's statistics from the history store
+        '''
+        stats = self._history.statistics()
+        self._renderer.write(f"\nPlayed: {stats.games}  Win %: {stats.win_rate:.0%}  " +
+                             f"Current streak: {stats.current_streak}  Max streak: {stats.max_streak}")
+
+        # Scale the bars so the most common guess count fills 20 characters
+        most = max(stats.distribution.values(), default=0)
+        for guesses in range(1, self._session.max_guesses + 1):
+            count = stats.distribution.get(guesses, 0)
+            bar = "#" * (count * 20 // most if most > 0 else 0)
+            self._renderer.write(f"{guesses}: {bar} {count}")
 
 
     def _show_end(self, won):
@@ -333,18 +447,27 @@ class Game:
         '''
 
         while True:
-            os.system("clear")
+            self._renderer.begin_frame()
             self._draw_grid()
             if won:
-                print("\nWell done!")
+                self._renderer.write("\nWell done!")
             else:
-                print("\nSorry, you lost...")
-                print(f"The correct answer was " + letterutils.format_word(self._answer, [LetterState.CORRECT, LetterState.CORRECT, LetterState.CORRECT, LetterState.CORRECT, LetterState.CORRECT]))
+                self._renderer.write("\nSorry, you lost...")
+                if self._config.boards > 1:
+                    answers = [board.answer for board in self._session.boards if not board.won]
+                    self._renderer.write("The correct answers were " + " ".join(
+                        [letterutils.format_word(answer, [LetterState.CORRECT] * self._session.length) for answer in answers]))
+                else:
+                    self._renderer.write(f"The correct answer was " + letterutils.format_word(self._session.answer, [LetterState.CORRECT] * self._session.length))
+
+            if self._history != None:
+                self._draw_statistics()
 
             if self._config.infinite == True:
                 if self._prompt_for_input() == True:
                     break
             else:
+                self._renderer.present()
                 self._change_state(GameState.QUIT)
                 break
 
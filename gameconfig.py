@@ -1,12 +1,32 @@
+import letterutils
+
 from datetime import date
 
+# Multi-board games (-boards) play between 2 and 16 answers at once
+MIN_BOARDS = 2
+MAX_BOARDS = 16
+
 class GameConfig:
-    def __init__(self, forceddate=None, word=None, random=False, infinite=False):
+    def __init__(self, forceddate=None, word=None, random=False, infinite=False, simulate=None, hint=False, hard=False, profile=None, batch=None, history=None,
+                 length=letterutils.WORD_LENGTH, dictionary=None, absurdle=False,
+                 schedule=None, output=None, boards=1):
 
         self._date = forceddate
         self._word = word
         self._random = random or infinite
         self._infinite = infinite
+        self._simulate = simulate
+        self._hint = hint
+        self._hard = hard
+        self._profile = profile
+        self._batch = batch
+        self._history = history
+        self._length = length
+        self._dictionary = dictionary
+        self._absurdle = absurdle
+        self._schedule = schedule
+        self._output = output
+        self._boards = boards
 
         self._validate()
 
@@ -28,6 +48,54 @@ class GameConfig:
     def infinite(self):
         return self._infinite
 
+    @property
+    def simulate(self):
+        return self._simulate
+
+    @property
+    def hint(self):
+        return self._hint
+
+    @property
+    def hard(self):
+        return self._hard
+
+    @property
+    def profile(self):
+        return self._profile
+
+    @property
+    def batch(self):
+        return self._batch
+
+    @property
+    def history(self):
+        return self._history
+
+    @property
+    def length(self):
+        return self._length
+
+    @property
+    def dictionary(self):
+        return self._dictionary
+
+    @property
+    def absurdle(self):
+        return self._absurdle
+
+    @property
+    def schedule(self):
+        return self._schedule
+
+    @property
+    def output(self):
+        return self._output
+
+    @property
+    def boards(self):
+        return self._boards
+
     def _validate(self):
         if self.infinite and self.word:
             raise ValueError("infinite and word are incompatible")
@@ -39,5 +107,29 @@ class GameConfig:
             raise ValueError("random and date are incompatible")
         if self.word and self.date:
             raise ValueError("word and date are incompatible")
+        if self.simulate and (self.word or self.date or self.random):
+            raise ValueError("simulate is incompatible with date, infinite, random and word")
+        if self.batch and (self.word or self.date or self.random or self.simulate):
+            raise ValueError("batch is incompatible with date, infinite, random, simulate and word")
+        if self.absurdle and (self.word or self.date or self.simulate or self.batch):
+            raise ValueError("absurdle is incompatible with batch, date, simulate and word")
+        if self.schedule and (self.word or self.date or self.random or self.simulate or self.batch or self.absurdle):
+            raise ValueError("schedule is incompatible with absurdle, batch, date, infinite, random, simulate and word")
+        if self.schedule and self.schedule[1] < self.schedule[0]:
+            raise ValueError("schedule end must not be before its start")
+        if self.output and not self.schedule:
+            raise ValueError("output is only used with schedule")
+        if self.boards != 1 and not MIN_BOARDS <= self.boards <= MAX_BOARDS:
+            raise ValueError(f"boards must be between {MIN_BOARDS} and {MAX_BOARDS}")
+        if self.boards != 1 and (self.word or self.hard or self.hint or self.absurdle or self.history or self.simulate or self.batch or self.schedule):
+            raise ValueError("boards is incompatible with absurdle, batch, hard, hint, history, schedule, simulate and word")
+        if not letterutils.is_supported_length(self.length):
+            raise ValueError(f"length must be between {letterutils.MIN_WORD_LENGTH} and {letterutils.MAX_WORD_LENGTH}")
+        if self.word and len(self.word) != self.length:
+            raise ValueError(f"word must have {self.length} letters")
+        if self.hint and self.length != letterutils.WORD_LENGTH:
+            raise ValueError(f"hint is only available for {letterutils.WORD_LENGTH}-letter words")
+        if self.simulate and (self.length != letterutils.WORD_LENGTH or self.dictionary):
+            raise ValueError("simulate is incompatible with dict and length")
         if self.date and self.date < date(1970, 1, 1):
             raise ValueError("date must be 1970-01-01 or later")
@@ -0,0 +1,312 @@
+import letterutils
+import random
+import schedule
+
+from letterutils import LetterState
+from lettertracker import LetterTracker
+
+MAX_GUESSES = 6
+WORD_LENGTH = letterutils.WORD_LENGTH
+
+
+def pick_answer(config, possible_answers, rng=None):
+    '''
+    Picks a new answer for a game.
+    If the user forced a word via the command-line then that word will be used.
+    If the config asks for a random word then one is picked with rng.
+    Otherwise we look up today's (or the command-line forced) date in the answer schedule (see schedule.py).
+    Never touches the global random state, so concurrent games in one process can't affect each other.
+    Arguments:
+        config: the GameConfig for the game
+        possible_answers: the list of answers to pick from
+        [optional] rng: the random.Random to pick random answers with. Defaults to a new, system seeded, instance
+    Returns: the answer for the game
+    '''
+    if config.word != None:
+        return config.word.lower()
+
+    if config.random:
+        if rng == None:
+            rng = random.Random()
+        return possible_answers[rng.randrange(0, len(possible_answers))]
+
+    return schedule.load_schedule(possible_answers).answer_for(config.date)
+
+
+class GuessRecord:
+    '''
+    A single scored guess, stored as a packed word (see letterutils.encode_word) and a packed score (see letterutils.encode_score).
+    Behaves like the (word, score) tuples returned by letterutils.score_word so it can be unpacked and indexed the same way.
+    A score_code of None marks a blank (not yet guessed) row.
+    '''
+
+    __slots__ = ("word_code", "score_code", "length")
+
+    def __init__(self, word_code, score_code, length=WORD_LENGTH):
+        self.word_code = word_code
+        self.score_code = score_code
+        self.length = length
+
+
+    @property
+    def word(self):
+        ''' The guessed word (lower case), or spaces for a blank row '''
+        if self.score_code == None:
+            return " " * self.length
+        return letterutils.decode_word(self.word_code)
+
+
+    @property
+    def score(self):
+        ''' The list of LetterState values for the guess '''
+        if self.score_code == None:
+            return [LetterState.NONE] * self.length
+        return letterutils.decode_score(self.score_code, self.length)
+
+
+    def __iter__(self):
+        yield self.word
+        yield self.score
+
+
+    def __getitem__(self, index):
+        return (self.word, self.score)[index]
+
+
+    def __len__(self):
+        return 2
+
+
+    def __eq__(self, other):
+        if isinstance(other, GuessRecord):
+            return self.word_code == other.word_code and self.score_code == other.score_code
+        return tuple(self) == tuple(other)
+
+
+    def __repr__(self):
+        return f"GuessRecord({self.word!r}, {self.score_code})"
+
+
+# Blank rows for each word length, shared by every unused row
+_blank_guesses = {length: GuessRecord(0, None, length) for length in range(letterutils.MIN_WORD_LENGTH, letterutils.MAX_WORD_LENGTH + 1)}
+BLANK_GUESS = _blank_guesses[WORD_LENGTH]
+
+
+class GameSession:
+    '''
+    The core logic for a single game: submitting and scoring guesses and tracking the win/loss state.
+    Doesn't perform any I/O so it can be driven by the console Game, a server, a simulator, etc.
+    Words and scores are held in their packed integer forms, so a session is only a handful of small objects.
+    Usage:
+        session = GameSession("eager", word_index)
+        session.submit_guess("raise")    # GuessRecord that unpacks to ("raise", [LetterState.WRONG_PLACE, ...])
+        session.won                      # False
+    '''
+
+    __slots__ = ("_answer_code", "_length", "_all_correct", "_word_index", "_max_guesses", "_hard", "_guess_number", "_won",
+                 "_letters", "_guesses")
+
+    def __init__(self, answer, word_index=None, max_guesses=MAX_GUESSES, hard=False):
+        '''
+        Arguments:
+            answer: the answer for this game. Guesses must be the same length
+            [optional] word_index: the WordIndex used to validate guesses. If missing then any naively valid word is accepted
+            [optional] max_guesses: the number of guesses allowed
+            [optional] hard: hard mode, where every guess must be consistent with all of the hints revealed so far
+        '''
+        if answer == None or not letterutils.is_supported_length(len(answer)) or not letterutils.is_word_naively_valid(answer, len(answer)):
+            raise ValueError(f"Invalid answer: {answer}")
+
+        self._answer_code = letterutils.encode_word(answer)
+        self._length = len(answer)
+        self._all_correct = letterutils.all_correct(self._length)
+        self._word_index = word_index
+        self._max_guesses = max_guesses
+        self._hard = hard
+        self._guess_number = 1
+        self._won = False
+        self._letters = LetterTracker(self._length)
+
+        # Unused rows are blank so that the full grid can be drawn at any point
+        self._guesses = [_blank_guesses[self._length]] * max_guesses
+
+
+    @property
+    def answer(self):
+        ''' The answer for this game '''
+        return letterutils.decode_word(self._answer_code)
+
+
+    @property
+    def length(self):
+        ''' The number of letters in the answer (and every guess) '''
+        return self._length
+
+
+    @property
+    def answer_code(self):
+        ''' The packed answer for this game '''
+        return self._answer_code
+
+
+    @property
+    def guesses(self):
+        ''' List of GuessRecords, one per row of the grid. Rows not yet guessed are blank '''
+        return self._guesses
+
+
+    @property
+    def letters(self):
+        ''' LetterTracker holding everything known about the answer's letters from the guesses so far '''
+        return self._letters
+
+
+    @property
+    def guess_number(self):
+        ''' The (1-based) number of the next guess '''
+        return self._guess_number
+
+
+    @property
+    def guess_count(self):
+        ''' The number of guesses made so far '''
+        return self._guess_number - 1
+
+
+    @property
+    def max_guesses(self):
+        ''' The number of guesses allowed '''
+        return self._max_guesses
+
+
+    @property
+    def hard(self):
+        ''' Is this game in hard mode? '''
+        return self._hard
+
+
+    @property
+    def won(self):
+        ''' Has the answer been guessed? '''
+        return self._won
+
+
+    @property
+    def lost(self):
+        ''' Have all of the guesses been used without finding the answer? '''
+        return not self._won and self._guess_number > self._max_guesses
+
+
+    @property
+    def finished(self):
+        ''' Is the game over (either won or lost)? '''
+        return self._won or self._guess_number > self._max_guesses
+
+
+    def is_valid_word(self, word):
+        '''
+        Is the specified word a valid guess?
+        Arguments:
+            word: The word to validate
+        Returns: True if the word is valid, False if it is not
+        '''
+        if not letterutils.is_word_naively_valid(word, self._length):
+            return False
+        return self.is_valid_code(letterutils.encode_word(word))
+
+
+    def is_valid_code(self, word_code):
+        '''
+        Is the specified packed word (see letterutils.encode_word) a valid guess?
+        Arguments:
+            word_code: The packed word to validate
+        Returns: True if the word is valid, False if it is not
+        '''
+        if self._word_index == None:
+            # Every letter must be present (non-zero) and there must be no extra letters
+            bits = letterutils.BITS_PER_LETTER
+            return word_code >> (bits * (self._length - 1)) != 0 and word_code < (1 << (bits * self._length))
+        return self._word_index.contains_code(word_code)
+
+
+    def respects_hints(self, word):
+        '''
+        Does the word satisfy the hard mode rules? Always True when not in hard mode.
+        Arguments:
+            word: The (valid) word to check
+        Returns: True if the word may be guessed, False if it contradicts a revealed hint
+        '''
+        return not self._hard or self._letters.is_consistent(word)
+
+
+    def submit_guess(self, word):
+        '''
+        Scores a guess against the answer and records it
+        Arguments:
+            word: the guessed word
+        Returns: the GuessRecord for the guess (which unpacks like a (word, score) tuple)
+        Raises: ValueError if the word is not valid, breaks the hard mode rules or the game is already finished
+        '''
+        if not letterutils.is_word_naively_valid(word, self._length):
+            raise ValueError(f"Invalid word: {word}")
+        return self.submit_code(letterutils.encode_word(word))
+
+
+    def submit_code(self, word_code):
+        '''
+        Scores a packed guess (see letterutils.encode_word) against the answer and records it
+        Arguments:
+            word_code: the packed guessed word
+        Returns: the GuessRecord for the guess
+        Raises: ValueError if the word is not valid, breaks the hard mode rules or the game is already finished
+        '''
+        if self.finished:
+            raise ValueError("Game is already finished")
+        if not self.is_valid_code(word_code):
+            raise ValueError(f"Invalid word: {letterutils.decode_word(word_code)}")
+        if self._hard and not self._letters.is_consistent_code(word_code):
+            raise ValueError(f"Guess must use all of the revealed hints: {letterutils.decode_word(word_code)}")
+
+        return self.record_score(word_code, self._score(word_code))
+
+
+    def record_score(self, word_code, score_code):
+        '''
+        Records a guess that has already been scored, for callers that score many sessions at once (see multiboard.py).
+        The guess isn't validated, so it must be a valid word that was scored against this session's answer
+        Arguments:
+            word_code: the packed guessed word
+            score_code: the packed score of the guess against the answer
+        Returns: the GuessRecord for the guess
+        Raises: ValueError if the game is already finished
+        '''
+        if self.finished:
+            raise ValueError("Game is already finished")
+
+        guess = GuessRecord(word_code, score_code, self._length)
+        self._guesses[self._guess_number - 1] = guess
+        self._guess_number += 1
+        self._letters.update_code(word_code, score_code)
+
+        if score_code == self._all_correct:
+            self._won = True
+
+        return guess
+
+
+    def _score(self, word_code):
+        '''
+        Scores a (valid) packed guess. Sessions that don't fix their answer up front override this (see adversary.py)
+        Arguments:
+            word_code: the packed guessed word
+        Returns: the packed score
+        '''
+        return letterutils.score_code(word_code, self._answer_code)
+
+
+    def used_letters(self):
+        '''
+        Gets the overall known state of each letter of the alphabet from the guesses so far (see LetterTracker.states)
+        Returns: a list of 26 LetterState values (A-Z)
+        '''
+        return self._letters.states()
@@ -0,0 +1,266 @@
+import letterutils
+import sqlite3
+
+from datetime import date
+
+# Number of finished games held in memory before they're written to the database in one transaction
+DEFAULT_BATCH_SIZE = 64
+
+# Each guess is stored in 7 bytes: the packed word (see letterutils.encode_word) shifted up 16 bits, plus the packed score.
+# That's enough for words of up to 8 letters (40 bits) and their scores (up to 3^8 - 1)
+GUESS_BYTES = 7
+SCORE_BITS = 16
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played INTEGER NOT NULL,
+    answer INTEGER NOT NULL,
+    guesses BLOB NOT NULL,
+    guess_count INTEGER NOT NULL,
+    won INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_played ON games (played, won, guess_count);
+CREATE INDEX IF NOT EXISTS games_answer ON games (answer);
+CREATE TABLE IF NOT EXISTS summary (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    current_streak INTEGER NOT NULL,
+    max_streak INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS distribution (
+    guess_count INTEGER PRIMARY KEY,
+    games INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO summary VALUES (1, 0, 0, 0, 0);
+'''
+
+
+def pack_guesses(guesses):
+    '''
+    Packs a game's guesses into bytes
+    Arguments:
+        guesses: list of (packed word, packed score) tuples
+    Returns: the packed bytes
+    '''
+    return b"".join([((word_code << SCORE_BITS) | score_code).to_bytes(GUESS_BYTES, "little") for word_code, score_code in guesses])
+
+
+def unpack_guesses(data):
+    '''
+    Unpacks a game's guesses (see pack_guesses)
+    Arguments:
+        data: the packed bytes
+    Returns: list of (word, score string) tuples, e.g. ("raise", "12001")
+    '''
+    guesses = []
+    for i in range(0, len(data), GUESS_BYTES):
+        value = int.from_bytes(data[i:i + GUESS_BYTES], "little")
+        word = letterutils.decode_word(value >> SCORE_BITS)
+        score = value & ((1 << SCORE_BITS) - 1)
+        guesses.append((word, letterutils.score_to_string(letterutils.decode_score(score, len(word)))))
+    return guesses
+
+
+class GameStats:
+    '''
+    Statistics about a set of finished games
+    '''
+
+    def __init__(self, games, wins, distribution, current_streak, max_streak):
+        '''
+        Arguments:
+            games: the number of games played
+            wins: the number of games won
+            distribution: dictionary of the number of games won in each number of guesses
+            current_streak: the number of games won in a row, up to the latest game
+            max_streak: the longest run of games won in a row
+        '''
+        self.games = games
+        self.wins = wins
+        self.distribution = distribution
+        self.current_streak = current_streak
+        self.max_streak = max_streak
+
+
+    @property
+    def win_rate(self):
+        ''' The fraction of games won '''
+        return self.wins / self.games if self.games > 0 else 0.0
+
+
+class HistoryStore:
+    '''
+    Append-only store of finished games in an SQLite database.
+    Games are queued in memory and written in batches so recording a game never waits on the disk,
+    and running totals are updated as each batch is written so the overall statistics are a single row read.
+    Usage:
+        store = HistoryStore("./data/history.db")
+        store.record_session(session)
+        store.statistics().win_rate
+        store.close()
+    '''
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE):
+        '''
+        Arguments:
+            path: the database file. Created if it doesn't exist
+            [optional] batch_size: the number of games to queue before writing them out
+        '''
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._batch_size = batch_size
+        self._pending = []
+
+
+    @property
+    def pending(self):
+        ''' The number of games waiting to be written '''
+        return len(self._pending)
+
+
+    def record(self, answer, played, guesses, won):
+        '''
+        Queues a finished game to be written
+        Arguments:
+            answer: the answer for the game
+            played: the date the game was played for
+            guesses: list of (word, list of LetterState values) tuples (blank rows are ignored)
+            won: whether the game was won
+        '''
+        packed = [(letterutils.encode_word(word), letterutils.encode_score(score))
+                  for word, score in guesses if letterutils.LetterState.NONE not in score]
+        self._queue(letterutils.encode_word(answer), played, packed, won)
+
+
+    def record_session(self, session, played=None):
+        '''
+        Queues a finished GameSession to be written
+        Arguments:
+            session: the GameSession
+            [optional] played: the date the game was played for. Defaults to today
+        '''
+        guesses = [(guess.word_code, guess.score_code) for guess in session.guesses if guess.score_code != None]
+        self._queue(session.answer_code, played or date.today(), guesses, session.won)
+
+
+    def _queue(self, answer_code, played, guesses, won):
+        self._pending.append((played.toordinal(), answer_code, pack_guesses(guesses), len(guesses), 1 if won else 0))
+        if len(self._pending) >= self._batch_size:
+            self.flush()
+
+
+    def _running_totals(self):
+        '''
+        Gets the running totals including any queued games
+        Returns: tuple of (games, wins, current streak, max streak, distribution of the queued games only)
+        '''
+        games, wins, current_streak, max_streak = self._connection.execute(
+            "SELECT games, wins, current_streak, max_streak FROM summary").fetchone()
+        distribution = {}
+        for played, answer, guesses, guess_count, won in self._pending:
+            games += 1
+            if won:
+                wins += 1
+                current_streak += 1
+                max_streak = max(max_streak, current_streak)
+                distribution[guess_count] = distribution.get(guess_count, 0) + 1
+            else:
+                current_streak = 0
+        return (games, wins, current_streak, max_streak, distribution)
+
+
+    def flush(self):
+        '''
+        Writes every queued game (and the updated running totals) in a single transaction
+        '''
+        if len(self._pending) == 0:
+            return
+
+        with self._connection:
+            # Take the write lock before reading the totals, so another process sharing the database
+            # can't update them between the read and the write
+            self._connection.execute("BEGIN IMMEDIATE")
+            games, wins, current_streak, max_streak, distribution = self._running_totals()
+            self._connection.executemany("INSERT INTO games (played, answer, guesses, guess_count, won) VALUES (?, ?, ?, ?, ?)",
+                                         self._pending)
+            self._connection.execute("UPDATE summary SET games = ?, wins = ?, current_streak = ?, max_streak = ?",
+                                     (games, wins, current_streak, max_streak))
+            self._connection.executemany("INSERT INTO distribution VALUES (?, ?) ON CONFLICT (guess_count) DO UPDATE SET games = games + excluded.games",
+                                         distribution.items())
+        self._pending = []
+
+
+    def close(self):
+        ''' Writes any queued games and closes the database '''
+        self.flush()
+        self._connection.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+
+    def statistics(self, start=None, end=None):
+        '''
+        Gets the statistics for every game, or for the games played between two dates.
+        The overall statistics come straight from the running totals (plus any queued games) so don't need to write anything.
+        Arguments:
+            [optional] start: the first date to include
+            [optional] end: the last date to include
+        Returns: a GameStats
+        '''
+        if start == None and end == None:
+            games, wins, current_streak, max_streak, pending = self._running_totals()
+            distribution = dict(self._connection.execute("SELECT guess_count, games FROM distribution"))
+            for guess_count, count in pending.items():
+                distribution[guess_count] = distribution.get(guess_count, 0) + count
+            return GameStats(games, wins, dict(sorted(distribution.items())), current_streak, max_streak)
+
+        # Ranges are queried from the games themselves, so queued games need writing out first
+        self.flush()
+
+        first = start.toordinal() if start != None else 0
+        last = end.toordinal() if end != None else date.max.toordinal()
+
+        # Both queries are answered from the games_played index without touching the table itself
+        distribution = {}
+        games = 0
+        wins = 0
+        for won, guess_count, count in self._connection.execute(
+                "SELECT won, guess_count, COUNT(*) FROM games WHERE played BETWEEN ? AND ? GROUP BY won, guess_count",
+                (first, last)):
+            games += count
+            if won:
+                wins += count
+                distribution[guess_count] = count
+
+        current_streak = 0
+        max_streak = 0
+        for (won,) in self._connection.execute("SELECT won FROM games WHERE played BETWEEN ? AND ? ORDER BY played, id",
+                                               (first, last)):
+            current_streak = current_streak + 1 if won else 0
+            max_streak = max(max_streak, current_streak)
+
+        return GameStats(games, wins, dict(sorted(distribution.items())), current_streak, max_streak)
+
+
+    def games_for(self, answer):
+        '''
+        Gets every recorded game for an answer
+        Arguments:
+            answer: the answer to look up
+        Returns: list of (date played, list of (word, score string) tuples, won) tuples, oldest first
+        '''
+        self.flush()
+        rows = self._connection.execute("SELECT played, guesses, won FROM games WHERE answer = ? ORDER BY id",
+                                        (letterutils.encode_word(answer),))
+        return [(date.fromordinal(played), unpack_guesses(guesses), won == 1) for played, guesses, won in rows]
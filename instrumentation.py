@@ -0,0 +1,259 @@
+import atexit
+import os
+import time
+
+# Setting this environment variable to a file path turns instrumentation on, just like -profile <file>
+ENVIRONMENT_VARIABLE = "WORDPY_PROFILE"
+
+# Latency histograms have one bucket per power of two microseconds: bucket i counts timings in [2^(i-1), 2^i) us
+NUM_BUCKETS = 32
+
+# Everything is recorded in these module level tables while instrumentation is enabled
+_enabled = False
+_counters = {}
+_histograms = {}
+_profiler = None
+_output_path = None
+
+
+class Histogram:
+    '''
+    Latency histogram with power of two (microsecond) buckets, plus the exact count, total, min and max.
+    '''
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * NUM_BUCKETS
+
+
+    def record(self, seconds):
+        '''
+        Adds a timing to the histogram
+        Arguments:
+            seconds: the time taken
+        '''
+        self.count += 1
+        self.total += seconds
+        if self.min == None or seconds < self.min:
+            self.min = seconds
+        if self.max == None or seconds > self.max:
+            self.max = seconds
+
+        microseconds = int(seconds * 1000000)
+        self.buckets[min(microseconds.bit_length(), NUM_BUCKETS - 1)] += 1
+
+
+    def percentile(self, fraction):
+        '''
+        Estimates a percentile from the buckets
+        Arguments:
+            fraction: the percentile as a fraction (e.g. 0.95)
+        Returns: the upper bound of the bucket holding the percentile in seconds, or 0.0 if nothing has been recorded
+        '''
+        if self.count == 0:
+            return 0.0
+
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target:
+                return min((1 << bucket) / 1000000, self.max)
+        return self.max
+
+
+    def to_dict(self):
+        ''' Summary of the histogram, ready to be written as json '''
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count > 0 else 0.0,
+            "min_seconds": self.min or 0.0,
+            "max_seconds": self.max or 0.0,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "p99_seconds": self.percentile(0.99)
+        }
+
+
+class _NullTimer:
+    ''' Timer used while instrumentation is disabled. Does nothing '''
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    ''' Records the time spent inside a with block into a named histogram '''
+
+    __slots__ = ("_name", "_start")
+
+    def __init__(self, name):
+        self._name = name
+        self._start = 0.0
+
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+def is_enabled():
+    ''' Is instrumentation currently recording? '''
+    return _enabled
+
+
+def timer(name):
+    '''
+    Times a block of code when instrumentation is enabled. When it's disabled this returns a shared
+    no-op context manager, so the cost of leaving hooks in hot paths is a function call.
+    Usage:
+        with instrumentation.timer("score"):
+            session.submit_guess(word)
+    Arguments:
+        name: the histogram to record the time in
+    Returns: a context manager
+    '''
+    if _enabled:
+        return _Timer(name)
+    return _NULL_TIMER
+
+
+def record(name, seconds):
+    '''
+    Adds a timing to a named histogram (if instrumentation is enabled)
+    Arguments:
+        name: the histogram to record the time in
+        seconds: the time taken
+    '''
+    if not _enabled:
+        return
+
+    histogram = _histograms.get(name)
+    if histogram == None:
+        histogram = Histogram()
+        _histograms[name] = histogram
+    histogram.record(seconds)
+
+
+def count(name, amount=1):
+    '''
+    Increments a named counter (if instrumentation is enabled)
+    Arguments:
+        name: the counter
+        [optional] amount: the amount to add
+    '''
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def summary():
+    '''
+    Gets everything recorded so far
+    Returns: dictionary of the counters and histogram summaries, ready to be written as json
+    '''
+    return {
+        "counters": dict(sorted(_counters.items())),
+        "histograms": {name: _histograms[name].to_dict() for name in sorted(_histograms)}
+    }
+
+
+def reset():
+    ''' Forgets everything that has been recorded '''
+    _counters.clear()
+    _histograms.clear()
+
+
+def enable(output_path=None):
+    '''
+    Starts recording. If an output path is given then the results are written out when the process exits:
+    paths ending in .json get the summary of counters and histograms, any other path gets cProfile (pstats) data.
+    Arguments:
+        [optional] output_path: the file to write the results to at exit
+    '''
+    global _enabled, _profiler, _output_path
+
+    if _enabled:
+        return
+
+    _enabled = True
+    _output_path = output_path
+    if output_path == None:
+        return
+
+    if not output_path.endswith(".json"):
+        # Only pay for importing the profiler when it's actually wanted
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    atexit.register(dump)
+
+
+def enable_from_environment():
+    '''
+    Enables instrumentation if the WORDPY_PROFILE environment variable holds an output path
+    Returns: True if instrumentation was enabled
+    '''
+    output_path = os.environ.get(ENVIRONMENT_VARIABLE)
+    if not output_path:
+        return False
+
+    enable(output_path)
+    return True
+
+
+def disable():
+    ''' Stops recording (and profiling). Anything recorded so far is kept '''
+    global _enabled, _profiler
+
+    _enabled = False
+    if _profiler != None:
+        _profiler.disable()
+
+
+def dump(output_path=None):
+    '''
+    Stops recording and writes out the results
+    Arguments:
+        [optional] output_path: the file to write. Defaults to the path passed to enable
+    '''
+    global _profiler, _output_path
+
+    output_path = output_path or _output_path
+    profiler = _profiler
+    disable()
+    _profiler = None
+
+    # Only write the results once, even if dump is called before the process exits
+    _output_path = None
+    atexit.unregister(dump)
+
+    if output_path == None:
+        return
+
+    if profiler != None and not output_path.endswith(".json"):
+        profiler.dump_stats(output_path)
+    else:
+        import json
+        with open(output_path, "w") as output_file:
+            json.dump(summary(), output_file, indent=2)
@@ -0,0 +1,287 @@
+import letterutils
+
+from letterutils import LetterState, BITS_PER_LETTER, LETTER_MASK
+
+NUM_LETTERS = 26
+
+# Display state for each LetterState value, indexed by value
+_STATES = [LetterState(value) for value in range(len(LetterState))]
+
+
+# Display state for each base-3 score digit (see letterutils.encode_score)
+_DIGIT_STATES = [state.value for state in letterutils.SCORE_STATES]
+
+
+def _letter_index(letter):
+    return ord(letter) - 97
+
+
+def _unpack_letters(word_code, length):
+    ''' Splits a packed word (see letterutils.encode_word) into a list of letter indexes (a=0 ... z=25) '''
+    letters = []
+    for i in range(length):
+        letters.append((word_code & LETTER_MASK) - 1)
+        word_code >>= BITS_PER_LETTER
+    return letters
+
+
+# The tracker's state is packed into ints rather than held in lists or arrays, so a session (see gamesession.py) stays small:
+#   states:     STATE_BITS per letter of the alphabet (a in the lowest bits) holding its LetterState value
+#   min / max:  COUNT_BITS per letter of the alphabet holding the count
+#   known:      BITS_PER_LETTER per position, in the same form as a packed word (see letterutils.encode_word), 0 where unknown
+#   excluded:   NUM_LETTERS bits per position, with a bit set for each letter known not to be there
+#   required:   a bit per letter of the alphabet, set for the letters that must appear (min count > 0)
+STATE_BITS = 2
+STATE_MASK = (1 << STATE_BITS) - 1
+COUNT_BITS = 4
+COUNT_MASK = (1 << COUNT_BITS) - 1
+EXCLUDED_MASK = (1 << NUM_LETTERS) - 1
+
+
+def _pack_counts(count):
+    ''' Packs the same count for every letter of the alphabet '''
+    return sum(count << (letter * COUNT_BITS) for letter in range(NUM_LETTERS))
+
+
+def _unpack_counts(counts):
+    ''' Splits packed counts into a list with the count for each letter (a-z) '''
+    return [(counts >> (letter * COUNT_BITS)) & COUNT_MASK for letter in range(NUM_LETTERS)]
+
+
+# Packed max counts before anything is known, for each word length. Shared by every tracker
+_unknown_max_counts = {length: _pack_counts(length) for length in range(letterutils.MIN_WORD_LENGTH, letterutils.MAX_WORD_LENGTH + 1)}
+
+
+class LetterTracker:
+    '''
+    Everything that is known about the answer's letters, updated incrementally as each guess is scored:
+        - the display state of each letter of the alphabet (correct / wrong place / wrong / unused)
+        - the minimum and maximum number of times each letter can appear in the answer
+        - the letter known to be at each position, and the letters known not to be at each position
+    All of it is packed into ints, so a tracker is only a handful of small objects.
+    Usage:
+        tracker = LetterTracker()
+        tracker.update(*letterutils.score_word("raise", "eager"))
+        tracker.state("a")               # LetterState.CORRECT
+        tracker.is_consistent("eager")   # True
+    '''
+
+    __slots__ = ("_length", "_states", "_min_counts", "_max_counts", "_known", "_excluded", "_required")
+
+    def __init__(self, length=5):
+        '''
+        Arguments:
+            [optional] length: the number of letters in the answer
+        '''
+        self._length = length
+        self._states = 0
+        self._min_counts = 0
+        self._max_counts = _unknown_max_counts.get(length)
+        if self._max_counts == None:
+            self._max_counts = _pack_counts(length)
+        self._known = 0
+        self._excluded = 0
+        self._required = 0
+
+
+    @property
+    def length(self):
+        ''' The number of letters in the answer '''
+        return self._length
+
+
+    @property
+    def min_counts(self):
+        ''' List of the minimum number of times each letter (a-z) appears in the answer '''
+        return _unpack_counts(self._min_counts)
+
+
+    @property
+    def max_counts(self):
+        ''' List of the maximum number of times each letter (a-z) can appear in the answer '''
+        return _unpack_counts(self._max_counts)
+
+
+    @property
+    def known_positions(self):
+        ''' The letter known to be at each position, or None where it isn't known yet '''
+        return [chr(index + 97) if index >= 0 else None for index in _unpack_letters(self._known, self._length)]
+
+
+    @property
+    def excluded_masks(self):
+        ''' List of bitmasks (bit 0 = a) of the letters known not to be at each position '''
+        return [(self._excluded >> (i * NUM_LETTERS)) & EXCLUDED_MASK for i in range(self._length)]
+
+
+    def state(self, letter):
+        '''
+        Gets the display state of a letter
+        Arguments:
+            letter: the letter (any case)
+        Returns: the LetterState
+        '''
+        return _STATES[(self._states >> (_letter_index(letter.lower()) * STATE_BITS)) & STATE_MASK]
+
+
+    def states(self):
+        '''
+        Gets the display state of every letter.
+        Correct overrides wrong place, which overrides wrong, which overrides none.
+        Returns: a list of 26 LetterState values (A-Z)
+        '''
+        return [_STATES[(self._states >> (letter * STATE_BITS)) & STATE_MASK] for letter in range(NUM_LETTERS)]
+
+
+    def update(self, word, score):
+        '''
+        Adds the knowledge from a scored guess
+        Arguments:
+            word: the guessed word
+            score: the list of LetterState values for the guess
+        '''
+        self.update_code(letterutils.encode_word(word), letterutils.encode_score(score))
+
+
+    def update_code(self, word_code, score_code):
+        '''
+        Adds the knowledge from a scored guess
+        Arguments:
+            word_code: the packed guessed word (see letterutils.encode_word)
+            score_code: the packed score for the guess (see letterutils.encode_score)
+        '''
+        states = self._states
+        known = self._known
+        excluded = self._excluded
+        hits = {}
+        missed = set()
+
+        for i, letter in enumerate(_unpack_letters(word_code, self._length)):
+            digit = score_code % 3
+            score_code //= 3
+
+            # We don't want to overwrite correct matches with partial ones!
+            shift = letter * STATE_BITS
+            if (states >> shift) & STATE_MASK == LetterState.NONE.value or digit == 2:
+                states = (states & ~(STATE_MASK << shift)) | (_DIGIT_STATES[digit] << shift)
+
+            if digit == 2:
+                shift = i * BITS_PER_LETTER
+                known = (known & ~(LETTER_MASK << shift)) | ((letter + 1) << shift)
+                hits[letter] = hits.get(letter, 0) + 1
+            else:
+                excluded |= 1 << (i * NUM_LETTERS + letter)
+                if digit == 1:
+                    hits[letter] = hits.get(letter, 0) + 1
+                else:
+                    missed.add(letter)
+
+        min_counts = self._min_counts
+        for letter, count in hits.items():
+            shift = letter * COUNT_BITS
+            if count > (min_counts >> shift) & COUNT_MASK:
+                min_counts = (min_counts & ~(COUNT_MASK << shift)) | (count << shift)
+                self._required |= 1 << letter
+
+        # A wrong letter means that every copy of it in the answer has already been matched
+        max_counts = self._max_counts
+        for letter in missed:
+            shift = letter * COUNT_BITS
+            max_counts = (max_counts & ~(COUNT_MASK << shift)) | (hits.get(letter, 0) << shift)
+
+        self._states = states
+        self._known = known
+        self._excluded = excluded
+        self._min_counts = min_counts
+        self._max_counts = max_counts
+
+
+    def is_consistent(self, word):
+        '''
+        Could the word be the answer given everything known so far?
+        Only looks at the letters of the word and the letters known to be in the answer so this is O(word length).
+        Arguments:
+            word: the word to check (any case)
+        Returns: True if the word satisfies all of the constraints
+        '''
+        return self.is_consistent_code(letterutils.encode_word(word))
+
+
+    def is_consistent_code(self, word_code):
+        '''
+        Could the packed word (see letterutils.encode_word) be the answer given everything known so far?
+        Arguments:
+            word_code: the packed word to check
+        Returns: True if the word satisfies all of the constraints
+        '''
+        known = self._known
+        excluded = self._excluded
+        counts = {}
+        for i, letter in enumerate(_unpack_letters(word_code, self._length)):
+            known_letter = (known >> (i * BITS_PER_LETTER)) & LETTER_MASK
+            if known_letter and letter != known_letter - 1:
+                return False
+            if (excluded >> (i * NUM_LETTERS + letter)) & 1:
+                return False
+            counts[letter] = counts.get(letter, 0) + 1
+
+        max_counts = self._max_counts
+        for letter, count in counts.items():
+            if count > (max_counts >> (letter * COUNT_BITS)) & COUNT_MASK:
+                return False
+
+        # Visit each letter that must appear (each set bit of _required)
+        min_counts = self._min_counts
+        required = self._required
+        while required:
+            letter = (required & -required).bit_length() - 1
+            required &= required - 1
+            if counts.get(letter, 0) < (min_counts >> (letter * COUNT_BITS)) & COUNT_MASK:
+                return False
+
+        return True
+
+
+    def filter_mask(self, letters):
+        '''
+        Vectorised check of which words could be the answer given everything known so far
+        Arguments:
+            letters: (n, length) array of encoded words (see batchscore.encode_words)
+        Returns: (n,) boolean array, True where the word is consistent
+        '''
+        # numpy is only needed for filtering so isn't imported until then (it dominates startup time)
+        import numpy as np
+
+        mask = np.ones(letters.shape[0], dtype=bool)
+
+        known = _unpack_letters(self._known, self._length)
+        for i, excluded_mask in enumerate(self.excluded_masks):
+            column = letters[:, i]
+            if known[i] >= 0:
+                mask &= column == known[i]
+            if excluded_mask:
+                excluded = np.array([(excluded_mask >> letter) & 1 for letter in range(NUM_LETTERS)], dtype=bool)
+                mask &= ~excluded[column]
+
+        for letter, (min_count, max_count) in enumerate(zip(self.min_counts, self.max_counts)):
+            if min_count == 0 and max_count >= self._length:
+                continue
+            counts = (letters == letter).sum(axis=1)
+            mask &= (counts >= min_count) & (counts <= max_count)
+
+        return mask
+
+
+    def filter(self, words):
+        '''
+        Finds the words that could be the answer given everything known so far
+        Arguments:
+            words: the words to check
+        Returns: list of the consistent words
+        '''
+        if len(words) == 0:
+            return []
+
+        import batchscore
+        mask = self.filter_mask(batchscore.encode_words(words))
+        return [word for word, match in zip(words, mask) if match]
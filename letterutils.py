@@ -1,6 +1,3 @@
-import re
-
-from colorama import Fore, Back
 from enum import Enum
 
 class LetterState(Enum):
@@ -10,19 +7,96 @@ class LetterState(Enum):
     WRONG_PLACE = 2
     CORRECT = 3
 
-def is_word_naively_valid(word):
+# Scores can be packed into a single base-3 number with one digit per letter (first letter is the lowest digit)
+# Each 5-letter score packs into 0..242 so fits in a byte
+SCORE_DIGITS = {
+    LetterState.WRONG: 0,
+    LetterState.WRONG_PLACE: 1,
+    LetterState.CORRECT: 2
+}
+SCORE_STATES = (LetterState.WRONG, LetterState.WRONG_PLACE, LetterState.CORRECT)
+
+# Words can be packed into an integer using 5 bits per letter (a=1 ... z=26, first letter in the lowest bits)
+# so a 5-letter word fits into 25 bits
+BITS_PER_LETTER = 5
+LETTER_MASK = (1 << BITS_PER_LETTER) - 1
+
+# Supported word lengths. The default game uses 5-letter words
+WORD_LENGTH = 5
+MIN_WORD_LENGTH = 4
+MAX_WORD_LENGTH = 8
+
+# Packed score for a fully correct 5-letter word
+ALL_CORRECT = 242
+
+
+def is_supported_length(length):
+    '''
+    Can the game be played with words of this length?
+    Arguments:
+        length: the number of letters
+    Returns: True if the length is between MIN_WORD_LENGTH and MAX_WORD_LENGTH
+    '''
+    return MIN_WORD_LENGTH <= length <= MAX_WORD_LENGTH
+
+
+def all_correct(length):
+    '''
+    Gets the packed score for a fully correct word (see encode_score)
+    Arguments:
+        length: the number of letters in the word
+    Returns: the packed score
+    '''
+    return 3 ** length - 1
+
+
+def encode_word(word):
+    '''
+    Packs a word into an integer using 5 bits per letter (first letter in the lowest bits)
+    Arguments:
+        word: the word to encode. Must only contain the letters a-z | A-Z
+    Returns: the packed integer for the word
+    Raises: ValueError if the word contains a non a-z character
+    '''
+    code = 0
+    shift = 0
+    for letter in word.lower():
+        value = ord(letter) - 96
+        if value < 1 or value > 26:
+            raise ValueError(f"Cannot encode word: {word}")
+        code |= value << shift
+        shift += BITS_PER_LETTER
+    return code
+
+
+def decode_word(code):
+    '''
+    Unpacks an integer created by encode_word back into a (lower case) word
+    Arguments:
+        code: the packed integer
+    Returns: the decoded word
+    '''
+    letters = []
+    while code:
+        letters.append(chr((code & LETTER_MASK) + 96))
+        code >>= BITS_PER_LETTER
+    return "".join(letters)
+
+
+def is_word_naively_valid(word, length=WORD_LENGTH):
     """
     Determines if the supplied word is valid for use in the game.
-    The word must be 5 letters in length and contain only a-z | A-Z.
+    The word must be the right length (5 letters by default) and contain only a-z | A-Z.
     The word does NOT have to be a valid dictionary word to pass this check
     Arguments:
         word: The word to check
+        [optional] length: the number of letters the word must have
     Returns: True for a valid word, False for an invalid one
     """
     if word == None:
         return False
 
-    return re.fullmatch(r"[a-zA-Z]{5}", word) != None
+    return len(word) == length and word.isascii() and word.isalpha()
 
 
 def blank_character(word, index):
@@ -37,70 +111,183 @@ def blank_character(word, index):
     return word[:index] + '_' + word[index+1:]
 
 
-def score_word(word, answer):
+def encode_score(score):
+    '''
+    Packs a list of letter states into a single base-3 integer
+    Arguments:
+        score: the list of LetterState values (NONE is not allowed)
+    Returns: the packed score
+    '''
+    code = 0
+    for state in reversed(score):
+        code = code * 3 + SCORE_DIGITS[state]
+    return code
+
+
+def decode_score(code, length=WORD_LENGTH):
+    '''
+    Unpacks a base-3 integer created by encode_score back into a list of letter states
+    Arguments:
+        code: the packed score
+        length: the number of letters in the scored word
+    Returns: a list of LetterState values
+    '''
+    score = []
+    for i in range(length):
+        score.append(SCORE_STATES[code % 3])
+        code //= 3
+    return score
+
+
+def score_to_string(score):
+    '''
+    Converts a score into a compact plain-text form with one digit per letter
+    (0 = wrong, 1 = wrong place, 2 = correct), e.g. "21102"
+    Arguments:
+        score: the list of LetterState values (NONE is not allowed)
+    Returns: the score string
+    '''
+    return "".join(str(SCORE_DIGITS[state]) for state in score)
+
+
+def score_code(word_code, answer_code):
+    '''
+    Scores a packed word against a packed answer (see encode_word) using the same rules as score_word
+    Arguments:
+        word_code: the packed word to score
+        answer_code: the packed answer to score against
+    Returns: the packed score (see encode_score)
+    '''
+    code = 0
+    place = 1
+    wrong_places = []
+    unmatched = {}
+
+    # Correct letters first, counting up the answer letters that are left for wrong place matches
+    while word_code or answer_code:
+        letter = word_code & LETTER_MASK
+        answer_letter = answer_code & LETTER_MASK
+        if letter == answer_letter:
+            code += 2 * place
+        else:
+            unmatched[answer_letter] = unmatched.get(answer_letter, 0) + 1
+            wrong_places.append((letter, place))
+        word_code >>= BITS_PER_LETTER
+        answer_code >>= BITS_PER_LETTER
+        place *= 3
+
+    # Then letters in the wrong place, each using up one of the unmatched answer letters
+    for letter, place in wrong_places:
+        if unmatched.get(letter, 0) > 0:
+            unmatched[letter] -= 1
+            code += place
+
+    return code
+
+
+def score_word(word, answer, table=None):
     '''
     Determines the score/letter state for the supplied word and returns a tuple containing the word and the score/state for each letter
         e.g. ("ERASE", [LetterState.CORRECT, LetterState.WRONG_PLACE, LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.WRONG_PLACE])
     Arguments:
         word: the word to score
         answer: the correct answer to score against
+        [optional] table: a precomputed PatternTable to look the score up in. Falls back to scoring directly
+                          if the word/answer pair isn't in the table
     Returns: Tuple containing the original word and an array with the score/state for each letter
     '''
-    if not is_word_naively_valid(word):
+    if table != None:
+        code = table.lookup(word, answer)
+        if code != None:
+            return (word, decode_score(code, len(word)))
+
+    if not is_word_naively_valid(word, len(answer)):
         raise ValueError()
 
-    score = [LetterState.WRONG, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG]
+    return (word, decode_score(score_code(encode_word(word), encode_word(answer)), len(word)))
+
+
+# Name of the colorama background colour used for each letter state.
+# colorama itself isn't imported until the first coloured tile is drawn
+LETTER_BACKGROUNDS = {
+    LetterState.NONE: "BLACK",
+    LetterState.WRONG: "LIGHTBLACK_EX",
+    LetterState.WRONG_PLACE: "LIGHTYELLOW_EX",
+    LetterState.CORRECT: "GREEN"
+}
+
+# Plain-text tile layout used for each letter state when colour is disabled
+PLAIN_TILES = {
+    LetterState.NONE: "[{}]",
+    LetterState.WRONG: "-{}-",
+    LetterState.WRONG_PLACE: "({})",
+    LetterState.CORRECT: "*{}*"
+}
+
+# Whether format_word uses colour by default (see set_color)
+_use_color = True
+
+# Precomposed tile strings keyed on (letter, state), one cache for coloured tiles and one for plain tiles
+_tile_caches = {True: {}, False: {}}
+
+
+def set_color(enabled):
+    '''
+    Sets whether format_word uses colour by default. Disable it for logs and pipes.
+    Arguments:
+        enabled: True to use colour, False for plain-text
+    '''
+    global _use_color
+    _use_color = enabled
 
-    # Check for fully correct letters first
-    # We do correct letters in the wrong place in the second pass so that they don't match against already fully correct letters
-    for i in range(5):
-        letter = word[i]
-        if letter == answer[i]:
-            score[i] = LetterState.CORRECT
-            answer = blank_character(answer, i) # We blank out any correctly guessed letters so that other guesses of the same letter don't pick them up
 
-    # Do our second pass looking for letters in the wrong place now that we've marked off the fully correct letters
-    for i in range(5):
-        # Skip already correct letters
-        if (score[i] == LetterState.CORRECT):
-            continue
+def _make_tile(letter, state, color):
+    '''
+    Composes the string for a single tile and caches it
+    '''
+    if color:
+        from colorama import Fore, Back
+        tile = Fore.WHITE + getattr(Back, LETTER_BACKGROUNDS[state]) + "[" + letter + "]"
+    else:
+        tile = PLAIN_TILES[state].format(letter)
+    _tile_caches[color][(letter, state)] = tile
+    return tile
 
-        letter = word[i]
-        for j in range(5):
-            if j != i and letter == answer[j]:
-                score[i] = LetterState.WRONG_PLACE
-                answer = blank_character(answer, j) # We blank out any correctly guessed letters so that other guesses of the same letter don't pick them up
-                break
 
-    return (word, score)
+def _get_tiles(color):
+    '''
+    Gets the tile cache, precomposing every letter/state combination the first time it is used
+    '''
+    tiles = _tile_caches[color]
+    if len(tiles) == 0:
+        import string
+        for letter in string.ascii_uppercase + " ":
+            for state in LetterState:
+                _make_tile(letter, state, color)
+    return tiles
 
 
-def format_word(word, word_state):
+def format_word(word, word_state, color=None):
     '''
     Gets the marked up string so that the provided word is laid out on a grid and letters are
     coloured according to their score/state.
     Correct letters get a green background, wrongly placed letters get a yellow background,
     wrong letters get a grey background, default is black.
+    Without colour, letters are marked as *correct*, (wrong place), -wrong- or [unused].
     Arguments:
         word: the word to mark up
         word_state: the scores/state for each letter (a list of LetterState enum values)
+        [optional] color: whether to use colour. Defaults to the setting from set_color
     Returns: the marked up string ready for printing to the console
     '''
     if word == None or word_state == None or len(word) != len(word_state):
         raise ValueError(f"{word}, ({len(word)}) {word_state}, {len(word_state)}")
 
-    letter_backgrounds = {
-        LetterState.NONE: Back.BLACK,
-        LetterState.WRONG: Back.LIGHTBLACK_EX,
-        LetterState.WRONG_PLACE: Back.LIGHTYELLOW_EX,
-        LetterState.CORRECT: Back.GREEN
-    }
+    if color == None:
+        color = _use_color
+    tiles = _get_tiles(color)
 
     # We always display words as all-caps
     word = word.upper()
 
-    text = ""
-    for i in range(len(word)):
-        text += Fore.WHITE + letter_backgrounds[word_state[i]] + "[" + word[i] + "]"
-
-    return text
\ No newline at end of file
+    return "".join([tiles.get((letter, state)) or _make_tile(letter, state, color) for letter, state in zip(word, word_state)])
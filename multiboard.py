@@ -0,0 +1,186 @@
+import letterutils
+import random
+import schedule
+
+from gameconfig import MAX_BOARDS
+from gamesession import GameSession
+from letterutils import LetterState
+
+# Multi-board games get one extra guess per board on top of this (e.g. 9 guesses for 4 boards)
+EXTRA_GUESSES = 5
+
+
+def pick_answers(config, possible_answers, count, rng=None):
+    '''
+    Picks the (distinct) answers for a multi-board game.
+    If the config asks for random words then they are picked with rng, otherwise they are picked for the config's date,
+    so every player gets the same boards each day. Never touches the global random state.
+    Arguments:
+        config: the GameConfig for the game
+        possible_answers: the list of answers to pick from
+        count: the number of answers to pick
+        [optional] rng: the random.Random to pick random answers with. Defaults to a new, system seeded, instance
+    Returns: list of answers
+    Raises: ValueError if there aren't enough possible answers
+    '''
+    if count > len(possible_answers):
+        raise ValueError(f"Not enough answers for {count} boards")
+
+    if not config.random:
+        # Each number of boards gets its own set of answers for the day
+        rng = random.Random(schedule.days_since_epoch(config.date) * (MAX_BOARDS + 1) + count)
+    elif rng == None:
+        rng = random.Random()
+    return rng.sample(possible_answers, count)
+
+
+class MultiBoardSession:
+    '''
+    A game played on several boards at once (Quordle, Octordle, etc.): every guess is played on each board that
+    hasn't been solved yet, and the game is won once every board has been solved.
+    Each board is a GameSession, but a guess is scored against all of the unsolved boards in one batch (see batchscore.score_batch)
+    rather than board by board.
+    Usage:
+        session = MultiBoardSession(["eager", "pound", "raise", "mouse"], word_index)
+        session.submit_guess("house")    # list of packed scores, one per board (None for boards already solved)
+        session.boards[0].won
+    '''
+
+    def __init__(self, answers, word_index=None, max_guesses=None):
+        '''
+        Arguments:
+            answers: the answer for each board. Must all be the same length
+            [optional] word_index: the WordIndex used to validate guesses. If missing then any naively valid word is accepted
+            [optional] max_guesses: the number of guesses allowed. Defaults to the number of boards plus EXTRA_GUESSES
+        Raises: ValueError if there are no answers, or any of them are invalid
+        '''
+        if answers == None or len(answers) == 0:
+            raise ValueError("No answers for the boards")
+        if max_guesses == None:
+            max_guesses = len(answers) + EXTRA_GUESSES
+
+        self._boards = [GameSession(answer, word_index, max_guesses) for answer in answers]
+        if any(board.length != self._boards[0].length for board in self._boards):
+            raise ValueError("Answers must all be the same length")
+
+        self._max_guesses = max_guesses
+        self._guess_number = 1
+        self._letters = None
+
+
+    @property
+    def boards(self):
+        ''' The GameSession for each board '''
+        return self._boards
+
+
+    @property
+    def answers(self):
+        ''' The answer for each board '''
+        return [board.answer for board in self._boards]
+
+
+    @property
+    def length(self):
+        ''' The number of letters in the answers (and every guess) '''
+        return self._boards[0].length
+
+
+    @property
+    def guess_number(self):
+        ''' The (1-based) number of the next guess '''
+        return self._guess_number
+
+
+    @property
+    def guess_count(self):
+        ''' The number of guesses made so far '''
+        return self._guess_number - 1
+
+
+    @property
+    def max_guesses(self):
+        ''' The number of guesses allowed '''
+        return self._max_guesses
+
+
+    @property
+    def solved(self):
+        ''' The number of boards solved so far '''
+        return sum(1 for board in self._boards if board.won)
+
+
+    @property
+    def won(self):
+        ''' Has every board been solved? '''
+        return all(board.won for board in self._boards)
+
+
+    @property
+    def lost(self):
+        ''' Have all of the guesses been used without solving every board? '''
+        return not self.won and self._guess_number > self._max_guesses
+
+
+    @property
+    def finished(self):
+        ''' Is the game over (either won or lost)? '''
+        return self.won or self._guess_number > self._max_guesses
+
+
+    def is_valid_word(self, word):
+        '''
+        Is the specified word a valid guess?
+        Arguments:
+            word: The word to validate
+        Returns: True if the word is valid, False if it is not
+        '''
+        return self._boards[0].is_valid_word(word)
+
+
+    def respects_hints(self, word):
+        ''' Multi-board games don't have a hard mode, so every valid word may be guessed '''
+        return True
+
+
+    def submit_guess(self, word):
+        '''
+        Scores a guess against every unsolved board and records it on each of them
+        Arguments:
+            word: the guessed word
+        Returns: list with the packed score (see letterutils.encode_score) for each board, or None for boards that were already solved
+        Raises: ValueError if the word is not valid or the game is already finished
+        '''
+        if self.finished:
+            raise ValueError("Game is already finished")
+        if not self.is_valid_word(word):
+            raise ValueError(f"Invalid word: {word}")
+        word = word.lower()
+
+        # Only pay for importing numpy once there's a guess to score
+        import batchscore
+        if self._letters is None:
+            self._letters = batchscore.encode_words([board.answer for board in self._boards])
+
+        active = [i for i, board in enumerate(self._boards) if not board.finished]
+        codes = batchscore.score_batch(word, self._letters[active]).tolist()
+
+        word_code = letterutils.encode_word(word)
+        scores = [None] * len(self._boards)
+        for i, score_code in zip(active, codes):
+            self._boards[i].record_score(word_code, score_code)
+            scores[i] = score_code
+        self._guess_number += 1
+        return scores
+
+
+    def used_letters(self):
+        '''
+        Gets the overall known state of each letter of the alphabet across the unsolved boards.
+        Each letter shows the most useful state it has on any of them, so a letter is only marked wrong once it's wrong everywhere
+        Returns: a list of 26 LetterState values (A-Z)
+        '''
+        rank = {LetterState.NONE: 0, LetterState.WRONG: 1, LetterState.WRONG_PLACE: 2, LetterState.CORRECT: 3}
+        boards = [board for board in self._boards if not board.won] or self._boards
+        states = [board.used_letters() for board in boards]
+        return [max(letter_states, key=rank.get) for letter_states in zip(*states)]
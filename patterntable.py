@@ -0,0 +1,205 @@
+import batchscore
+import numpy as np
+import os
+import tempfile
+
+DEFAULT_TABLE_PATH = "./data/patterns.npz"
+TABLE_EXTENSION = ".patterns.npz"
+
+
+def table_path_for(word_list_path, length):
+    '''
+    Gets the path to cache the table for a custom word list in, next to the list (like wordlist.binary_path_for),
+    so that it doesn't replace the default table
+    Arguments:
+        word_list_path: the path to the (json or plain-text) word list
+        length: the word length the table is for
+    Returns: the table file path
+    '''
+    return os.path.splitext(word_list_path)[0] + f".{length}" + TABLE_EXTENSION
+
+
+class PatternTable:
+    '''
+    Precomputed matrix of the score for every guess against every answer.
+    Each score is stored as a base-3 packed byte (see letterutils.encode_score) giving O(1) lookups.
+    The solver's ranking of the opening guesses (see solver.Solver) can be stored alongside, as it's as costly to work out as the table.
+    Usage:
+        table = PatternTable.load_or_build(valid_words, possible_answers)
+        table.lookup("raise", "eager")             # packed score
+        letterutils.score_word("raise", "eager", table)
+    '''
+
+    def __init__(self, guesses, answers, patterns, opening=None):
+        if guesses == None or answers == None or patterns is None:
+            raise ValueError("Table data missing")
+        if patterns.shape != (len(guesses), len(answers)):
+            raise ValueError(f"Pattern matrix shape {patterns.shape} doesn't match word lists")
+
+        self._guesses = list(guesses)
+        self._answers = list(answers)
+        self._guess_rows = {word: i for i, word in enumerate(self._guesses)}
+        self._answer_columns = {word: i for i, word in enumerate(self._answers)}
+        self._patterns = patterns
+        self._opening = opening
+
+
+    @classmethod
+    def build(cls, guesses, answers):
+        '''
+        Scores every guess against every answer and creates a table from the results
+        Arguments:
+            guesses: the list of words that can be guessed
+            answers: the list of possible answers
+        Returns: the new PatternTable
+        '''
+        guesses = [word.lower() for word in guesses]
+        answers = [word.lower() for word in answers]
+        patterns = batchscore.score_matrix(guesses, answers)
+        return cls(guesses, answers, patterns)
+
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads a table previously written with save()
+        Arguments:
+            path: the file to load from
+        Returns: the loaded PatternTable
+        '''
+        with np.load(path) as data:
+            opening = None
+            if "opening_rows" in data.files:
+                opening = (data["opening_rows"], data["opening_scores"])
+            return cls(data["guesses"].tolist(), data["answers"].tolist(), data["patterns"], opening)
+
+
+    @classmethod
+    def load_matching(cls, guesses, answers, path=DEFAULT_TABLE_PATH):
+        '''
+        Loads the table from disk if it exists and matches the supplied word lists
+        Arguments:
+            guesses: the list of words that can be guessed
+            answers: the list of possible answers
+            path: the file the table is cached in
+        Returns: the PatternTable, or None if there isn't a matching one
+        '''
+        if path == None or not os.path.exists(path):
+            return None
+
+        try:
+            table = cls.load(path)
+        except Exception:
+            return None
+        if table.guesses != [word.lower() for word in guesses] or table.answers != [word.lower() for word in answers]:
+            return None
+        return table
+
+
+    @classmethod
+    def load_or_build(cls, guesses, answers, path=DEFAULT_TABLE_PATH):
+        '''
+        Loads the table from disk if it exists and matches the supplied word lists.
+        Otherwise builds a new one and saves it to disk for next time.
+        Arguments:
+            guesses: the list of words that can be guessed
+            answers: the list of possible answers
+            path: the file to cache the table in
+        Returns: the PatternTable
+        '''
+        table = cls.load_matching(guesses, answers, path)
+        if table != None:
+            return table
+
+        table = cls.build(guesses, answers)
+        if path != None:
+            try:
+                table.save(path)
+            except OSError:
+                pass
+        return table
+
+
+    def save(self, path):
+        '''
+        Writes the table to disk
+        Arguments:
+            path: the file to write to
+        '''
+        # Write to a temporary file and move it into place, so a reader (or another process saving the same table)
+        # never sees a partly written file. Writing via a file handle stops numpy appending an extra extension
+        handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(path) or ".")
+        try:
+            arrays = {"guesses": np.array(self._guesses), "answers": np.array(self._answers), "patterns": self._patterns}
+            if self._opening != None:
+                arrays["opening_rows"], arrays["opening_scores"] = self._opening
+            with os.fdopen(handle, "wb") as table_file:
+                np.savez(table_file, **arrays)
+            # mkstemp only lets the owner read the file, but the table is shared like the rest of data/
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+    @property
+    def guesses(self):
+        ''' List of guess words (rows) '''
+        return self._guesses
+
+
+    @property
+    def answers(self):
+        ''' List of answer words (columns) '''
+        return self._answers
+
+
+    @property
+    def patterns(self):
+        ''' The (guesses x answers) uint8 matrix of packed scores '''
+        return self._patterns
+
+
+    @property
+    def opening(self):
+        ''' The stored ranking of the opening guesses as a tuple of (guess rows best first, their scores), or None if there isn't one '''
+        return self._opening
+
+
+    def set_opening(self, rows, scores):
+        '''
+        Stores the ranking of the opening guesses, to be saved with the table
+        Arguments:
+            rows: array of the guess rows, best first
+            scores: array of the score for each of the rows
+        Raises: ValueError if the rows and scores don't match
+        '''
+        if len(rows) != len(scores):
+            raise ValueError("Opening ranking rows and scores don't match")
+        self._opening = (rows, scores)
+
+
+    def guess_row(self, guess):
+        ''' Returns the row index for the guess or None if it isn't in the table '''
+        return self._guess_rows.get(guess)
+
+
+    def answer_column(self, answer):
+        ''' Returns the column index for the answer or None if it isn't in the table '''
+        return self._answer_columns.get(answer)
+
+
+    def lookup(self, guess, answer):
+        '''
+        Looks up the packed score for a guess against an answer
+        Arguments:
+            guess: the guessed word
+            answer: the answer to score against
+        Returns: the packed score or None if either word isn't in the table
+        '''
+        row = self._guess_rows.get(guess)
+        column = self._answer_columns.get(answer)
+        if row == None or column == None:
+            return None
+        return int(self._patterns[row, column])
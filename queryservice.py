@@ -0,0 +1,255 @@
+import letterutils
+import schedule
+import threading
+import wordlist
+
+from collections import OrderedDict
+from datetime import date
+from game import ANSWERS_PATH, VALID_WORDS_PATH
+
+# Default number of entries held by each of the service's caches
+DEFAULT_CACHE_SIZE = 4096
+
+
+class LRUCache:
+    '''
+    Bounded, thread-safe, least recently used cache that counts its hits and misses.
+    Usage:
+        cache = LRUCache(1024)
+        cache.get(key)               # None on a miss
+        cache.put(key, value)
+        cache.stats()["hits"]
+    '''
+
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE):
+        '''
+        Arguments:
+            [optional] max_size: the most entries to hold before the least recently used are evicted
+        Raises: ValueError if max_size isn't positive
+        '''
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive")
+
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+
+    def __len__(self):
+        return len(self._entries)
+
+
+    @property
+    def max_size(self):
+        ''' The most entries the cache will hold '''
+        return self._max_size
+
+
+    def get(self, key):
+        '''
+        Looks up a cached value, marking it as the most recently used
+        Arguments:
+            key: the key to look up
+        Returns: the cached value, or None if it isn't cached
+        '''
+        with self._lock:
+            value = self._entries.get(key)
+            if value == None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+
+    def put(self, key, value):
+        '''
+        Caches a value, evicting the least recently used entry if the cache is full
+        Arguments:
+            key: the key to cache the value under
+            value: the value (must not be None)
+        '''
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+
+    def clear(self):
+        ''' Empties the cache and resets the statistics '''
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+    def stats(self):
+        '''
+        Gets the cache statistics
+        Returns: dictionary of the hits, misses, hit rate, current size and max size
+        '''
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups > 0 else 0.0,
+                "size": len(self._entries),
+                "max_size": self._max_size
+            }
+
+
+class QueryService:
+    '''
+    Answers the questions front ends ask over and over, serving repeats from memory:
+        pattern:       the score a guess gets against an answer
+        daily_pattern: the score a guess gets against a day's answer
+        remaining:     how many answers are still possible after a set of guesses
+    Patterns are cached by (answer, guess) and candidate answers by the tuple of guesses so far.
+    Candidates are narrowed one guess at a time from the cached candidates for the earlier guesses,
+    so a player's next query only checks the answers their previous one left.
+    Usage:
+        service = QueryService()
+        service.daily_pattern("raise")                                  # "12001"
+        service.remaining([("raise", "12001"), ("erase", "21101")])     # 1
+        service.stats()
+    '''
+
+    def __init__(self, possible_answers=None, word_index=None, cache_size=DEFAULT_CACHE_SIZE):
+        '''
+        Arguments:
+            [optional] possible_answers: the answers to query. Defaults to the game's answer list
+            [optional] word_index: the WordIndex used to validate guesses. Defaults to the game's valid word list
+            [optional] cache_size: the number of entries held by each cache
+        '''
+        self._answers = possible_answers if possible_answers != None else wordlist.load_word_list(ANSWERS_PATH)
+        self._answer_codes = tuple(letterutils.encode_word(answer) for answer in self._answers)
+        self._word_index = word_index if word_index != None else wordlist.load_word_index(VALID_WORDS_PATH)
+        self._schedule = None
+        self._patterns = LRUCache(cache_size)
+        self._candidates = LRUCache(cache_size)
+
+
+    def _validate(self, word, length=None):
+        '''
+        Normalises a word
+        Returns: the lower case word
+        Raises: ValueError if the word isn't in the word list (or isn't the given length)
+        '''
+        if word == None or (length != None and len(word) != length) or not self._word_index.contains(word.lower()):
+            raise ValueError(f"Invalid word: {word}")
+        return word.lower()
+
+
+    def pattern(self, guess, answer):
+        '''
+        Gets the score a guess gets against an answer (see letterutils.score_word)
+        Arguments:
+            guess: the guessed word
+            answer: the answer
+        Returns: the score as a string with one digit per letter (see letterutils.score_to_string)
+        Raises: ValueError if either word is invalid
+        '''
+        key = (answer, guess)
+        pattern = self._patterns.get(key)
+        if pattern == None:
+            answer = answer.lower() if answer != None else None
+            if answer == None or not letterutils.is_word_naively_valid(answer, len(answer)):
+                raise ValueError(f"Invalid answer: {answer}")
+            guess = self._validate(guess, len(answer))
+
+            code = letterutils.score_code(letterutils.encode_word(guess), letterutils.encode_word(answer))
+            pattern = letterutils.score_to_string(letterutils.decode_score(code, len(answer)))
+            self._patterns.put(key, pattern)
+        return pattern
+
+
+    def answer_for(self, day=None):
+        '''
+        Gets the daily answer (see schedule.py)
+        Arguments:
+            [optional] day: the date. Defaults to today
+        Returns: the answer
+        '''
+        if self._schedule == None:
+            self._schedule = schedule.load_schedule(self._answers)
+        return self._schedule.answer_for(day or date.today())
+
+
+    def daily_pattern(self, guess, day=None):
+        '''
+        Gets the score a guess gets against a day's answer
+        Arguments:
+            guess: the guessed word
+            [optional] day: the date. Defaults to today
+        Returns: the score as a string with one digit per letter
+        Raises: ValueError if the guess is invalid
+        '''
+        return self.pattern(guess, self.answer_for(day))
+
+
+    def candidates(self, guesses):
+        '''
+        Gets the answers that are consistent with a set of scored guesses
+        Arguments:
+            guesses: sequence of (guess, score) pairs, where each score is a digit string (see pattern)
+        Returns: tuple of the possible answers
+        Raises: ValueError if a guess or score is invalid
+        '''
+        codes = self._candidate_codes(tuple((guess, score) for guess, score in guesses))
+        return tuple(letterutils.decode_word(code) for code in codes)
+
+
+    def remaining(self, guesses):
+        '''
+        Gets the number of answers that are consistent with a set of scored guesses
+        Arguments:
+            guesses: sequence of (guess, score) pairs, where each score is a digit string (see pattern)
+        Returns: the number of possible answers
+        Raises: ValueError if a guess or score is invalid
+        '''
+        return len(self._candidate_codes(tuple((guess, score) for guess, score in guesses)))
+
+
+    def _candidate_codes(self, history):
+        '''
+        Gets the packed answers consistent with a tuple of (guess, score) pairs, narrowing down the (cached) answers for all but the last guess
+        '''
+        if len(history) == 0:
+            return self._answer_codes
+
+        codes = self._candidates.get(history)
+        if codes == None:
+            previous = self._candidate_codes(history[:-1])
+            guess, score = history[-1]
+            guess = self._validate(guess)
+            if score == None or len(score) != len(guess) or any(digit not in "012" for digit in score):
+                raise ValueError(f"Invalid score: {score}")
+
+            guess_code = letterutils.encode_word(guess)
+            # Score strings have the first letter's digit first, packed scores have it in the lowest place
+            expected = int(score[::-1], 3)
+            score_code = letterutils.score_code
+            codes = tuple(code for code in previous if score_code(guess_code, code) == expected)
+            self._candidates.put(history, codes)
+        return codes
+
+
+    def stats(self):
+        '''
+        Gets the statistics of the service's caches
+        Returns: dictionary of the statistics of the pattern and candidate caches (see LRUCache.stats)
+        '''
+        return {
+            "patterns": self._patterns.stats(),
+            "candidates": self._candidates.stats()
+        }
+
+
+    def clear_cache(self):
+        ''' Empties the caches and resets their statistics '''
+        self._patterns.clear()
+        self._candidates.clear()
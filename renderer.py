@@ -0,0 +1,128 @@
+import instrumentation
+import shutil
+import sys
+
+# Console width assumed when it can't be found (e.g. when writing to a file)
+DEFAULT_WIDTH = 80
+
+# ANSI escape sequences
+CLEAR_SCREEN = "\x1b[2J"
+CLEAR_LINE = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+RESET_STYLE = "\x1b[0m"
+
+
+def move_cursor(row):
+    ''' Escape sequence to move the cursor to the start of a (0-based) row '''
+    return f"\x1b[{row + 1};1H"
+
+
+class Renderer:
+    '''
+    Draws full-screen 'frames' to the console.
+    Each frame is built up in a buffer and written out in one go, and only the rows that have
+    changed since the previous frame are redrawn. The screen is cleared with ANSI escape sequences
+    rather than by running an external command.
+    Usage:
+        renderer = Renderer()
+        renderer.begin_frame()
+        renderer.write("Hello")
+        renderer.present()
+    '''
+
+    def __init__(self, output=None, interactive=None):
+        '''
+        Arguments:
+            [optional] output: the stream to draw to. Defaults to sys.stdout
+            [optional] interactive: whether to redraw in place using escape sequences. Defaults to True when
+                                    the output is a terminal. Otherwise each frame is simply written out line by line
+        '''
+        self._output = output
+        self._interactive = interactive
+        self._rows = []
+        self._previous_rows = None
+
+
+    def begin_frame(self):
+        ''' Starts building a new frame '''
+        self._rows = []
+
+
+    def write(self, text=""):
+        '''
+        Adds text to the current frame. Like print(), each call starts a new row
+        Arguments:
+            text: the text to add. May contain newlines to add multiple rows
+        '''
+        self._rows.extend(text.split("\n"))
+
+
+    def write_columns(self, blocks, block_width, separator="  ", width=None):
+        '''
+        Adds blocks of rows (e.g. game boards) to the current frame side by side.
+        Blocks that don't fit across the console are wrapped onto further bands below, separated by a blank row,
+        and everything is drawn as part of the one frame
+        Arguments:
+            blocks: list of blocks, each a list of rows. Every block must have the same number of rows
+            block_width: the visible width of each row (not counting escape sequences)
+            [optional] separator: the text between blocks
+            [optional] width: the console width. Defaults to the size of the terminal
+        '''
+        if width == None:
+            width = shutil.get_terminal_size((DEFAULT_WIDTH, 0)).columns
+        per_band = max(1, (width + len(separator)) // (block_width + len(separator)))
+
+        # Reset the style after each coloured block so that colours don't bleed into the separator
+        if any("\x1b[" in row for rows in blocks for row in rows):
+            separator = RESET_STYLE + separator
+        for start in range(0, len(blocks), per_band):
+            if start > 0:
+                self._rows.append("")
+            band = blocks[start:start + per_band]
+            self._rows.extend(separator.join(rows) for rows in zip(*band))
+
+
+    def invalidate(self):
+        ''' Forces the next frame to clear the screen and redraw every row '''
+        self._previous_rows = None
+
+
+    def present(self):
+        '''
+        Draws the current frame, redrawing only the rows that have changed since the last one.
+        Leaves the cursor on the row below the frame, with anything that was below it cleared.
+        '''
+        with instrumentation.timer("render"):
+            self._present()
+
+
+    def _present(self):
+        output = self._output or sys.stdout
+        interactive = self._interactive
+        if interactive == None:
+            interactive = output.isatty()
+
+        if not interactive:
+            output.write("\n".join(self._rows) + "\n")
+            output.flush()
+            self._previous_rows = self._rows
+            return
+
+        buffer = []
+        previous = self._previous_rows
+        if previous == None:
+            buffer.append(CLEAR_SCREEN)
+            previous = []
+
+        for i, row in enumerate(self._rows):
+            if i >= len(previous) or previous[i] != row:
+                # Reset the style at the end of each row so that colours don't bleed into the rest of the line
+                buffer.append(move_cursor(i) + row + RESET_STYLE + CLEAR_LINE)
+
+        # Remove anything left below the frame (e.g. previous input or rows from a longer frame)
+        buffer.append(move_cursor(len(self._rows)) + CLEAR_BELOW)
+
+        output.write("".join(buffer))
+        output.flush()
+
+        self._previous_rows = self._rows
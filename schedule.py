@@ -0,0 +1,304 @@
+import os
+import random
+import struct
+import sys
+
+from array import array
+from datetime import date, timedelta
+
+# Daily answers are numbered by days since this date
+EPOCH = date(1970, 1, 1)
+
+# The precomputed schedule covers every day from EPOCH up to (but not including) this date.
+# Days outside of it are still supported, they're just computed on demand
+SCHEDULE_END = date(2100, 1, 1)
+
+DEFAULT_SCHEDULE_PATH = "./data/schedule.bin"
+
+# Binary schedule layout (little-endian):
+#   16 byte header: the magic bytes, one byte holding the entry width (2 or 4), 3 reserved bytes,
+#   the number of answers the schedule was built for and the number of days it covers,
+#   followed by one answer index per day
+MAGIC = b"WPYS"
+HEADER_FORMAT = "<4sB3xII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# Schedule tables that have already been read, keyed by path. Each entry is (number of answers, table)
+_loaded_tables = {}
+
+
+def days_since_epoch(day):
+    '''
+    Gets the day number used to pick the answer for a date
+    Arguments:
+        day: the date
+    Returns: the number of days since EPOCH
+    '''
+    return (day - EPOCH).days
+
+
+def daily_index(days, answer_count):
+    '''
+    Computes the index of the answer for a day.
+    Uses its own random.Random seeded with the day number, so it never touches the global random state.
+    This isn't what Wordle does ~(it just iterates through an unordered list), and we can end up with
+    the same answer on multiple days, but it's fine for now.
+    It also prevents someone trivially looking up the next word in the data file and cheating that way.
+    Arguments:
+        days: the number of days since EPOCH
+        answer_count: the number of possible answers
+    Returns: the answer index
+    '''
+    return random.Random(days).randrange(0, answer_count)
+
+
+def _typecode_for(width):
+    return "H" if width == 2 else "I"
+
+
+def build_schedule(answer_count, days=None):
+    '''
+    Precomputes the answer index for a range of days
+    Arguments:
+        answer_count: the number of possible answers
+        [optional] days: the number of days (from EPOCH) to cover. Defaults to every day up to SCHEDULE_END
+    Returns: an array of answer indexes, one per day
+    Raises: ValueError if there are no answers
+    '''
+    if answer_count <= 0:
+        raise ValueError("No answers to schedule")
+    if days == None:
+        days = days_since_epoch(SCHEDULE_END)
+
+    width = 2 if answer_count <= 0xFFFF else 4
+    return array(_typecode_for(width), (daily_index(day, answer_count) for day in range(days)))
+
+
+def write_schedule(path, answer_count, days=None):
+    '''
+    Precomputes a schedule (see build_schedule) and writes it in the binary format
+    Arguments:
+        path: the file to write
+        answer_count: the number of possible answers
+        [optional] days: the number of days (from EPOCH) to cover. Defaults to every day up to SCHEDULE_END
+    Returns: the path of the written file
+    '''
+    table = build_schedule(answer_count, days)
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    with open(path, "wb") as schedule_file:
+        schedule_file.write(struct.pack(HEADER_FORMAT, MAGIC, table.itemsize, answer_count, len(table)))
+        schedule_file.write(table.tobytes())
+
+    return path
+
+
+def read_schedule(path):
+    '''
+    Reads a binary schedule
+    Arguments:
+        path: the file to read
+    Returns: tuple of (the number of answers the schedule was built for, array of answer indexes)
+    Raises: ValueError if the file isn't a valid schedule
+    '''
+    with open(path, "rb") as schedule_file:
+        data = schedule_file.read()
+
+    if len(data) < HEADER_SIZE:
+        raise ValueError(f"{path} is not a schedule")
+    magic, width, answer_count, days = struct.unpack_from(HEADER_FORMAT, data)
+    if magic != MAGIC or width not in (2, 4):
+        raise ValueError(f"{path} is not a schedule")
+
+    table = array(_typecode_for(width))
+    table.frombytes(data[HEADER_SIZE:])
+    if len(table) != days:
+        raise ValueError(f"{path} is corrupt")
+    if sys.byteorder != "little":
+        table.byteswap()
+
+    return (answer_count, table)
+
+
+class AnswerSchedule:
+    '''
+    Maps dates to daily answers in O(1) using a precomputed table of answer indexes.
+    Dates that the table doesn't cover fall back to computing the index directly (see daily_index).
+    Usage:
+        schedule = load_schedule(possible_answers)
+        schedule.answer_for(date(2022, 2, 1))
+    '''
+
+    def __init__(self, possible_answers, table=None):
+        '''
+        Arguments:
+            possible_answers: the answers to pick from
+            [optional] table: the precomputed answer index for each day since EPOCH. Defaults to no table
+        '''
+        if len(possible_answers) == 0:
+            raise ValueError("No answers to schedule")
+
+        self._answers = possible_answers
+        self._table = table if table != None else ()
+
+
+    def __len__(self):
+        ''' The number of days covered by the precomputed table '''
+        return len(self._table)
+
+
+    def index_for(self, day):
+        '''
+        Gets the index of the answer for a date
+        Arguments:
+            day: the date
+        Returns: the index into the possible answers
+        '''
+        days = days_since_epoch(day)
+        if 0 <= days < len(self._table):
+            return self._table[days]
+        return daily_index(days, len(self._answers))
+
+
+    def answer_for(self, day):
+        '''
+        Gets the answer for a date
+        Arguments:
+            day: the date
+        Returns: the answer
+        '''
+        return self._answers[self.index_for(day)]
+
+
+def load_schedule(possible_answers, path=DEFAULT_SCHEDULE_PATH):
+    '''
+    Gets an AnswerSchedule for a list of answers.
+    The precomputed table is read (once per process) from path, and used if it was built for the same number of answers.
+    Otherwise every lookup is computed on demand.
+    Arguments:
+        possible_answers: the answers to pick from
+        [optional] path: the binary schedule file
+    Returns: the AnswerSchedule
+    '''
+    loaded = _loaded_tables.get(path)
+    if loaded == None:
+        loaded = read_schedule(path) if os.path.exists(path) else (0, None)
+        _loaded_tables[path] = loaded
+
+    answer_count, table = loaded
+    if answer_count != len(possible_answers):
+        table = None
+
+    return AnswerSchedule(possible_answers, table)
+
+
+def clear_cache():
+    ''' Forgets all of the cached schedule tables so that they will be reloaded from disk on next use '''
+    _loaded_tables.clear()
+
+
+def answers_between(possible_answers, start, end, path=DEFAULT_SCHEDULE_PATH):
+    '''
+    Gets the daily answer for every day in a range, using the precomputed table where it covers the days (see load_schedule)
+    Arguments:
+        possible_answers: the answers to pick from
+        start: the first date
+        end: the last date (inclusive)
+        [optional] path: the binary schedule file
+    Returns: generator of (date, answer) tuples
+    Raises: ValueError if end is before start
+    '''
+    if end < start:
+        raise ValueError("end must not be before start")
+
+    answer_for = load_schedule(possible_answers, path).answer_for
+    one_day = timedelta(days=1)
+    day = start
+    while day <= end:
+        yield (day, answer_for(day))
+        day += one_day
+
+
+def write_csv(stream, entries):
+    '''
+    Streams daily answers as CSV, with a "date,answer" header line
+    Arguments:
+        stream: the text stream to write to
+        entries: iterable of (date, answer) tuples (see answers_between)
+    Returns: the number of days written
+    '''
+    stream.write("date,answer\n")
+    count = 0
+    for day, answer in entries:
+        stream.write(f"{day.isoformat()},{answer}\n")
+        count += 1
+    return count
+
+
+def write_json(stream, entries):
+    '''
+    Streams daily answers as a json object mapping each ISO format date to its answer.
+    Written one day at a time so any number of days can be exported without building the whole object in memory
+    Arguments:
+        stream: the text stream to write to
+        entries: iterable of (date, answer) tuples (see answers_between)
+    Returns: the number of days written
+    '''
+    stream.write("{")
+    count = 0
+    for day, answer in entries:
+        stream.write(f'{"," if count > 0 else ""}\n  "{day.isoformat()}": "{answer}"')
+        count += 1
+    stream.write("\n}\n")
+    return count
+
+
+def export_schedule(possible_answers, start, end, output_path=None):
+    '''
+    Exports the daily answers for a range of dates. The format depends on the output file:
+        .json: json object mapping each date to its answer (see write_json)
+        .bin:  a binary schedule (see write_schedule) covering every day from EPOCH to end, for load_schedule to serve from
+        other: CSV (see write_csv), which is also what's written to stdout when there's no output file
+    Arguments:
+        possible_answers: the answers to pick from
+        start: the first date
+        end: the last date (inclusive)
+        [optional] output_path: the file to write. Defaults to stdout
+    Returns: the number of days written
+    Raises: ValueError if the range is invalid
+    '''
+    if end < start:
+        raise ValueError("end must not be before start")
+
+    if output_path != None and output_path.endswith(".bin"):
+        if start < EPOCH:
+            raise ValueError(f"Binary schedules start at {EPOCH.isoformat()}")
+        days = days_since_epoch(end) + 1
+        write_schedule(output_path, len(possible_answers), days)
+        # Anything serving from the old file needs to pick up the new one
+        _loaded_tables.pop(output_path, None)
+        return days
+
+    writer = write_json if output_path != None and output_path.endswith(".json") else write_csv
+    entries = answers_between(possible_answers, start, end)
+    if output_path == None:
+        return writer(sys.stdout, entries)
+    with open(output_path, "w", encoding="ascii") as output_file:
+        return writer(output_file, entries)
+
+
+def main():
+    '''
+    Precomputes the schedule for the game's answer list (or the json word list passed on the command-line)
+    '''
+    import wordlist
+
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "./data/answers.json"
+    path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_SCHEDULE_PATH
+    answers = wordlist.load_word_list(json_path)
+    print(f"{json_path} -> {write_schedule(path, len(answers))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import asyncio
+import letterutils
+import sys
+import wordlist
+
+from game import ANSWERS_PATH, VALID_WORDS_PATH
+from gamesession import GameSession, pick_answer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Longest command line we'll accept from a client
+MAX_LINE_LENGTH = 256
+
+# Command-line options that NEW accepts, and how many arguments each takes.
+# Everything else (other word lengths, dictionaries, files, etc.) is only for the console game
+NEW_OPTIONS = {"-date": 1, "-hard": 0, "-random": 0, "-word": 1}
+
+
+class WordPyServer:
+    '''
+    Asyncio server that hosts many concurrent games over a plain TCP line protocol.
+    Each connection plays one game at a time. Commands (one per line) and their replies:
+        NEW [-date <YYYY-MM-DD> | -random | -word <word>] [-hard]  ->  OK NEW <max guesses>
+        GUESS <word>                                               ->  OK <word> <score> PLAYING | WON | LOST <answer>
+        QUIT                                                       ->  OK BYE (and the connection is closed)
+    Scores use one digit per letter (see letterutils.score_to_string).
+    Errors are reported as: ERR <message>
+    Usage:
+        server = WordPyServer()
+        await server.start(port=8765)
+        await server.serve_forever()
+    '''
+
+    def __init__(self, possible_answers=None, word_index=None):
+        '''
+        Arguments:
+            [optional] possible_answers: the answers to pick from. Defaults to the game's answer list
+            [optional] word_index: the WordIndex used to validate guesses. Defaults to the game's valid word list
+        '''
+        self._answers = possible_answers if possible_answers != None else wordlist.load_word_list(ANSWERS_PATH)
+        self._word_index = word_index if word_index != None else wordlist.load_word_index(VALID_WORDS_PATH)
+        self._server = None
+        self._connections = 0
+
+
+    @property
+    def connections(self):
+        ''' The number of currently connected clients '''
+        return self._connections
+
+
+    @property
+    def port(self):
+        ''' The port the server is listening on (useful when started with port 0) '''
+        return self._server.sockets[0].getsockname()[1]
+
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        '''
+        Starts listening for connections
+        Arguments:
+            host: the address to listen on
+            port: the port to listen on. Pass 0 to pick any free port
+        '''
+        self._server = await asyncio.start_server(self._handle_client, host, port, limit=MAX_LINE_LENGTH)
+
+
+    async def serve_forever(self):
+        ''' Serves clients until cancelled '''
+        async with self._server:
+            await self._server.serve_forever()
+
+
+    async def close(self):
+        ''' Stops accepting connections '''
+        self._server.close()
+        await self._server.wait_closed()
+
+
+    def new_session(self, args):
+        '''
+        Creates a new game session from NEW command arguments
+        Arguments:
+            args: the options following the NEW command (same form as the command-line options)
+        Returns: the new GameSession
+        Raises: ValueError on invalid options
+        '''
+        # Deferred import as the entry point module pulls in the console game
+        from wordpy import create_game_data_from_args
+
+        i = 0
+        while i < len(args):
+            if args[i] not in NEW_OPTIONS:
+                raise ValueError(f"Unsupported option: {args[i]}")
+            i += 1 + NEW_OPTIONS[args[i]]
+
+        config = create_game_data_from_args(["NEW"] + args)
+
+        return GameSession(pick_answer(config, self._answers), self._word_index, hard=config.hard)
+
+
+    def handle_command(self, session, line):
+        '''
+        Processes a single command line from a client
+        Arguments:
+            session: the client's current GameSession (or None if they haven't started one)
+            line: the command line
+        Returns: tuple of (session, reply, keep_open)
+        '''
+        parts = line.split()
+        if len(parts) == 0:
+            return (session, "ERR Empty command", True)
+
+        command = parts[0].upper()
+        args = parts[1:]
+
+        match command:
+            case "NEW":
+                try:
+                    session = self.new_session(args)
+                except ValueError as e:
+                    return (session, f"ERR {str(e) or 'Invalid options'}", True)
+                return (session, f"OK NEW {session.max_guesses}", True)
+
+            case "GUESS":
+                if session == None:
+                    return (session, "ERR No game in progress", True)
+                if len(args) != 1:
+                    return (session, "ERR Expected GUESS <word>", True)
+
+                try:
+                    word, score = session.submit_guess(args[0])
+                except ValueError as e:
+                    return (session, f"ERR {e}", True)
+
+                if session.won:
+                    status = "WON"
+                elif session.lost:
+                    status = f"LOST {session.answer}"
+                else:
+                    status = "PLAYING"
+                return (session, f"OK {word} {letterutils.score_to_string(score)} {status}", True)
+
+            case "QUIT":
+                return (session, "OK BYE", False)
+
+            case _:
+                return (session, f"ERR Unknown command: {parts[0]}", True)
+
+
+    async def _handle_client(self, reader, writer):
+        '''
+        Runs the command loop for a single connected client
+        '''
+        self._connections += 1
+        session = None
+        try:
+            keep_open = True
+            while keep_open:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b"ERR Line too long\n")
+                    break
+                if not line:
+                    break
+
+                session, reply, keep_open = self.handle_command(session, line.decode("ascii", errors="replace"))
+                writer.write(reply.encode("ascii", errors="replace") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+
+
+async def run_server(host, port):
+    '''
+    Starts a server and runs it until cancelled
+    Arguments:
+        host: the address to listen on
+        port: the port to listen on
+    '''
+    server = WordPyServer()
+    await server.start(host, port)
+    print(f"WordPy server listening on {host}:{server.port}")
+    await server.serve_forever()
+
+
+def main():
+    '''
+    Runs the server. Usage: server.py [host] [port]
+    '''
+    host = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_HOST
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+    try:
+        asyncio.run(run_server(host, port))
+    # Capture Ctrl + C and quit gracefully
+    except KeyboardInterrupt:
+        sys.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import batchscore
+import multiprocessing
+import numpy as np
+import os
+import time
+import wordlist
+
+from concurrent.futures import ProcessPoolExecutor
+from game import ANSWERS_PATH, VALID_WORDS_PATH
+from gamesession import GameSession, MAX_GUESSES
+from solver import Solver
+
+# Number of answers handed to a worker process at a time
+DEFAULT_CHUNK_SIZE = 100
+
+
+class CandidateStrategy:
+    '''
+    Simple guessing strategy: guesses the first answer that is still consistent with all of the feedback so far.
+    Strategies are any object with a next_guess(session) method that returns the word to guess next for a GameSession.
+    '''
+
+    def __init__(self, possible_answers, valid_words, opening="raise"):
+        '''
+        Arguments:
+            possible_answers: the answers that the game could be using
+            valid_words: all of the words that can be guessed
+            [optional] opening: the first word to guess
+        '''
+        self._answers = list(possible_answers)
+        self._letters = batchscore.encode_words(self._answers)
+        self._opening = opening
+
+
+    def candidates(self, session):
+        '''
+        Gets the answers that are consistent with all of the guesses made so far in a session
+        Arguments:
+            session: the GameSession to check
+        Returns: list of candidate answers
+        '''
+        matches = session.letters.filter_mask(self._letters)
+        return [self._answers[index] for index in np.flatnonzero(matches)]
+
+
+    def next_guess(self, session):
+        if session.guess_count == 0 and self._opening != None:
+            return self._opening
+        return self.candidates(session)[0]
+
+
+# Available strategies, keyed by the name used on the command-line
+STRATEGIES = {
+    "candidate": CandidateStrategy,
+    "entropy": Solver
+}
+
+
+class SimulationResult:
+    '''
+    Summary of a simulation run
+    '''
+
+    def __init__(self, strategy, guess_counts, max_guesses, elapsed):
+        '''
+        Arguments:
+            strategy: the name of the strategy that was simulated
+            guess_counts: the number of guesses taken for each game (0 for a lost game)
+            max_guesses: the number of guesses allowed per game
+            elapsed: the wall time taken in seconds
+        '''
+        self.strategy = strategy
+        self.games = len(guess_counts)
+        self.wins = sum(1 for count in guess_counts if count > 0)
+        self.elapsed = elapsed
+
+        # Index 0 holds the number of lost games, index n the number of games won in n guesses
+        self.distribution = [0] * (max_guesses + 1)
+        for count in guess_counts:
+            self.distribution[count] += 1
+
+
+    @property
+    def win_rate(self):
+        ''' The fraction of games won '''
+        return self.wins / self.games if self.games > 0 else 0.0
+
+
+    @property
+    def average_guesses(self):
+        ''' The average number of guesses taken in won games '''
+        if self.wins == 0:
+            return 0.0
+        return sum(guesses * count for guesses, count in enumerate(self.distribution)) / self.wins
+
+
+    @property
+    def games_per_second(self):
+        ''' Simulation throughput '''
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+
+    def format_report(self):
+        '''
+        Gets a human readable report of the results
+        Returns: the report string
+        '''
+        lines = [
+            f"Strategy:         {self.strategy}",
+            f"Games:            {self.games}",
+            f"Win rate:         {self.win_rate:.2%}",
+            f"Average guesses:  {self.average_guesses:.3f}",
+            f"Games per second: {self.games_per_second:.1f}",
+            "Guess distribution:"
+        ]
+        for guesses in range(1, len(self.distribution)):
+            lines.append(f"  {guesses}: {self.distribution[guesses]}")
+        lines.append(f"  X: {self.distribution[0]}")
+        return "\n".join(lines)
+
+
+def create_strategy(name):
+    '''
+    Creates a strategy using the game's word lists
+    Arguments:
+        name: the name of the strategy (see STRATEGIES)
+    Returns: the strategy object
+    Raises: ValueError for an unknown strategy name
+    '''
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {name}")
+    return STRATEGIES[name](wordlist.load_word_list(ANSWERS_PATH), wordlist.load_word_list(VALID_WORDS_PATH))
+
+
+def play_game(strategy, answer, word_index=None):
+    '''
+    Plays a single game using a strategy
+    Arguments:
+        strategy: the strategy to pick guesses with
+        answer: the answer for the game
+        [optional] word_index: the WordIndex used to validate guesses
+    Returns: the number of guesses taken, or 0 if the game was lost
+    '''
+    session = GameSession(answer, word_index)
+    while not session.finished:
+        session.submit_guess(strategy.next_guess(session))
+    return session.guess_count if session.won else 0
+
+
+# The strategy used by worker processes. Set in the parent before the pool starts so that forked workers
+# share it (including any tables it has loaded), or created once per worker by _init_worker otherwise
+_worker_strategy = None
+
+
+def _init_worker(strategy_name):
+    global _worker_strategy
+    _worker_strategy = create_strategy(strategy_name)
+
+
+def _play_chunk(answers):
+    word_index = wordlist.load_word_index(VALID_WORDS_PATH)
+    return [play_game(_worker_strategy, answer, word_index) for answer in answers]
+
+
+def run_simulation(strategy_name, answers=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Plays a game against every answer using the specified strategy, spreading the games over multiple processes
+    Arguments:
+        strategy_name: the name of the strategy to use (see STRATEGIES)
+        [optional] answers: the answers to play against. Defaults to every possible answer
+        [optional] workers: the number of worker processes. Defaults to the number of CPUs
+        [optional] chunk_size: the number of games to send to a worker at a time
+    Returns: a SimulationResult
+    Raises: ValueError for an unknown strategy name
+    '''
+    if strategy_name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy: {strategy_name}")
+
+    # Load the word lists before starting the pool so that forked workers inherit them rather than reloading them
+    if answers == None:
+        answers = wordlist.load_word_list(ANSWERS_PATH)
+    wordlist.load_word_index(VALID_WORDS_PATH)
+
+    chunks = [answers[i:i + chunk_size] for i in range(0, len(answers), chunk_size)]
+
+    # With fork the strategy is built once, here, and every worker inherits it (the entropy strategy's pattern table
+    # alone is tens of MB). Other start methods have to build it in each worker
+    global _worker_strategy
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        _worker_strategy = create_strategy(strategy_name)
+        initializer = None
+        initargs = ()
+    else:
+        context = None
+        initializer = _init_worker
+        initargs = (strategy_name,)
+
+    start = time.perf_counter()
+    guess_counts = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context,
+                                 initializer=initializer, initargs=initargs) as executor:
+            for results in executor.map(_play_chunk, chunks):
+                guess_counts.extend(results)
+    finally:
+        _worker_strategy = None
+    elapsed = time.perf_counter() - start
+
+    return SimulationResult(strategy_name, guess_counts, MAX_GUESSES, elapsed)
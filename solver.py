@@ -0,0 +1,291 @@
+import batchscore
+import hashlib
+import letterutils
+import numpy as np
+
+from letterutils import LetterState
+from patterntable import DEFAULT_TABLE_PATH, PatternTable
+
+# Number of distinct packed scores for a 5-letter word (3^5)
+NUM_PATTERNS = 243
+
+# Number of guesses scored at a time when ranking, which bounds the memory used to rank every guess (see Solver._rank)
+RANK_CHUNK_ROWS = 512
+
+# Maximum number of candidate sets to remember guess rankings for
+MAX_CACHED_RANKINGS = 4096
+
+# Above this many (guess x candidate) cells we only rank a shortlist of guesses: the best opening guesses,
+# plus the candidates themselves when there are few enough. Good openers stay good discriminators so this rarely changes the answer.
+MAX_FULL_RANK_CELLS = 1000000
+SHORTLIST_SIZE = 250
+
+
+class Solver:
+    '''
+    Suggests guesses by ranking every valid word by the expected information (entropy) it gives
+    about the remaining candidate answers. Uses a precomputed PatternTable so no scoring happens at query time,
+    and remembers the ranking for each distinct set of candidates it has seen.
+    Usage:
+        solver = Solver(game.possible_answers, game.valid_words)
+        solver.best_guess(game.session.guesses)
+    '''
+
+    def __init__(self, possible_answers, valid_words, table=None, table_path=DEFAULT_TABLE_PATH):
+        '''
+        Arguments:
+            possible_answers: the answers that the game could be using
+            valid_words: all of the words that can be guessed
+            [optional] table: a PatternTable of valid_words x possible_answers. Loaded (or built) if missing
+            [optional] table_path: where to load/save the PatternTable if one isn't supplied
+        '''
+        # A newly built table is only saved once the opening ranking has been added to it, below
+        save_path = None
+        if table == None:
+            table = PatternTable.load_matching(valid_words, possible_answers, table_path)
+            if table == None:
+                table = PatternTable.build(valid_words, possible_answers)
+                save_path = table_path
+
+        self._table = table
+        self._rankings = {}
+
+        # Lets us prefer guesses that could also be the answer when they're equally informative
+        self._answer_rows = np.array([table.guess_row(answer) for answer in table.answers])
+        self._all_rows = np.arange(len(table.guesses))
+        self._num_patterns = letterutils.all_correct(len(table.answers[0])) + 1 if len(table.answers) > 0 else NUM_PATTERNS
+
+        # Encoded words for filtering with a LetterTracker (see lettertracker.LetterTracker.filter_mask). Built on first use
+        self._answer_letters = None
+        self._guess_letters = None
+
+        # Ranking every guess against every answer for the opening takes about a second for the full word lists,
+        # so it's done once, here, and saved with the table rather than on the first hint.
+        # The best openers are also the shortlist for ranking large candidate sets (see _rows_to_rank)
+        all_columns = np.arange(len(table.answers))
+        opening = table.opening
+        if opening == None:
+            opening = self._rank(all_columns, self._all_rows)
+            table.set_opening(*opening)
+            save_path = table_path
+        if save_path != None:
+            try:
+                table.save(save_path)
+            except OSError:
+                pass
+        self._rankings[self._fingerprint(all_columns, None)] = opening
+        self._shortlist = opening[0][:SHORTLIST_SIZE]
+
+
+    @property
+    def table(self):
+        ''' The PatternTable used by the solver '''
+        return self._table
+
+
+    def candidates(self, guesses, letters=None):
+        '''
+        Finds the answers consistent with all of the feedback so far
+        Arguments:
+            guesses: list of (word, score) tuples, as stored by GameSession.guesses. Blank rows are ignored
+            [optional] letters: the LetterTracker holding everything known from the guesses (e.g. GameSession.letters).
+                                When given the answers are filtered with it rather than by looking up each guess
+        Returns: array of candidate answer (column) indexes into table.answers
+        '''
+        if letters != None:
+            if self._answer_letters is None:
+                self._answer_letters = batchscore.encode_words(self._table.answers)
+            return np.flatnonzero(letters.filter_mask(self._answer_letters))
+
+        columns = np.arange(len(self._table.answers))
+        patterns = self._table.patterns
+
+        for word, score in guesses:
+            if LetterState.NONE in score:
+                continue
+
+            row = self._table.guess_row(word.lower())
+            if row == None:
+                raise ValueError(f"Unknown guess: {word}")
+
+            code = letterutils.encode_score(score)
+            columns = columns[patterns[row, columns] == code]
+
+        return columns
+
+
+    def _hard_mode_rows(self, letters):
+        '''
+        Finds the guesses that are allowed in hard mode: those consistent with everything known so far
+        '''
+        if self._guess_letters is None:
+            self._guess_letters = batchscore.encode_words(self._table.guesses)
+        return np.flatnonzero(letters.filter_mask(self._guess_letters))
+
+
+    def candidate_words(self, guesses):
+        '''
+        Finds the answers consistent with all of the feedback so far
+        Arguments:
+            guesses: list of (word, score) tuples, as stored by GameSession.guesses
+        Returns: list of candidate answers
+        '''
+        answers = self._table.answers
+        return [answers[column] for column in self.candidates(guesses)]
+
+
+    def _rank(self, columns, rows):
+        '''
+        Ranks guesses by the expected information they give about the candidate columns
+        Arguments:
+            columns: the candidate answer columns
+            rows: the guess rows to rank
+        Returns: tuple of (guess rows best first, their scores)
+        '''
+        num_candidates = len(columns)
+        num_patterns = self._num_patterns
+        entropy = np.empty(len(rows))
+
+        # Guesses are scored RANK_CHUNK_ROWS at a time, as the arrays for every guess against every answer run to GBs
+        for start in range(0, len(rows), RANK_CHUNK_ROWS):
+            chunk = rows[start:start + RANK_CHUNK_ROWS]
+
+            # Count how many candidates fall into each pattern for every guess in the chunk in one pass
+            offsets = np.arange(len(chunk), dtype=np.int64)[:, None] * num_patterns
+            buckets = self._table.patterns[np.ix_(chunk, columns)] + offsets
+            counts = np.bincount(buckets.ravel(), minlength=len(chunk) * num_patterns)
+
+            # Entropy = log2(n) - (1/n) * sum(c * log2(c)) over the bucket sizes c. Each candidate contributes
+            # log2 of its own bucket size to that sum, which avoids touching the (mostly empty) buckets
+            bucket_sizes = counts[buckets]
+            entropy[start:start + len(chunk)] = np.log2(num_candidates) - np.log2(bucket_sizes).sum(axis=1) / num_candidates
+
+        # Break ties in favour of guesses that might win outright
+        entropy[np.isin(rows, self._answer_rows[columns])] += 1.0 / num_candidates
+
+        order = np.argsort(-entropy, kind="stable")
+        return (rows[order], entropy[order])
+
+
+    def _rows_to_rank(self, columns, allowed=None):
+        '''
+        Picks which guesses to rank for a set of candidate columns, keeping to the MAX_FULL_RANK_CELLS budget
+        Arguments:
+            columns: the candidate answer columns
+            [optional] allowed: the only guess rows that may be ranked (e.g. in hard mode). Defaults to every row
+        '''
+        if allowed is None and len(columns) == len(self._table.answers):
+            # The opening ranking, worked out up front
+            return self._all_rows
+        rows = allowed if allowed is not None else self._all_rows
+        if len(rows) * len(columns) <= MAX_FULL_RANK_CELLS:
+            return rows
+
+        # The candidates themselves are only worth adding while they keep the ranking within the same budget
+        candidate_rows = self._answer_rows[columns]
+        if (len(self._shortlist) + len(columns)) * len(columns) > MAX_FULL_RANK_CELLS:
+            shortlist = self._shortlist
+        else:
+            shortlist = np.union1d(self._shortlist, candidate_rows)
+        if allowed is None:
+            return shortlist
+
+        # The candidates are always allowed in hard mode, so fall back to some of them if none of the shortlist is
+        rows = np.intersect1d(allowed, shortlist)
+        if len(rows) == 0:
+            rows = np.unique(candidate_rows)[:SHORTLIST_SIZE]
+        return rows
+
+
+    def _fingerprint(self, columns, rows):
+        '''
+        Gets the key a ranking is cached under: a hash of the candidate columns and (when restricted) the guess rows
+        '''
+        key = hashlib.blake2b(columns.astype(np.int32).tobytes(), digest_size=16)
+        if rows is not None:
+            key.update(b"rows" + rows.astype(np.int32).tobytes())
+        return key.digest()
+
+
+    def _ranking_for(self, columns, rows=None):
+        '''
+        Gets the (cached) ranking for a set of candidate columns
+        Arguments:
+            columns: the candidate answer columns
+            [optional] rows: the only guess rows that may be ranked (e.g. in hard mode). Defaults to every row.
+                             Either way only some of them are ranked for large candidate sets (see _rows_to_rank)
+        '''
+        # Allowing every row (e.g. hard mode before anything is known) is the same as not restricting them
+        if rows is not None and len(rows) == len(self._all_rows):
+            rows = None
+
+        fingerprint = self._fingerprint(columns, rows)
+        ranking = self._rankings.get(fingerprint)
+        if ranking == None:
+            if len(self._rankings) >= MAX_CACHED_RANKINGS:
+                # Forget the oldest ranking
+                del self._rankings[next(iter(self._rankings))]
+            ranking = self._rank(columns, self._rows_to_rank(columns, rows))
+            self._rankings[fingerprint] = ranking
+        return ranking
+
+
+    def rank_guesses(self, guesses, count=10, letters=None, hard=False):
+        '''
+        Ranks the possible next guesses by the expected information they give
+        Arguments:
+            guesses: list of (word, score) tuples, as stored by GameSession.guesses
+            [optional] count: the number of guesses to return
+            [optional] letters: the LetterTracker holding everything known from the guesses (see candidates)
+            [optional] hard: only rank guesses that are allowed in hard mode (needs letters)
+        Returns: list of (word, expected information in bits) tuples, best first
+        '''
+        columns = self.candidates(guesses, letters)
+        if len(columns) == 0:
+            return []
+
+        rows, scores = self._ranking_for(columns, self._rows_for_mode(letters, hard))
+        words = self._table.guesses
+        return [(words[row], float(score)) for row, score in zip(rows[:count], scores[:count])]
+
+
+    def best_guess(self, guesses, letters=None, hard=False):
+        '''
+        Gets the best next guess
+        Arguments:
+            guesses: list of (word, score) tuples, as stored by GameSession.guesses
+            [optional] letters: the LetterTracker holding everything known from the guesses (see candidates)
+            [optional] hard: only suggest guesses that are allowed in hard mode (needs letters)
+        Returns: the suggested word, or None if no answers are consistent with the guesses
+        '''
+        columns = self.candidates(guesses, letters)
+        if len(columns) == 0:
+            return None
+
+        # With one or two candidates left the best we can do is guess one of them (which is always allowed in hard mode)
+        if len(columns) <= 2:
+            return self._table.answers[columns[0]]
+
+        rows, scores = self._ranking_for(columns, self._rows_for_mode(letters, hard))
+        return self._table.guesses[rows[0]]
+
+
+    def _rows_for_mode(self, letters, hard):
+        '''
+        Gets the guess rows allowed by the mode: every row (None) normally, or only the consistent ones in hard mode
+        '''
+        if not hard:
+            return None
+        if letters == None:
+            raise ValueError("Hard mode suggestions need the LetterTracker")
+        return self._hard_mode_rows(letters)
+
+
+    def next_guess(self, session):
+        '''
+        Strategy interface used by the simulator (see simulate.py)
+        '''
+        # The pattern table filters the candidates fastest, the letters are only needed to pick hard mode guesses
+        if session.hard:
+            return self.best_guess(session.guesses, session.letters, True)
+        return self.best_guess(session.guesses)
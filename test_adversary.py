@@ -0,0 +1,67 @@
+import pytest
+
+from adversary import AdversarialSession, CandidateIndex
+from letterutils import encode_word, encode_score, score_word
+from letterutils import LetterState
+from wordindex import WordIndex
+
+ANSWERS = ["eager", "erase", "raise", "arise", "pound", "mound", "sound", "wound"]
+
+
+def test_candidate_index():
+    with pytest.raises(ValueError):
+        index = CandidateIndex([])
+    with pytest.raises(ValueError):
+        index = CandidateIndex(["raise", "hi"])
+
+    index = CandidateIndex(ANSWERS)
+    assert len(index) == len(ANSWERS)
+    assert index.words() == ANSWERS
+
+    # Buckets match grouping by score_word
+    buckets = index.buckets(encode_word("round"))
+    expected = {}
+    for answer in ANSWERS:
+        expected.setdefault(encode_score(score_word("round", answer)[1]), []).append(encode_word(answer))
+    assert buckets == expected
+
+    # The largest bucket is kept: the four *ound words
+    score = index.narrow(encode_word("round"))
+    assert score == encode_score([LetterState.WRONG, LetterState.CORRECT, LetterState.CORRECT, LetterState.CORRECT, LetterState.CORRECT])
+    assert index.words() == ["pound", "mound", "sound", "wound"]
+
+    # Ties keep the bucket that reveals least, and a win is only conceded when it's the only option
+    score = index.narrow(encode_word("pound"))
+    assert score == encode_score([LetterState.WRONG] + [LetterState.CORRECT] * 4)
+    assert index.words() == ["mound", "sound", "wound"]
+
+    index = CandidateIndex(["sound"])
+    assert index.narrow(encode_word("sound")) == 242
+
+
+def test_adversarial_session():
+    session = AdversarialSession(ANSWERS, WordIndex(ANSWERS + ["round", "salty"]))
+    assert session.candidate_count == len(ANSWERS)
+    assert session.answer in ANSWERS
+
+    guess = session.submit_guess("round")
+    assert guess.score_code == encode_score(score_word("round", session.answer)[1])
+    assert session.candidate_count == 4
+    assert not session.won
+
+    # Guessing a candidate never wins while there are others left
+    session.submit_guess("sound")
+    assert not session.won
+    assert session.candidate_count == 3
+
+    # Every guess is consistent with the final answer
+    session.submit_guess("pound")
+    session.submit_guess("mound")
+    assert session.candidate_count == 1
+    assert session.answer == "wound"
+    for word, score in session.guesses[:session.guess_count]:
+        assert score_word(word, session.answer)[1] == score
+
+    session.submit_guess("wound")
+    assert session.won
+    assert session.finished
@@ -0,0 +1,41 @@
+import batchmode
+import io
+
+def test_read_lines():
+    stream = io.StringIO("eager raise\n\n  # a comment\n  eager erase  \n")
+    assert list(batchmode.read_lines(stream)) == [(1, "eager raise"), (4, "eager erase")]
+
+
+def test_process():
+    stream = io.StringIO("EAGER raise\n" +
+                         "eager raise erase eager\n" +
+                         "eager\n" +
+                         "eager toolong\n" +
+                         "x-ray eager\n" +
+                         "planet plants\n" +
+                         "planets planets stealth\n" +
+                         "absolute obsolete\n")
+    output = io.StringIO()
+    errors = batchmode.process(stream, output)
+
+    assert errors == 3
+    assert output.getvalue().splitlines() == [
+        "eager raise 12001",
+        "eager raise 12001 erase 21101 eager 22222",
+        "ERR 3 expected an answer followed by at least one guess",
+        "ERR 4 invalid word: toolong",
+        "ERR 5 invalid word: x-ray",
+        "planet plants 222210",
+        "planets planets 2222222 stealth 1011120",
+        "absolute obsolete 02222022"
+    ]
+
+
+def test_score_lines_is_lazy():
+    def lines():
+        yield (1, "eager raise")
+        raise AssertionError("read too far")
+
+    # Only the first line is read to produce the first result
+    results = batchmode.format_results(batchmode.score_lines(lines()))
+    assert next(results) == "eager raise 12001\n"
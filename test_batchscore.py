@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from batchscore import encode_words, score_batch, score_matrix
+from letterutils import score_word, encode_score
+
+GUESSES = ["raise", "eerie", "geese", "pound", "eager", "erase", "llama", "sassy"]
+ANSWERS = ["eager", "geese", "amass", "llama", "essay"]
+
+def test_encode_words():
+    letters = encode_words(["abc", "XYZ"])
+    assert letters.shape == (2, 3)
+    assert letters.tolist() == [[0, 1, 2], [23, 24, 25]]
+    assert encode_words(letters) is letters
+    assert encode_words([]).shape[0] == 0
+
+    with pytest.raises(ValueError):
+        encode_words(["abc", "abcd"])
+    with pytest.raises(ValueError):
+        encode_words(["x-ray"])
+    with pytest.raises(ValueError):
+        encode_words(["áéíóú"])
+
+
+def test_score_batch():
+    for guess in GUESSES:
+        codes = score_batch(guess, ANSWERS)
+        assert codes.dtype == np.uint8
+        assert codes.tolist() == [encode_score(score_word(guess, answer)[1]) for answer in ANSWERS]
+
+    assert score_batch("EAGER", ["eager"]).tolist() == [242]
+
+
+def test_score_matrix():
+    matrix = score_matrix(GUESSES, encode_words(ANSWERS))
+    assert matrix.shape == (len(GUESSES), len(ANSWERS))
+    for i, guess in enumerate(GUESSES):
+        for j, answer in enumerate(ANSWERS):
+            assert matrix[i, j] == encode_score(score_word(guess, answer)[1])
+
+    with pytest.raises(ValueError):
+        score_matrix(["raise"], ["rais"])
+
+
+def test_score_matrix_lengths():
+    # Scores of words with more than 5 letters don't fit in a byte
+    words = ["planet", "banana", "pebble", "coffee", "lemons", "orange"]
+    matrix = score_matrix(words, words)
+    assert matrix.dtype == np.uint16
+    for i, guess in enumerate(words):
+        for j, answer in enumerate(words):
+            assert matrix[i, j] == encode_score(score_word(guess, answer)[1])
+
+    assert score_batch("absolute", ["absolute", "obsolete"]).tolist() == [3 ** 8 - 1, encode_score(score_word("absolute", "obsolete")[1])]
+    assert score_matrix(["bead"], ["abed"]).dtype == np.uint8
@@ -0,0 +1,44 @@
+import benchmark
+
+def test_make_result():
+    result = benchmark.make_result("test", [0.3, 0.1, 0.2], 100)
+    assert result["name"] == "test"
+    assert result["runs"] == 3
+    assert result["median_seconds"] == 0.2
+    assert result["min_seconds"] == 0.1 and result["max_seconds"] == 0.3
+    assert result["ops_per_second"] == 500
+
+    assert len(benchmark.measure(lambda: None, 4)) == 4
+
+
+def test_compare_results():
+    baseline = {"benchmarks": [benchmark.make_result("fast", [1.0], 10), benchmark.make_result("slow", [1.0], 10),
+                               benchmark.make_result("changed", [1.0], 10)]}
+    current = {"benchmarks": [benchmark.make_result("fast", [0.5], 10), benchmark.make_result("slow", [1.5], 10),
+                              benchmark.make_result("changed", [1.0], 20), benchmark.make_result("new", [1.0], 10)]}
+
+    comparisons = benchmark.compare_results(baseline, current)
+    assert comparisons == [("fast", 1.0, 0.5, 0.5, False), ("slow", 1.0, 1.5, 1.5, True)]
+
+
+def test_format_word_benchmark():
+    results = benchmark.bench_format_word(["raise", "eager"], 1)
+    assert [result["name"] for result in results] == ["format_word", "format_word_plain"]
+    assert results[0]["operations"] == 2
+
+
+def test_game_construction_benchmark(monkeypatch):
+    import wordlist
+    from gameconfig import GameConfig
+
+    reads = []
+    read_list = wordlist._read_list
+    def counting_read(json_path, length):
+        reads.append(json_path)
+        return read_list(json_path, length)
+    monkeypatch.setattr(wordlist, "_read_list", counting_read)
+
+    # Cold runs read both lists every time, warm runs reuse the lists held by another game
+    results = benchmark.bench_game_construction(GameConfig(word="eager"), 2)
+    assert [result["name"] for result in results] == ["game_construction_cold", "game_construction_warm"]
+    assert len(reads) == 2 * 2 + 2
@@ -40,3 +40,41 @@ def test_is_valid_word():
     # Accented
     assert game.is_valid_word("áéíóú") == False
 
+
+def test_run_writes_history_on_interrupt(tmp_path):
+    import history
+    from datetime import date
+    from letterutils import score_word
+
+    path = str(tmp_path / "history.db")
+    game = Game(GameConfig(history=path, infinite=True))
+    game._history = history.HistoryStore(path)
+    game._history.record("eager", date(2022, 1, 1), [score_word("eager", "eager")], True)
+
+    # Ctrl + C while playing still writes out the queued games
+    def interrupt():
+        raise KeyboardInterrupt()
+    game._run_states = interrupt
+    with pytest.raises(KeyboardInterrupt):
+        game.run()
+
+    with history.HistoryStore(path) as store:
+        assert store.games_for("eager")[0][2] == True
+
+
+def test_dictionary_hint_table(tmp_path):
+    import json
+    from patterntable import table_path_for
+
+    path = str(tmp_path / "words.json")
+    with open(path, "w") as json_file:
+        json.dump({"words": ["eager", "geese", "llama", "house", "mouse", "raise"]}, json_file)
+
+    # A custom dictionary's hints cache their pattern table next to the dictionary, leaving the default table alone
+    game = Game(GameConfig(dictionary=path, random=True, hint=True))
+    game._start()
+    game._draw_hint()
+    assert game._solver.table.answers == ["eager", "geese", "llama", "house", "mouse", "raise"]
+    assert (tmp_path / "words.5.patterns.npz").exists()
+    assert table_path_for(path, 5) == str(tmp_path / "words.5.patterns.npz")
+    game.close()
@@ -49,3 +49,70 @@ def test_GameConfig():
     assert data.random == False
     assert data.infinite == False
 
+    data = GameConfig(simulate = "candidate")
+    assert data.simulate == "candidate"
+    assert data.random == False
+
+    with pytest.raises(ValueError):
+        data = GameConfig(simulate = "candidate", word = "TESTY")
+
+    with pytest.raises(ValueError):
+        data = GameConfig(simulate = "candidate", infinite = True)
+
+    data = GameConfig(hint = True)
+    assert data.hint == True
+    assert GameConfig().hint == False
+
+    data = GameConfig(hard = True)
+    assert data.hard == True
+    assert GameConfig().hard == False
+
+    data = GameConfig(profile = "profile.json")
+    assert data.profile == "profile.json"
+    assert GameConfig().profile == None
+
+    data = GameConfig(history = "history.db")
+    assert data.history == "history.db"
+    assert GameConfig().history == None
+
+    data = GameConfig(length = 6, word = "planet", dictionary = "words.txt")
+    assert data.length == 6
+    assert data.dictionary == "words.txt"
+    assert GameConfig().length == 5
+    with pytest.raises(ValueError):
+        data = GameConfig(length = 9)
+    with pytest.raises(ValueError):
+        data = GameConfig(length = 6, word = "raise")
+    with pytest.raises(ValueError):
+        data = GameConfig(length = 6, hint = True)
+
+    data = GameConfig(batch = "-")
+    assert data.batch == "-"
+    with pytest.raises(ValueError):
+        data = GameConfig(batch = "-", random = True)
+
+    data = GameConfig(absurdle = True)
+    assert data.absurdle == True
+    assert GameConfig().absurdle == False
+    with pytest.raises(ValueError):
+        data = GameConfig(absurdle = True, word = "raise")
+
+    data = GameConfig(schedule = (date(2024, 1, 1), date(2024, 12, 31)), output = "schedule.csv")
+    assert data.schedule == (date(2024, 1, 1), date(2024, 12, 31))
+    assert data.output == "schedule.csv"
+    assert GameConfig().schedule == None
+    with pytest.raises(ValueError):
+        data = GameConfig(schedule = (date(2024, 12, 31), date(2024, 1, 1)))
+    with pytest.raises(ValueError):
+        data = GameConfig(schedule = (date(2024, 1, 1), date(2024, 12, 31)), random = True)
+    with pytest.raises(ValueError):
+        data = GameConfig(output = "schedule.csv")
+
+    data = GameConfig(boards = 4, random = True)
+    assert data.boards == 4
+    assert GameConfig().boards == 1
+    for boards in [0, 17]:
+        with pytest.raises(ValueError):
+            data = GameConfig(boards = boards)
+    with pytest.raises(ValueError):
+        data = GameConfig(boards = 4, hard = True)
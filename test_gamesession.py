@@ -0,0 +1,157 @@
+import pytest
+import tracemalloc
+
+from gamesession import GameSession, GuessRecord, BLANK_GUESS, MAX_GUESSES
+from letterutils import encode_word, encode_score
+from letterutils import LetterState
+from wordindex import WordIndex
+
+def test_game_session():
+    with pytest.raises(ValueError):
+        session = GameSession("HI")
+
+    index = WordIndex(["eager", "raise", "pound", "erase"])
+    session = GameSession("EAGER", index)
+    assert session.answer == "eager"
+    assert session.guess_number == 1
+    assert session.guess_count == 0
+    assert len(session.guesses) == MAX_GUESSES
+    assert session.guesses[0] == ("     ", [LetterState.NONE] * 5)
+    assert not session.won and not session.lost and not session.finished
+    assert session.used_letters() == [LetterState.NONE] * 26
+
+    # Invalid guesses aren't counted
+    with pytest.raises(ValueError):
+        session.submit_guess("pince")
+    with pytest.raises(ValueError):
+        session.submit_guess("X-RAY")
+    assert session.guess_count == 0
+
+    guess = session.submit_guess("RAISE")
+    assert guess == ("raise", [LetterState.WRONG_PLACE, LetterState.CORRECT, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG_PLACE])
+    assert session.guesses[0] == guess
+    assert session.guess_number == 2
+
+    used_letters = session.used_letters()
+    assert used_letters[ord("R") - ord("A")] == LetterState.WRONG_PLACE
+    assert used_letters[ord("I") - ord("A")] == LetterState.WRONG
+    assert used_letters[ord("Z") - ord("A")] == LetterState.NONE
+
+    session.submit_guess("erase")
+    assert session.used_letters()[ord("E") - ord("A")] == LetterState.CORRECT
+
+    session.submit_guess("eager")
+    assert session.won and session.finished and not session.lost
+    with pytest.raises(ValueError):
+        session.submit_guess("raise")
+
+
+def test_game_session_lost():
+    # Without an index any naively valid word can be guessed
+    session = GameSession("eager", max_guesses=2)
+    session.submit_guess("zzzzz")
+    assert not session.finished
+    session.submit_guess("qqqqq")
+    assert session.lost and session.finished and not session.won
+
+
+def test_game_session_hard():
+    index = WordIndex(["eager", "raise", "pound", "erase", "leger"])
+    session = GameSession("eager", index, hard=True)
+    assert session.hard
+
+    session.submit_guess("raise")
+
+    # pound ignores the revealed letters
+    assert not session.respects_hints("pound")
+    with pytest.raises(ValueError):
+        session.submit_guess("pound")
+    assert session.guess_count == 1
+
+    assert session.respects_hints("eager")
+    session.submit_guess("eager")
+    assert session.won
+
+    # Without hard mode anything valid goes
+    session = GameSession("eager", index)
+    session.submit_guess("raise")
+    assert session.respects_hints("pound")
+    session.submit_guess("pound")
+
+
+def test_guess_record():
+    assert BLANK_GUESS == ("     ", [LetterState.NONE] * 5)
+
+    score = [LetterState.CORRECT, LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.WRONG, LetterState.CORRECT]
+    record = GuessRecord(encode_word("raise"), encode_score(score))
+    word, unpacked = record
+    assert word == "raise" and unpacked == score
+    assert record[0] == "raise" and record[1] == score
+    assert record == GuessRecord(encode_word("raise"), encode_score(score))
+    assert record != BLANK_GUESS
+
+
+def test_game_session_submit_code():
+    index = WordIndex(["eager", "raise", "pound"])
+    session = GameSession("eager", index)
+    assert session.answer_code == encode_word("eager")
+
+    with pytest.raises(ValueError):
+        session.submit_code(encode_word("xxxxx"))
+
+    record = session.submit_code(encode_word("raise"))
+    assert record.word == "raise"
+    assert session.guesses[0] is record
+    assert not session.won
+
+    session.submit_code(encode_word("eager"))
+    assert session.won
+
+
+def test_game_session_record_score():
+    session = GameSession("eager")
+    record = session.record_score(encode_word("raise"), 10)
+    assert record.score_code == 10
+    assert session.guess_count == 1
+    session.record_score(encode_word("eager"), 242)
+    assert session.won
+    with pytest.raises(ValueError):
+        session.record_score(encode_word("eager"), 242)
+
+
+def test_game_session_word_length():
+    with pytest.raises(ValueError):
+        session = GameSession("toolongword")
+
+    session = GameSession("planet", WordIndex(["planet", "plants", "raise"]))
+    assert session.length == 6
+    assert session.guesses[0] == ("      ", [LetterState.NONE] * 6)
+    assert not session.is_valid_word("raise")
+
+    session.submit_guess("plants")
+    assert session.guesses[0][1] == [LetterState.CORRECT] * 4 + [LetterState.WRONG_PLACE, LetterState.WRONG]
+    session.submit_guess("planet")
+    assert session.won
+
+    # Without an index any word of the right length is accepted
+    session = GameSession("cake")
+    assert session.is_valid_code(encode_word("bake"))
+    assert not session.is_valid_code(encode_word("bak"))
+    assert not session.is_valid_code(encode_word("baked"))
+
+
+def test_game_session_memory():
+    # Sessions are meant to be cheap enough to hold many thousands at once (e.g. in the server)
+    count = 1000
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sessions = [GameSession("eager") for _ in range(count)]
+        for session in sessions:
+            for guess in ["raise", "pound", "their"]:
+                session.submit_guess(guess)
+        per_session = (tracemalloc.get_traced_memory()[0] - before) / count
+    finally:
+        tracemalloc.stop()
+
+    assert per_session < 1024
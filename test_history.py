@@ -0,0 +1,70 @@
+import history
+
+from datetime import date
+from gamesession import GameSession
+from letterutils import encode_word, score_word
+
+def test_pack_guesses():
+    guesses = [(encode_word("raise"), 5), (encode_word("eager"), 242)]
+    data = history.pack_guesses(guesses)
+    assert len(data) == 2 * history.GUESS_BYTES
+    assert history.unpack_guesses(data) == [("raise", "21000"), ("eager", "22222")]
+
+
+def test_history_store(tmp_path):
+    path = str(tmp_path / "history.db")
+    store = history.HistoryStore(path, batch_size=3)
+
+    store.record("eager", date(2022, 1, 1), [score_word("raise", "eager"), score_word("eager", "eager")], True)
+    store.record("pound", date(2022, 1, 2), [score_word("raise", "pound")] * 6, False)
+    assert store.pending == 2
+
+    # Queued games are included in the overall statistics without being written
+    stats = store.statistics()
+    assert store.pending == 2
+    assert stats.games == 2 and stats.wins == 1 and stats.win_rate == 0.5
+    assert stats.distribution == {2: 1}
+    assert stats.current_streak == 0 and stats.max_streak == 1
+
+    # Filling the batch writes it out
+    session = GameSession("house")
+    session.submit_guess("house")
+    store.record_session(session, date(2022, 1, 3))
+    assert store.pending == 0
+
+    store.record("eager", date(2022, 1, 4), [score_word("eager", "eager")], True)
+    store.close()
+
+    # Reopening the database keeps everything, including the running totals
+    with history.HistoryStore(path) as store:
+        stats = store.statistics()
+        assert stats.games == 4 and stats.wins == 3
+        assert stats.distribution == {1: 2, 2: 1}
+        assert stats.current_streak == 2 and stats.max_streak == 2
+
+        stats = store.statistics(date(2022, 1, 2), date(2022, 1, 3))
+        assert stats.games == 2 and stats.wins == 1
+        assert stats.distribution == {1: 1}
+        assert stats.current_streak == 1 and stats.max_streak == 1
+
+        games = store.games_for("eager")
+        assert games == [(date(2022, 1, 1), [("raise", "12001"), ("eager", "22222")], True), (date(2022, 1, 4), [("eager", "22222")], True)]
+
+
+def test_shared_database(tmp_path):
+    # Two stores writing to one database both keep their games in the running totals
+    path = str(tmp_path / "history.db")
+    first = history.HistoryStore(path)
+    second = history.HistoryStore(path)
+    first.record("eager", date(2022, 1, 1), [score_word("eager", "eager")], True)
+    second.record("pound", date(2022, 1, 1), [score_word("pound", "pound")], True)
+    second.flush()
+    first.flush()
+    first.close()
+    second.close()
+
+    with history.HistoryStore(path) as store:
+        stats = store.statistics()
+        assert stats.games == 2 and stats.wins == 2
+        assert stats.distribution == {1: 2}
+        assert stats.current_streak == 2
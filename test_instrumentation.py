@@ -0,0 +1,59 @@
+import instrumentation
+import json
+import pstats
+
+def test_histogram():
+    histogram = instrumentation.Histogram()
+    assert histogram.percentile(0.5) == 0.0
+
+    for microseconds in [1, 2, 3, 100, 5000]:
+        histogram.record(microseconds / 1000000)
+    summary = histogram.to_dict()
+    assert summary["count"] == 5
+    assert summary["min_seconds"] == 0.000001
+    assert summary["max_seconds"] == 0.005
+    assert summary["p50_seconds"] == 0.000004
+    assert summary["p99_seconds"] == 0.005
+
+
+def test_disabled():
+    instrumentation.reset()
+    assert not instrumentation.is_enabled()
+
+    with instrumentation.timer("test"):
+        pass
+    instrumentation.count("test")
+    assert instrumentation.summary() == {"counters": {}, "histograms": {}}
+
+
+def test_json_summary(tmp_path):
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        with instrumentation.timer("test"):
+            pass
+        instrumentation.count("test")
+        instrumentation.count("test", 2)
+    finally:
+        output_path = str(tmp_path / "profile.json")
+        instrumentation.dump(output_path)
+
+    assert not instrumentation.is_enabled()
+    with open(output_path) as output_file:
+        summary = json.load(output_file)
+    assert summary["counters"] == {"test": 3}
+    assert summary["histograms"]["test"]["count"] == 1
+    instrumentation.reset()
+
+
+def test_profile(tmp_path, monkeypatch):
+    output_path = str(tmp_path / "profile.pstats")
+    monkeypatch.setenv(instrumentation.ENVIRONMENT_VARIABLE, output_path)
+    assert instrumentation.enable_from_environment()
+    try:
+        sorted(range(1000))
+    finally:
+        instrumentation.dump()
+
+    assert pstats.Stats(output_path).total_calls > 0
+    instrumentation.reset()
@@ -0,0 +1,60 @@
+from letterutils import score_word, LetterState
+from lettertracker import LetterTracker
+from batchscore import encode_words
+
+def test_update():
+    tracker = LetterTracker()
+    assert tracker.states() == [LetterState.NONE] * 26
+    assert tracker.known_positions == [None] * 5
+
+    tracker.update(*score_word("erase", "eager"))
+    assert tracker.state("E") == LetterState.CORRECT
+    assert tracker.state("r") == LetterState.WRONG_PLACE
+    assert tracker.state("s") == LetterState.WRONG
+    assert tracker.state("z") == LetterState.NONE
+    assert tracker.known_positions == ["e", None, None, None, None]
+
+    index = lambda letter: ord(letter) - ord("a")
+    assert tracker.min_counts[index("e")] == 2
+    assert tracker.max_counts[index("e")] == 5
+    assert tracker.min_counts[index("s")] == 0
+    assert tracker.max_counts[index("s")] == 0
+    assert tracker.excluded_masks[1] & (1 << index("r"))
+
+    # Correct letters aren't downgraded by later partial matches
+    tracker.update(*score_word("geese", "eager"))
+    assert tracker.state("e") == LetterState.CORRECT
+    assert tracker.max_counts[index("e")] == 2
+    assert tracker.state("g") == LetterState.WRONG_PLACE
+
+
+def test_is_consistent():
+    answers = ["eager", "geese", "agree", "eerie", "leger", "raise"]
+
+    for guess in ["erase", "geese", "eerie", "about", "eager"]:
+        tracker = LetterTracker()
+        tracker.update(*score_word(guess, "eager"))
+        assert tracker.is_consistent("eager")
+
+        # Must agree exactly with the scoring
+        expected = [answer for answer in answers if score_word(guess, answer) == score_word(guess, "eager")]
+        assert tracker.filter(answers) == expected
+
+
+def test_filter_mask():
+    words = ["eager", "geese", "agree", "eerie", "leger", "raise"]
+    letters = encode_words(words)
+
+    tracker = LetterTracker()
+    assert tracker.filter_mask(letters).all()
+    assert tracker.filter([]) == []
+
+    tracker.update(*score_word("pound", "eager"))
+    assert tracker.filter(words) == words
+
+    tracker.update(*score_word("their", "eager"))
+    assert tracker.filter_mask(letters).tolist() == [tracker.is_consistent(word) for word in words]
+    assert tracker.filter(words) == ["eager", "leger"]
+
+    tracker.update(*score_word("raise", "eager"))
+    assert tracker.filter(words) == ["eager"]
@@ -1,6 +1,7 @@
 import pytest
 
-from letterutils import is_word_naively_valid, blank_character, score_word, LetterState
+from letterutils import is_word_naively_valid, blank_character, score_word, encode_score, decode_score, score_to_string, format_word, set_color, LetterState
+from letterutils import encode_word, decode_word, score_code, all_correct, is_supported_length, ALL_CORRECT
 
 def test_is_word_naively_valid():
 
@@ -32,6 +33,13 @@ def test_is_word_naively_valid():
     assert is_word_naively_valid("ABCD@") == False
     assert is_word_naively_valid("áéíóú") == False
 
+    # Test other lengths
+    assert is_word_naively_valid("PLANET", 6) == True
+    assert is_word_naively_valid("RAISE", 6) == False
+    assert is_word_naively_valid("CAKE", 4) == True
+    assert is_supported_length(4) and is_supported_length(8)
+    assert not is_supported_length(3) and not is_supported_length(9)
+
 
 def test_blank_character():
     assert blank_character("ABCDEF", -1) == "ABCDEF"
@@ -63,4 +71,57 @@ def test_score_word():
 
     ## Test an invalid word
     with pytest.raises(ValueError):
-        score_word("&*@$%", answer)
\ No newline at end of file
+        score_word("&*@$%", answer)
+
+def test_encode_score():
+    assert encode_score([LetterState.WRONG] * 5) == 0
+    assert encode_score([LetterState.CORRECT] * 5) == 242
+    assert encode_score([LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG]) == 1
+    assert encode_score([LetterState.WRONG, LetterState.CORRECT, LetterState.WRONG, LetterState.WRONG, LetterState.WRONG]) == 6
+
+    score = [LetterState.CORRECT, LetterState.WRONG_PLACE, LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.WRONG_PLACE]
+    assert decode_score(encode_score(score)) == score
+    assert decode_score(242) == [LetterState.CORRECT] * 5
+
+
+def test_score_code():
+    assert encode_word("a") == 1
+    assert encode_word("ba") == 2 + (1 << 5)
+    assert decode_word(encode_word("eager")) == "eager"
+    assert score_code(encode_word("eager"), encode_word("eager")) == ALL_CORRECT
+    assert all_correct(5) == ALL_CORRECT
+    assert score_code(encode_word("planet"), encode_word("planet")) == all_correct(6)
+    assert score_word("PLANET", "PLANTS")[1] == [LetterState.CORRECT] * 4 + [LetterState.WRONG, LetterState.WRONG_PLACE]
+
+    for word, answer in [("erase", "eager"), ("raise", "eager"), ("geese", "eager"), ("lolly", "hello"), ("xylyl", "eager")]:
+        assert score_code(encode_word(word), encode_word(answer)) == encode_score(score_word(word, answer)[1])
+
+
+def test_score_to_string():
+    assert score_to_string(score_word("ERASE", "EAGER")[1]) == "21101"
+    assert score_to_string(score_word("EAGER", "EAGER")[1]) == "22222"
+    assert score_to_string([]) == ""
+
+
+def test_format_word():
+    score = [LetterState.CORRECT, LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.NONE, LetterState.CORRECT]
+
+    assert format_word("eager", score, color=False) == "*E*(A)-G-[E]*R*"
+    assert format_word("  ", [LetterState.NONE, LetterState.NONE], color=False) == "[ ][ ]"
+
+    text = format_word("eager", score, color=True)
+    assert text.count("]") == 5
+    assert "[E]" in text and "[R]" in text
+    assert text != format_word("eager", [LetterState.NONE] * 5, color=True)
+
+    # Characters outside of A-Z still work
+    assert "[?]" in format_word("?", [LetterState.WRONG], color=True)
+
+    # The default can be switched
+    set_color(False)
+    assert format_word("eager", score) == "*E*(A)-G-[E]*R*"
+    set_color(True)
+    assert format_word("eager", score) == text
+
+    with pytest.raises(ValueError):
+        format_word("eager", score[1:])
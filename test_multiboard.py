@@ -0,0 +1,68 @@
+import pytest
+
+from datetime import date
+from gameconfig import GameConfig
+from letterutils import encode_score, score_word
+from letterutils import LetterState
+from multiboard import MultiBoardSession, pick_answers, EXTRA_GUESSES
+from wordindex import WordIndex
+
+ANSWERS = ["eager", "raise", "pound", "mouse", "house", "erase"]
+WORDS = ANSWERS + ["arise", "salty"]
+
+
+def test_pick_answers():
+    config = GameConfig(forceddate=date(2024, 1, 1))
+    answers = pick_answers(config, ANSWERS, 4)
+    assert len(set(answers)) == 4
+    assert all(answer in ANSWERS for answer in answers)
+
+    # Daily boards are the same for everyone
+    assert pick_answers(config, ANSWERS, 4) == answers
+
+    assert len(pick_answers(GameConfig(random=True), ANSWERS, 6)) == 6
+    with pytest.raises(ValueError):
+        pick_answers(config, ANSWERS, 7)
+
+
+def test_multiboard_session():
+    with pytest.raises(ValueError):
+        session = MultiBoardSession([])
+    with pytest.raises(ValueError):
+        session = MultiBoardSession(["eager", "planet"])
+
+    session = MultiBoardSession(["eager", "raise", "pound"], WordIndex(WORDS))
+    assert session.max_guesses == 3 + EXTRA_GUESSES
+    assert session.answers == ["eager", "raise", "pound"]
+    assert not session.finished
+
+    with pytest.raises(ValueError):
+        session.submit_guess("xxxxx")
+    assert session.guess_count == 0
+
+    # One guess is scored against every board
+    scores = session.submit_guess("ARISE")
+    assert scores == [encode_score(score_word("arise", answer)[1]) for answer in session.answers]
+    assert all(board.guesses[0].word == "arise" for board in session.boards)
+
+    # Solved boards stop taking guesses
+    scores = session.submit_guess("raise")
+    assert scores[1] == 242
+    assert session.solved == 1
+    scores = session.submit_guess("eager")
+    assert scores[0] == 242 and scores[1] == None
+    assert session.boards[1].guess_count == 2
+    assert session.used_letters()[ord("p") - ord("a")] == LetterState.NONE
+
+    session.submit_guess("pound")
+    assert session.won and session.finished and not session.lost
+    with pytest.raises(ValueError):
+        session.submit_guess("salty")
+
+
+def test_multiboard_session_lost():
+    session = MultiBoardSession(["eager", "raise"], max_guesses=2)
+    session.submit_guess("eager")
+    session.submit_guess("salty")
+    assert session.lost and session.finished
+    assert session.boards[0].won and session.boards[1].lost
@@ -0,0 +1,98 @@
+import numpy as np
+import os
+import pytest
+
+from letterutils import score_word, encode_score, LetterState
+from patterntable import PatternTable, table_path_for
+
+GUESSES = ["raise", "eerie", "geese", "pound", "eager", "erase", "llama"]
+ANSWERS = ["eager", "geese", "amass", "llama"]
+
+def test_build():
+    table = PatternTable.build(GUESSES, ANSWERS)
+    assert table.patterns.shape == (len(GUESSES), len(ANSWERS))
+
+    # Every entry should match the reference scoring
+    for guess in GUESSES:
+        for answer in ANSWERS:
+            assert table.lookup(guess, answer) == encode_score(score_word(guess, answer)[1])
+
+    assert table.lookup("eager", "eager") == 242
+    assert table.lookup("pound", "eager") == 0
+
+    # Missing words
+    assert table.lookup("xxxxx", "eager") == None
+    assert table.lookup("raise", "xxxxx") == None
+
+    with pytest.raises(ValueError):
+        PatternTable(GUESSES, ANSWERS[1:], table.patterns)
+
+
+def test_score_word_with_table():
+    table = PatternTable.build(GUESSES, ANSWERS)
+
+    assert score_word("erase", "eager", table) == score_word("erase", "eager")
+    assert score_word("erase", "eager", table)[1] == [LetterState.CORRECT, LetterState.WRONG_PLACE, LetterState.WRONG_PLACE, LetterState.WRONG, LetterState.WRONG_PLACE]
+
+    # Falls back to direct scoring for pairs that aren't in the table
+    assert score_word("arise", "eager", table) == score_word("arise", "eager")
+    with pytest.raises(ValueError):
+        score_word("GARBAGE", "eager", table)
+
+    # Tables of longer words score every letter
+    for words in [["planet", "plants", "staple"], ["stealth", "planets"]]:
+        table = PatternTable.build(words, words)
+        for guess in words:
+            for answer in words:
+                assert table.lookup(guess, answer) != None
+                assert score_word(guess, answer, table) == score_word(guess, answer)
+
+
+def test_save_load(tmp_path):
+    path = tmp_path / "patterns.npz"
+    table = PatternTable.build(GUESSES, ANSWERS)
+    table.save(path)
+
+    loaded = PatternTable.load(path)
+    assert loaded.guesses == GUESSES
+    assert loaded.answers == ANSWERS
+    assert (loaded.patterns == table.patterns).all()
+
+    # Matching word lists load from the cache, different ones get rebuilt
+    assert PatternTable.load_or_build(GUESSES, ANSWERS, path).guesses == GUESSES
+    rebuilt = PatternTable.load_or_build(GUESSES[:2], ANSWERS, path)
+    assert rebuilt.guesses == GUESSES[:2]
+    assert PatternTable.load(path).guesses == GUESSES[:2]
+
+
+def test_opening(tmp_path):
+    path = tmp_path / "patterns.npz"
+    table = PatternTable.build(GUESSES, ANSWERS)
+    assert table.opening == None
+    table.save(path)
+    assert PatternTable.load(path).opening == None
+
+    # A stored opening ranking is saved and loaded with the table
+    table.set_opening(np.array([2, 0, 1]), np.array([1.5, 1.0, 0.5]))
+    table.save(path)
+    rows, scores = PatternTable.load(path).opening
+    assert rows.tolist() == [2, 0, 1]
+    assert scores.tolist() == [1.5, 1.0, 0.5]
+
+    with pytest.raises(ValueError):
+        table.set_opening(np.array([2, 0, 1]), np.array([1.5]))
+
+
+def test_save_replaces_atomically(tmp_path):
+    path = tmp_path / "patterns.npz"
+    PatternTable.build(GUESSES, ANSWERS).save(path)
+    PatternTable.build(GUESSES[:2], ANSWERS).save(path)
+
+    # The old table is replaced in one step, and no temporary files are left behind
+    assert [entry.name for entry in tmp_path.iterdir()] == ["patterns.npz"]
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert PatternTable.load(path).guesses == GUESSES[:2]
+
+
+def test_table_path_for():
+    assert table_path_for("./words/custom.json", 6) == "./words/custom.6.patterns.npz"
@@ -39,6 +39,80 @@ def test_create_game_data_from_args():
     with pytest.raises(ValueError):
         game_data = project.create_game_data_from_args(args)
 
+    # test for hints
+    args = ["project.py", "-hint", "-word", "RAISE"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.hint == True
+    assert game_data.word == "RAISE"
+
+    # test for hard mode
+    args = ["project.py", "-hard"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.hard == True
+
+    # test for adversarial mode
+    args = ["project.py", "-absurdle", "-infinite"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.absurdle == True
+    args = ["project.py", "-absurdle", "-word", "RAISE"]
+    with pytest.raises(ValueError):
+        game_data = project.create_game_data_from_args(args)
+
+    # test for multi-board mode
+    args = ["project.py", "-boards", "8", "-infinite"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.boards == 8
+    for args in [["project.py", "-boards"], ["project.py", "-boards", "four"], ["project.py", "-boards", "32"]]:
+        with pytest.raises(ValueError):
+            game_data = project.create_game_data_from_args(args)
+
+    # test for schedule exports
+    args = ["project.py", "-schedule", "2024-01-01", "2024-12-31", "-output", "schedule.json"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.schedule == (date(2024, 1, 1), date(2024, 12, 31))
+    assert game_data.output == "schedule.json"
+    for args in [["project.py", "-schedule", "2024-01-01"], ["project.py", "-schedule", "2024-01-01", "garbage"]]:
+        with pytest.raises(ValueError):
+            game_data = project.create_game_data_from_args(args)
+
+    # test for batch mode
+    args = ["project.py", "-batch", "-"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.batch == "-"
+    args = ["project.py", "-batch"]
+    with pytest.raises(ValueError):
+        game_data = project.create_game_data_from_args(args)
+    args = ["project.py", "-batch", "guesses.txt", "-word", "RAISE"]
+    with pytest.raises(ValueError):
+        game_data = project.create_game_data_from_args(args)
+
+    # test for word length and dictionary (the word is checked against the length wherever it appears)
+    args = ["project.py", "-word", "PLANET", "-length", "6", "-dict", "./data/answers.json"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.length == 6
+    assert game_data.word == "PLANET"
+    assert game_data.dictionary == "./data/answers.json"
+    for args in [["project.py", "-length", "9"], ["project.py", "-length", "six"], ["project.py", "-length"],
+                 ["project.py", "-length", "6", "-word", "RAISE"], ["project.py", "-dict", "./data/missing.json"]]:
+        with pytest.raises(ValueError):
+            game_data = project.create_game_data_from_args(args)
+
+    # test for history
+    args = ["project.py", "-history", "history.db"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.history == "history.db"
+    args = ["project.py", "-history"]
+    with pytest.raises(ValueError):
+        game_data = project.create_game_data_from_args(args)
+
+    # test for profiling
+    args = ["project.py", "-profile", "profile.json"]
+    game_data = project.create_game_data_from_args(args)
+    assert game_data.profile == "profile.json"
+    args = ["project.py", "-profile"]
+    with pytest.raises(ValueError):
+        game_data = project.create_game_data_from_args(args)
+
     # test for forced word
     args = ["project.py", "-word", "RAISE"]
     game_data = project.create_game_data_from_args(args)
@@ -139,6 +213,30 @@ def test_parse_word():
         project.parse_word(args, 0)
 
 
+def test_parse_strategy():
+    args = ["-simulate", "candidate"]
+    assert project.parse_strategy(args, 1) == "candidate"
+
+    with pytest.raises(IndexError):
+        project.parse_strategy(args, -1)
+
+    # Missing
+    with pytest.raises(ValueError):
+        project.parse_strategy(args, 2)
+
+    # Unknown strategy
+    args = ["garbage"]
+    with pytest.raises(ValueError):
+        project.parse_strategy(args, 0)
+
+    # Via the full set of arguments
+    args = ["project.py", "-simulate", "candidate"]
+    assert project.create_game_data_from_args(args).simulate == "candidate"
+    args = ["project.py", "-simulate", "candidate", "-word", "RAISE"]
+    with pytest.raises(ValueError):
+        project.create_game_data_from_args(args)
+
+
 def test_print_usage(capfd):
 
     TEST_STRING = "TEST ERROR"
@@ -150,6 +248,29 @@ def test_print_usage(capfd):
     assert len(out) > len(TEST_STRING)
 
 
+def test_main_batch_file_errors(monkeypatch, capfd):
+    # Batch files that can't be read are reported and fail, rather than crashing
+    monkeypatch.setattr(project.sys, "argv", ["project.py", "-batch", "./data/missing.txt"])
+    with pytest.raises(SystemExit) as exit_info:
+        project.main()
+    assert exit_info.value.code == 1
+
+    out, err = capfd.readouterr()
+    assert "./data/missing.txt" in out
+
+
+
+def test_main_schedule_output_errors(monkeypatch, capfd):
+    # Output files that can't be written are reported and fail, rather than crashing
+    monkeypatch.setattr(project.sys, "argv", ["project.py", "-schedule", "2024-01-01", "2024-01-07", "-output", "./missing/schedule.csv"])
+    with pytest.raises(SystemExit) as exit_info:
+        project.main()
+    assert exit_info.value.code == 1
+
+    out, err = capfd.readouterr()
+    assert "./missing/schedule.csv" in out
+
+
 def test_all():
     test_game.test_is_valid_word()
     test_gameconfig.test_GameConfig()
@@ -0,0 +1,76 @@
+import pytest
+
+from datetime import date
+from queryservice import LRUCache, QueryService
+from wordindex import WordIndex
+
+ANSWERS = ["eager", "raise", "pound", "mound"]
+WORDS = ANSWERS + ["erase", "round", "salty"]
+
+
+def test_lru_cache():
+    with pytest.raises(ValueError):
+        cache = LRUCache(0)
+
+    cache = LRUCache(2)
+    assert cache.get("a") == None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is now the least recently used so is evicted first
+    cache.put("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") == None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    stats = cache.stats()
+    assert stats["hits"] == 3
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.6
+    assert stats["size"] == 2
+    assert stats["max_size"] == 2
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 0
+
+
+def test_pattern():
+    service = QueryService(ANSWERS, WordIndex(WORDS), cache_size=8)
+    assert service.pattern("raise", "eager") == "12001"
+    assert service.pattern("raise", "eager") == "12001"
+    assert service.pattern("EAGER", "eager") == "22222"
+    for guess, answer in [("xxxxx", "eager"), ("salty", "hi"), ("sal", "eager"), (None, "eager")]:
+        with pytest.raises(ValueError):
+            service.pattern(guess, answer)
+
+    stats = service.stats()["patterns"]
+    assert stats["hits"] == 1
+    assert stats["size"] == 2
+
+    day = date(2024, 1, 1)
+    assert service.answer_for(day) in ANSWERS
+    assert service.daily_pattern("raise", day) == service.pattern("raise", service.answer_for(day))
+
+
+def test_remaining():
+    service = QueryService(ANSWERS, WordIndex(WORDS), cache_size=8)
+    assert service.remaining([]) == 4
+    assert service.candidates([("round", "02222")]) == ("pound", "mound")
+    assert service.remaining([("round", "02222"), ("pound", "02222")]) == 1
+
+    # The second query reused the candidates cached for its first guess
+    stats = service.stats()["candidates"]
+    assert stats["hits"] == 1
+    assert stats["size"] == 2
+
+    assert service.remaining([("raise", "12001")]) == 1
+    assert service.remaining([("raise", "00000")]) == 2
+    for guesses in [[("xxxxx", "00000")], [("raise", "0000")], [("raise", "00300")], [("raise", None)]]:
+        with pytest.raises(ValueError):
+            service.remaining(guesses)
+
+    service.clear_cache()
+    assert service.stats()["candidates"]["size"] == 0
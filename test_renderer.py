@@ -0,0 +1,78 @@
+import io
+
+from renderer import Renderer, CLEAR_SCREEN, CLEAR_BELOW, move_cursor
+
+def test_renderer():
+    output = io.StringIO()
+    renderer = Renderer(output, interactive=True)
+
+    # First frame clears the screen and draws every row
+    renderer.begin_frame()
+    renderer.write("one")
+    renderer.write("two\nthree")
+    renderer.present()
+    text = output.getvalue()
+    assert text.startswith(CLEAR_SCREEN)
+    assert "one" in text and "two" in text and "three" in text
+    assert text.endswith(move_cursor(3) + CLEAR_BELOW)
+
+    # Only changed rows are redrawn
+    output.seek(0)
+    output.truncate()
+    renderer.begin_frame()
+    renderer.write("one")
+    renderer.write("TWO")
+    renderer.write("three")
+    renderer.present()
+    text = output.getvalue()
+    assert CLEAR_SCREEN not in text
+    assert "one" not in text and "three" not in text
+    assert move_cursor(1) + "TWO" in text
+
+    # Shorter frames clear the rows below them
+    output.seek(0)
+    output.truncate()
+    renderer.begin_frame()
+    renderer.write("one")
+    renderer.present()
+    assert output.getvalue() == move_cursor(1) + CLEAR_BELOW
+
+    # Invalidating forces a full redraw
+    output.seek(0)
+    output.truncate()
+    renderer.invalidate()
+    renderer.begin_frame()
+    renderer.write("one")
+    renderer.present()
+    assert output.getvalue().startswith(CLEAR_SCREEN)
+    assert "one" in output.getvalue()
+
+
+def test_renderer_not_interactive():
+    output = io.StringIO()
+    renderer = Renderer(output)
+
+    renderer.begin_frame()
+    renderer.write("one")
+    renderer.write("two")
+    renderer.present()
+    assert output.getvalue() == "one\ntwo\n"
+
+
+def test_write_columns():
+    output = io.StringIO()
+    renderer = Renderer(output, interactive=False)
+    blocks = [["a1", "a2"], ["b1", "b2"], ["c1", "c2"]]
+
+    renderer.begin_frame()
+    renderer.write_columns(blocks, 2, width=80)
+    renderer.present()
+    assert output.getvalue() == "a1  b1  c1\na2  b2  c2\n"
+
+    # Blocks that don't fit across are wrapped onto another band
+    output.seek(0)
+    output.truncate()
+    renderer.begin_frame()
+    renderer.write_columns(blocks, 2, width=6)
+    renderer.present()
+    assert output.getvalue() == "a1  b1\na2  b2\n\nc1\nc2\n"
@@ -0,0 +1,96 @@
+import json
+import pytest
+import random
+import schedule
+
+from datetime import date
+from gameconfig import GameConfig
+from gamesession import pick_answer
+
+ANSWERS = ["raise", "arise", "eager", "pound", "erase", "house", "mouse"]
+
+def legacy_answer(day, answers):
+    # How answers were picked before the schedule existed: seeding the global random module
+    state = random.getstate()
+    random.seed(schedule.days_since_epoch(day))
+    answer = answers[random.randrange(0, len(answers))]
+    random.setstate(state)
+    return answer
+
+
+def test_daily_index():
+    for days in range(0, 1000, 37):
+        assert schedule.daily_index(days, 3000) == random.Random(days).randrange(0, 3000)
+
+    for day in [date(1970, 1, 1), date(2022, 2, 1), date(2099, 12, 31), date(2150, 6, 1), date(1960, 1, 1)]:
+        assert schedule.AnswerSchedule(ANSWERS).answer_for(day) == legacy_answer(day, ANSWERS)
+
+
+def test_write_schedule(tmp_path):
+    schedule.clear_cache()
+    path = str(tmp_path / "schedule.bin")
+    schedule.write_schedule(path, len(ANSWERS), days=100)
+
+    answer_count, table = schedule.read_schedule(path)
+    assert answer_count == len(ANSWERS)
+    assert list(table) == [schedule.daily_index(days, len(ANSWERS)) for days in range(100)]
+
+    # Days inside and outside of the table give the same answers as computing them directly
+    loaded = schedule.load_schedule(ANSWERS, path)
+    assert len(loaded) == 100
+    for day in [date(1970, 1, 1), date(1970, 3, 1), date(2022, 2, 1)]:
+        assert loaded.answer_for(day) == legacy_answer(day, ANSWERS)
+
+    # A table built for a different number of answers is ignored
+    assert len(schedule.load_schedule(ANSWERS[:3], path)) == 0
+
+    with open(path, "wb") as schedule_file:
+        schedule_file.write(b"garbage")
+    with pytest.raises(ValueError):
+        schedule.read_schedule(path)
+    schedule.clear_cache()
+
+
+def test_pick_answer():
+    day = date(2022, 2, 1)
+    assert pick_answer(GameConfig(forceddate=day), ANSWERS) == legacy_answer(day, ANSWERS)
+    assert pick_answer(GameConfig(word="EAGER"), ANSWERS) == "eager"
+
+    # Picking answers leaves the global random state alone
+    random.seed(1234)
+    expected = random.random()
+    random.seed(1234)
+    pick_answer(GameConfig(forceddate=day), ANSWERS)
+    pick_answer(GameConfig(random=True), ANSWERS)
+    assert random.random() == expected
+
+    assert pick_answer(GameConfig(random=True), ANSWERS, random.Random(5)) == ANSWERS[random.Random(5).randrange(0, len(ANSWERS))]
+
+
+def test_export_schedule(tmp_path, capsys):
+    start = date(2024, 1, 30)
+    end = date(2024, 2, 2)
+    entries = list(schedule.answers_between(ANSWERS, start, end))
+    assert [day for day, answer in entries] == [date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1), date(2024, 2, 2)]
+    assert all(answer == legacy_answer(day, ANSWERS) for day, answer in entries)
+    with pytest.raises(ValueError):
+        list(schedule.answers_between(ANSWERS, end, start))
+
+    assert schedule.export_schedule(ANSWERS, start, end) == 4
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "date,answer"
+    assert lines[1:] == [f"{day.isoformat()},{answer}" for day, answer in entries]
+
+    json_path = str(tmp_path / "schedule.json")
+    assert schedule.export_schedule(ANSWERS, start, end, json_path) == 4
+    with open(json_path) as json_file:
+        assert json.load(json_file) == {day.isoformat(): answer for day, answer in entries}
+
+    # Binary exports cover every day up to the end, for load_schedule to serve from
+    binary_path = str(tmp_path / "schedule.bin")
+    assert schedule.export_schedule(ANSWERS, start, end, binary_path) == schedule.days_since_epoch(end) + 1
+    loaded = schedule.load_schedule(ANSWERS, binary_path)
+    assert len(loaded) == schedule.days_since_epoch(end) + 1
+    assert all(loaded.answer_for(day) == answer for day, answer in entries)
+    with pytest.raises(ValueError):
+        schedule.export_schedule(ANSWERS, date(1969, 12, 1), end, binary_path)
@@ -0,0 +1,84 @@
+import asyncio
+
+from server import WordPyServer
+from wordindex import WordIndex
+
+ANSWERS = ["eager", "raise"]
+WORDS = ["eager", "raise", "erase", "pound"]
+
+def test_handle_command():
+    server = WordPyServer(ANSWERS, WordIndex(WORDS))
+
+    session, reply, keep_open = server.handle_command(None, "GUESS raise")
+    assert reply == "ERR No game in progress"
+
+    session, reply, keep_open = server.handle_command(None, "NEW -word eager")
+    assert reply == "OK NEW 6"
+    assert session.answer == "eager"
+
+    session, reply, keep_open = server.handle_command(session, "guess RAISE")
+    assert reply == "OK raise 12001 PLAYING"
+    session, reply, keep_open = server.handle_command(session, "GUESS xxxxx")
+    assert reply.startswith("ERR")
+    session, reply, keep_open = server.handle_command(session, "GUESS eager")
+    assert reply == "OK eager 22222 WON"
+
+    # Date based games pick from the answer list
+    session, reply, keep_open = server.handle_command(session, "NEW -date 2024-01-01")
+    assert session.answer in ANSWERS
+
+    for arguments in ["-word", "-date garbage", "-infinite", "-word eager -random", "cat", "-length 6 -word planet", "-boards 4",
+                      "-absurdle", "-history h.db", "-schedule 2024-01-01 2024-01-02", "-simulate candidate", "-profile p.json",
+                      "-dict server.py", "-word -dict"]:
+        new_session, reply, keep_open = server.handle_command(session, "NEW " + arguments)
+        assert reply.startswith("ERR")
+        assert new_session is session
+
+    session, reply, keep_open = server.handle_command(session, "")
+    assert reply.startswith("ERR") and keep_open
+    session, reply, keep_open = server.handle_command(session, "DANCE")
+    assert reply.startswith("ERR") and keep_open
+    session, reply, keep_open = server.handle_command(session, "QUIT")
+    assert reply == "OK BYE" and not keep_open
+
+
+def test_lost_game():
+    server = WordPyServer(ANSWERS, WordIndex(WORDS))
+    session, reply, keep_open = server.handle_command(None, "NEW -word eager")
+    for i in range(5):
+        session, reply, keep_open = server.handle_command(session, "GUESS pound")
+        assert reply.endswith("PLAYING")
+    session, reply, keep_open = server.handle_command(session, "GUESS pound")
+    assert reply == "OK pound 00000 LOST eager"
+
+
+async def play_client(port, word):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    replies = []
+    for command in [f"NEW -word {word}", "GUESS erase", f"GUESS {word}", "QUIT"]:
+        writer.write(command.encode("ascii") + b"\n")
+        await writer.drain()
+        replies.append((await reader.readline()).decode("ascii").strip())
+    # Server closes the connection after QUIT
+    assert await reader.readline() == b""
+    writer.close()
+    return replies
+
+
+async def run_clients(num_clients):
+    server = WordPyServer(ANSWERS, WordIndex(WORDS))
+    await server.start(port=0)
+    try:
+        return await asyncio.gather(*[play_client(server.port, ANSWERS[i % 2]) for i in range(num_clients)])
+    finally:
+        await server.close()
+
+
+def test_server():
+    results = asyncio.run(run_clients(200))
+    assert len(results) == 200
+    for i, replies in enumerate(results):
+        assert replies[0] == "OK NEW 6"
+        assert replies[1].startswith("OK erase ") and replies[1].endswith("PLAYING")
+        assert replies[2] == f"OK {ANSWERS[i % 2]} 22222 WON"
+        assert replies[3] == "OK BYE"
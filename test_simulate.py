@@ -0,0 +1,63 @@
+import multiprocessing
+import os
+import pytest
+import simulate
+
+from gamesession import GameSession
+
+ANSWERS = ["eager", "raise", "geese", "pound", "erase"]
+
+def test_candidate_strategy():
+    strategy = simulate.CandidateStrategy(ANSWERS, ANSWERS, opening="raise")
+
+    session = GameSession("geese")
+    assert strategy.next_guess(session) == "raise"
+    assert strategy.candidates(session) == ANSWERS
+
+    session.submit_guess("raise")
+    assert "geese" in strategy.candidates(session)
+    assert "raise" not in strategy.candidates(session)
+
+    assert simulate.play_game(strategy, "geese") > 0
+    assert simulate.play_game(strategy, "raise") == 1
+
+
+def test_simulation_result():
+    result = simulate.SimulationResult("test", [1, 2, 2, 0], 6, 2.0)
+    assert result.games == 4
+    assert result.wins == 3
+    assert result.win_rate == 0.75
+    assert result.distribution == [1, 1, 2, 0, 0, 0, 0]
+    assert result.average_guesses == 5 / 3
+    assert result.games_per_second == 2.0
+    assert "Win rate:         75.00%" in result.format_report()
+
+
+def test_run_simulation():
+    with pytest.raises(ValueError):
+        simulate.run_simulation("garbage")
+
+    answers = ["eager", "raise", "house", "about", "their"]
+    result = simulate.run_simulation("candidate", answers, workers=2, chunk_size=2)
+    assert result.games == len(answers)
+    assert sum(result.distribution) == len(answers)
+    assert result.distribution[1] == 1
+
+
+def test_strategy_built_before_fork(monkeypatch, tmp_path):
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("fork start method not available")
+
+    # Record the process building each strategy, workers included
+    log_path = tmp_path / "pids"
+    create_strategy = simulate.create_strategy
+    def logging_create_strategy(name):
+        with open(log_path, "a") as log_file:
+            log_file.write(f"{os.getpid()}\n")
+        return create_strategy(name)
+    monkeypatch.setattr(simulate, "create_strategy", logging_create_strategy)
+
+    answers = ["eager", "raise", "house", "about", "their"]
+    result = simulate.run_simulation("candidate", answers, workers=2, chunk_size=1)
+    assert result.games == len(answers)
+    assert log_path.read_text().split() == [str(os.getpid())]
@@ -0,0 +1,141 @@
+import pytest
+import simulate
+import solver as solver_module
+
+from gamesession import GameSession
+from letterutils import score_word
+from patterntable import PatternTable
+from solver import Solver
+
+ANSWERS = ["eager", "geese", "llama", "house", "mouse", "louse", "rouse"]
+WORDS = ANSWERS + ["raise", "pound", "helms", "zzzzz"]
+
+def create_solver():
+    return Solver(ANSWERS, WORDS, table_path=None)
+
+
+def test_candidates():
+    solver = create_solver()
+    session = GameSession("mouse")
+    assert solver.candidate_words(session.guesses) == ANSWERS
+
+    session.submit_guess("pound")
+    assert solver.candidate_words(session.guesses) == ["house", "mouse", "louse", "rouse"]
+
+    # Guesses must be in the table
+    with pytest.raises(ValueError):
+        solver.candidates([score_word("abcde", "mouse")])
+
+
+def test_best_guess():
+    solver = create_solver()
+    session = GameSession("mouse")
+    session.submit_guess("pound")
+
+    # Only the first letter differs so the best guess should split h/m/l/r
+    ranking = solver.rank_guesses(session.guesses, count=3)
+    assert ranking[0][0] == "helms"
+    assert ranking[0][1] >= ranking[1][1] >= ranking[2][1]
+    assert solver.best_guess(session.guesses) == "helms"
+
+    # Cached rankings are reused
+    assert solver.rank_guesses(session.guesses, count=3) == ranking
+
+    session.submit_guess("helms")
+    assert solver.best_guess(session.guesses) == "mouse"
+
+    # No consistent answers
+    assert solver.best_guess([score_word("eager", "eager"), score_word("geese", "llama")]) == None
+    assert solver.rank_guesses([score_word("eager", "eager"), score_word("geese", "llama")]) == []
+
+
+def test_letter_tracker_filtering():
+    solver = create_solver()
+    session = GameSession("mouse", hard=True)
+    session.submit_guess("pound")
+
+    # Candidates can come from the session's LetterTracker as well as the pattern table
+    assert list(solver.candidates(session.guesses, session.letters)) == list(solver.candidates(session.guesses))
+
+    # In hard mode only guesses that use the revealed hints are suggested, so "helms" is no longer allowed
+    assert solver.best_guess(session.guesses) == "helms"
+    suggestion = solver.best_guess(session.guesses, session.letters, hard=True)
+    assert session.respects_hints(suggestion)
+    assert all(session.respects_hints(word) for word, score in solver.rank_guesses(session.guesses, 10, session.letters, hard=True))
+    assert solver.next_guess(session) == suggestion
+    with pytest.raises(ValueError):
+        solver.best_guess(session.guesses, hard=True)
+
+
+def test_opening_ranking(tmp_path, monkeypatch):
+    # The opening ranking is worked out when the solver is created and saved with the pattern table
+    path = str(tmp_path / "patterns.npz")
+    saves = []
+    save = PatternTable.save
+    def counting_save(self, save_path):
+        saves.append(save_path)
+        save(self, save_path)
+    monkeypatch.setattr(PatternTable, "save", counting_save)
+
+    # A new table is saved once, with the opening ranking
+    solver = Solver(ANSWERS, WORDS, table_path=path)
+    opening = solver.rank_guesses([], count=len(WORDS))
+    assert saves == [path]
+    assert PatternTable.load(path).opening != None
+
+    # So later solvers (and the first hint, in either mode) never have to rank every guess again
+    ranked = []
+    rank = Solver._rank
+    def counting_rank(self, columns, rows):
+        ranked.append(len(columns))
+        return rank(self, columns, rows)
+    monkeypatch.setattr(Solver, "_rank", counting_rank)
+
+    solver = Solver(ANSWERS, WORDS, table_path=path)
+    session = GameSession("mouse")
+    assert solver.rank_guesses(session.guesses, count=len(WORDS)) == opening
+    assert solver.best_guess(session.guesses, session.letters, hard=True) == opening[0][0]
+    assert ranked == []
+    assert saves == [path]
+
+
+def test_rank_chunks(monkeypatch):
+    # Ranking the guesses a few at a time gives the same ranking as all at once
+    session = GameSession("mouse")
+    session.submit_guess("pound")
+    expected_opening = create_solver().rank_guesses([], count=len(WORDS))
+    expected = create_solver().rank_guesses(session.guesses, count=len(WORDS))
+
+    monkeypatch.setattr(solver_module, "RANK_CHUNK_ROWS", 3)
+    solver = create_solver()
+    assert solver.rank_guesses([], count=len(WORDS)) == expected_opening
+    assert solver.rank_guesses(session.guesses, count=len(WORDS)) == expected
+
+
+def test_hard_mode_budget(monkeypatch):
+    # A weak hard mode opener leaves most guesses allowed and most answers possible,
+    # so only the allowed guesses from the shortlist are ranked rather than every allowed guess
+    monkeypatch.setattr(solver_module, "MAX_FULL_RANK_CELLS", 20)
+    monkeypatch.setattr(solver_module, "SHORTLIST_SIZE", 3)
+    solver = create_solver()
+
+    ranked = []
+    rank = Solver._rank
+    def counting_rank(self, columns, rows):
+        ranked.append(rows)
+        return rank(self, columns, rows)
+    monkeypatch.setattr(Solver, "_rank", counting_rank)
+
+    session = GameSession("mouse", hard=True)
+    session.submit_guess("zzzzz")
+    suggestion = solver.next_guess(session)
+    assert session.respects_hints(suggestion)
+    assert len(ranked) == 1
+    assert 0 < len(ranked[0]) <= 3
+    assert all(session.respects_hints(WORDS[row]) for row in ranked[0])
+
+
+def test_solver_strategy():
+    solver = Solver(ANSWERS, WORDS, table=PatternTable.build(WORDS, ANSWERS))
+    for answer in ANSWERS:
+        assert simulate.play_game(solver, answer) > 0
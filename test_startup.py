@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+PACKAGE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that are slow to import (or pull in slow imports) and aren't needed to parse the command-line
+HEAVY_MODULES = ["numpy", "colorama", "json", "random", "re", "game", "gamesession", "wordlist", "wordindex"]
+
+def imported_modules(*args):
+    '''
+    Runs wordpy.py in a new interpreter and gets the names of every module it imported
+    '''
+    result = subprocess.run([sys.executable, "-X", "importtime", "wordpy.py", *args], capture_output=True, text=True,
+                            cwd=PACKAGE_PATH, stdin=subprocess.DEVNULL, timeout=30)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            modules.add(line.split("|")[-1].strip())
+    return result.stdout, modules
+
+
+def test_usage_imports_nothing_heavy():
+    output, modules = imported_modules("-?")
+    assert "usage" in output
+    for module in HEAVY_MODULES:
+        assert module not in modules, f"{module} imported just to print the usage"
+
+
+def test_bad_arguments_import_nothing_heavy():
+    output, modules = imported_modules("-word", "toolong")
+    assert "Invalid word argument" in output
+    for module in HEAVY_MODULES:
+        assert module not in modules, f"{module} imported just to reject the arguments"
+
+
+def test_game_construction_is_lazy():
+    # Creating a game doesn't load the word lists or initialise colorama until they're needed
+    script = ("import sys, wordlist\n" +
+              "from game import Game\n" +
+              "from gameconfig import GameConfig\n" +
+              "game = Game(GameConfig(word='eager'))\n" +
+              "assert len(wordlist.loaded_keys()) == 0\n" +
+              "assert 'numpy' not in sys.modules\n" +
+              "assert game.is_valid_word('raise')\n" +
+              "assert len(wordlist.loaded_keys()) == 2\n")
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=PACKAGE_PATH, timeout=30)
+    assert result.returncode == 0, result.stderr
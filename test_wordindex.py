@@ -0,0 +1,41 @@
+import pytest
+
+from letterutils import encode_word, decode_word
+from wordindex import WordIndex
+
+def test_encode_word():
+    assert encode_word("a") == 1
+    assert encode_word("z") == 26
+    assert encode_word("ab") == 1 | (2 << 5)
+    assert encode_word("RAISE") == encode_word("raise")
+    assert encode_word("zzzzz") < (1 << 25)
+
+    assert decode_word(encode_word("raise")) == "raise"
+    assert decode_word(encode_word("ZZZZZ")) == "zzzzz"
+
+    with pytest.raises(ValueError):
+        encode_word("X-RAY")
+    with pytest.raises(ValueError):
+        encode_word("áéíóú")
+
+
+def test_word_index():
+    with pytest.raises(ValueError):
+        index = WordIndex(None)
+
+    index = WordIndex(["raise", "ARISE", "deism"])
+    assert len(index) == 3
+
+    assert "raise" in index
+    assert "RaIsE" in index
+    assert "arise" in index
+    assert "pince" not in index
+    assert "rais" not in index
+    assert None not in index
+    assert "$%@.," not in index
+
+    assert index.contains_code(encode_word("deism")) == True
+    assert index.contains_code(encode_word("pince")) == False
+
+    assert index.validate_many(["RAISE", "pince", "X-RAY", "deism", None]) == [True, False, False, True, False]
+    assert index.validate_many([]) == []
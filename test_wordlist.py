@@ -0,0 +1,189 @@
+import json
+import os
+import pytest
+import threading
+import wordlist
+
+def write_json(path, words):
+    with open(path, "w") as json_file:
+        json.dump({"words": words}, json_file)
+
+
+def set_newer(path, than_path):
+    # Push a file's time past another's, as copying or checking out the files can
+    than_time = os.stat(than_path).st_mtime_ns
+    os.utime(path, ns=(than_time + 10**9, than_time + 10**9))
+
+
+def test_build_binary(tmp_path):
+    json_path = str(tmp_path / "words.json")
+    write_json(json_path, ["raise", "ARISE", "eager"])
+
+    binary_path = wordlist.build_binary(json_path)
+    assert binary_path == str(tmp_path / "words.bin")
+
+    with open(binary_path, "rb") as binary_file:
+        data = binary_file.read()
+    assert data[:4] == wordlist.MAGIC
+    assert data[4] == 5
+    assert len(data) == wordlist.HEADER_SIZE + 3 * 5
+
+    write_json(json_path, ["raise", "hi"])
+    with pytest.raises(ValueError):
+        wordlist.build_binary(json_path)
+
+
+def test_load_word_list(tmp_path, monkeypatch):
+    wordlist.clear_cache()
+    json_path = str(tmp_path / "words.json")
+    write_json(json_path, ["raise", "arise", "eager"])
+
+    # No binary yet so we read the json
+    words = wordlist.load_word_list(json_path)
+    assert words == ("raise", "arise", "eager")
+
+    # Loaded lists are cached and shared
+    assert wordlist.load_word_list(json_path) is words
+    index = wordlist.load_word_index(json_path)
+    assert "EAGER" in index
+    assert wordlist.load_word_index(json_path) is index
+
+    # Once built, the binary version is preferred, even when the list looks newer
+    binary_path = wordlist.build_binary(json_path)
+    set_newer(json_path, binary_path)
+    wordlist.clear_cache()
+    with monkeypatch.context() as patch:
+        patch.setattr(wordlist, "_read_words", None)
+        assert wordlist.load_word_list(json_path) == ("raise", "arise", "eager")
+
+    # Unless the list has changed since it was built, when the list is read and the binary rebuilt
+    write_json(json_path, ["other"])
+    wordlist.clear_cache()
+    assert wordlist.load_word_list(json_path) == ("other",)
+    assert wordlist._read_binary(binary_path) == ("other",)
+
+    # Corrupt binary files are rebuilt, or rejected if there's no list to rebuild them from
+    with open(binary_path, "wb") as binary_file:
+        binary_file.write(b"garbage!garbage!garbage")
+    wordlist.clear_cache()
+    assert wordlist.load_word_list(json_path) == ("other",)
+    with open(binary_path, "wb") as binary_file:
+        binary_file.write(b"garbage!garbage!garbage")
+    os.remove(json_path)
+    wordlist.clear_cache()
+    with pytest.raises(ValueError):
+        wordlist.load_word_list(json_path)
+
+    # Rebuilt binaries are readable by everyone, like any other data file
+    assert os.stat(binary_path).st_mode & 0o777 == 0o644
+    assert os.listdir(tmp_path) == ["words.bin"]
+
+
+def test_word_lengths(tmp_path):
+    wordlist.clear_cache()
+    text_path = str(tmp_path / "words.txt")
+    with open(text_path, "w") as text_file:
+        text_file.write("raise\nHOUSES\n\ncat\ndon't\nplanet\neager\n")
+
+    # Plain-text lists can be loaded whole or by length
+    assert wordlist.load_word_list(text_path) == ("raise", "HOUSES", "cat", "don't", "planet", "eager")
+    assert wordlist.load_word_list(text_path, 6) == ("houses", "planet")
+    assert "planet" in wordlist.load_word_index(text_path, 6)
+    assert "raise" not in wordlist.load_word_index(text_path, 6)
+
+    # Mixed length lists are split into one binary per supported length
+    paths = wordlist.build_partitions(text_path)
+    assert paths == [wordlist.binary_path_for(text_path, 5), wordlist.binary_path_for(text_path, 6)]
+    wordlist.clear_cache()
+    assert wordlist.load_word_list(text_path, 5) == ("raise", "eager")
+    assert wordlist.load_word_list(text_path, 7) == ()
+
+    # Out of date partitions are rebuilt from the list
+    with open(text_path, "w") as text_file:
+        text_file.write("other\n")
+    wordlist.clear_cache()
+    assert wordlist.load_word_list(text_path, 5) == ("other",)
+    assert wordlist.load_word_list(text_path, 6) == ()
+
+    # A single width binary only has words of its own length
+    json_path = str(tmp_path / "answers.json")
+    write_json(json_path, ["raise", "eager"])
+    wordlist.build_binary(json_path)
+    assert wordlist.load_word_list(json_path, 5) == ("raise", "eager")
+    assert wordlist.load_word_list(json_path, 6) == ()
+    wordlist.clear_cache()
+
+
+def test_game_word_lists():
+    wordlist.clear_cache()
+    answers = wordlist.load_word_list("./data/answers.json")
+    words = wordlist.load_word_list("./data/valid_words.json")
+
+    with open("./data/answers.json") as answers_file:
+        assert list(answers) == json.load(answers_file)["words"]
+    with open("./data/valid_words.json") as words_file:
+        assert list(words) == json.load(words_file)["words"]
+
+
+def test_shared_registry(tmp_path):
+    wordlist.clear_cache()
+    json_path = str(tmp_path / "words.json")
+    write_json(json_path, ["raise", "arise", "eager"])
+
+    first = wordlist.acquire(json_path, 5)
+    second = wordlist.acquire(json_path, 5)
+    assert first is second
+    assert first.refs == 2
+    assert wordlist.loaded_keys() == []
+    assert first.words == ("raise", "arise", "eager")
+    assert "eager" in first.index
+    assert wordlist.loaded_keys() == [(json_path, 5)]
+
+    # Lists are evicted once nothing is using them
+    wordlist.release(first)
+    assert wordlist.loaded_keys() == [(json_path, 5)]
+    wordlist.release(second)
+    assert wordlist.loaded_keys() == []
+    with pytest.raises(ValueError):
+        wordlist.release(second)
+
+    # ...unless they were loaded for the life of the process
+    words = wordlist.load_word_list(json_path, 5)
+    entry = wordlist.acquire(json_path, 5)
+    assert entry.words is words
+    wordlist.release(entry)
+    assert wordlist.loaded_keys() == [(json_path, 5)]
+
+
+def test_shared_registry_threads(tmp_path, monkeypatch):
+    wordlist.clear_cache()
+    json_path = str(tmp_path / "words.json")
+    write_json(json_path, ["raise", "arise", "eager"])
+
+    reads = []
+    read_words = wordlist._read_words
+    def counting_read(path):
+        reads.append(path)
+        return read_words(path)
+    monkeypatch.setattr(wordlist, "_read_words", counting_read)
+
+    entries = []
+    def worker():
+        entry = wordlist.acquire(json_path)
+        assert entry.index.contains("raise")
+        entries.append(entry)
+
+    threads = [threading.Thread(target=worker) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Every thread shares the one list, which is only read once
+    assert len(entries) == 16
+    assert all(entry is entries[0] for entry in entries)
+    assert reads == [json_path]
+    assert entries[0].refs == 16
+    for entry in entries:
+        wordlist.release(entry)
+    assert wordlist.loaded_keys() == []
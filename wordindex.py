@@ -0,0 +1,63 @@
+from letterutils import encode_word
+
+
+class WordIndex:
+    '''
+    Immutable index over a dictionary of words that supports constant time lookups.
+    Words are stored both as a frozenset of lower case strings and as a frozenset of their packed
+    integer encodings (see encode_word) so callers that already hold packed words don't need to convert back.
+    Indexes are normally built over words of a single length (see wordlist.load_word_index).
+    Usage:
+        index = WordIndex(["raise", "arise"])
+        "RAISE" in index                      # True
+        index.validate_many(["raise", "xxxxx"]) # [True, False]
+    '''
+
+    def __init__(self, words):
+        if words == None:
+            raise ValueError("Words missing")
+
+        self._words = frozenset(word.lower() for word in words)
+        self._codes = frozenset(encode_word(word) for word in self._words)
+
+
+    def __len__(self):
+        return len(self._words)
+
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+
+    def contains(self, word):
+        '''
+        Is the specified word in the index?
+        Arguments:
+            word: The word to look up (any case)
+        Returns: True if the word is in the index, False if it is not
+        '''
+        if word == None:
+            return False
+
+        return word.lower() in self._words
+
+
+    def contains_code(self, code):
+        '''
+        Is the specified packed word (see encode_word) in the index?
+        Arguments:
+            code: The packed word to look up
+        Returns: True if the word is in the index, False if it is not
+        '''
+        return code in self._codes
+
+
+    def validate_many(self, words):
+        '''
+        Checks a batch of words against the index
+        Arguments:
+            words: an iterable of words to validate
+        Returns: a list of booleans, one per input word, True where the word is valid
+        '''
+        lookup = self._words
+        return [word != None and word.lower() in lookup for word in words]
@@ -0,0 +1,421 @@
+import hashlib
+import instrumentation
+import json
+import letterutils
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+
+from wordindex import WordIndex
+
+# Binary word list layout:
+#   16 byte header: the magic bytes, one byte holding the record width, 3 reserved bytes and a digest of the
+#   source list the binary was built from (see _source_digest),
+#   followed by one fixed-width record per word (lower case ASCII, no separators)
+MAGIC = b"WPW2"
+HEADER_FORMAT = "<4sB3x8s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+DIGEST_SIZE = 8
+BINARY_EXTENSION = ".bin"
+
+# Process-wide registry of loaded word lists (see SharedWordList), keyed by (the path they were loaded from, word length).
+# A length of None means every word in the list. _registry_lock guards the dictionary itself; each entry has its own
+# lock for loading so one slow load doesn't hold up threads that want other lists.
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def binary_path_for(json_path, length=None):
+    '''
+    Gets the path of the compiled binary file that corresponds to a word list
+    Arguments:
+        json_path: the path to the (json or plain-text) word list
+        [optional] length: the word length, for lists that have been partitioned by length (see build_partitions)
+    Returns: the binary file path
+    '''
+    if length == None:
+        return os.path.splitext(json_path)[0] + BINARY_EXTENSION
+    return os.path.splitext(json_path)[0] + f".{length}" + BINARY_EXTENSION
+
+
+def build_binary(json_path, binary_path=None):
+    '''
+    Converts a json word list (in the form {"words": [...]}) into the compiled binary format
+    Arguments:
+        json_path: the json file to read
+        [optional] binary_path: the file to write. Defaults to the json path with a .bin extension
+    Returns: the path of the written file
+    Raises: ValueError if the words are not all the same length or contain non-ASCII characters
+    '''
+    if binary_path == None:
+        binary_path = binary_path_for(json_path)
+
+    digest = _source_digest(json_path)
+    words = _read_words(json_path)
+
+    width = len(words[0]) if len(words) > 0 else 0
+    if any(len(word) != width for word in words):
+        raise ValueError(f"Words in {json_path} must all be the same length")
+
+    _write_binary(binary_path, words, width, digest)
+    return binary_path
+
+
+def build_partitions(json_path):
+    '''
+    Splits a word list into one compiled binary file per supported word length (see binary_path_for),
+    so that a game only ever reads the words of the length it's using.
+    Words that aren't plain a-z are dropped, and partitions for lengths the list no longer has are removed.
+    Arguments:
+        json_path: the (json or plain-text) word list to read
+    Returns: list of the paths of the written files
+    '''
+    digest = _source_digest(json_path)
+    partitions = {}
+    for word in _read_words(json_path):
+        if letterutils.is_supported_length(len(word)) and letterutils.is_word_naively_valid(word, len(word)):
+            partitions.setdefault(len(word), []).append(word)
+
+    paths = []
+    for length in range(letterutils.MIN_WORD_LENGTH, letterutils.MAX_WORD_LENGTH + 1):
+        path = binary_path_for(json_path, length)
+        if length in partitions:
+            _write_binary(path, partitions[length], length, digest)
+            paths.append(path)
+        elif os.path.exists(path):
+            # Left over from an earlier version of the list that had words of this length
+            os.remove(path)
+    return paths
+
+
+def _write_binary(binary_path, words, width, digest):
+    '''
+    Writes a compiled binary word list. The file is written under a temporary name and then moved into place,
+    so a process loading the list at the same time sees either the old file or the new one, never part of one
+    '''
+    data = "".join(words).lower().encode("ascii")
+    handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=os.path.dirname(binary_path) or ".")
+    try:
+        with os.fdopen(handle, "wb") as binary_file:
+            binary_file.write(struct.pack(HEADER_FORMAT, MAGIC, width, digest))
+            binary_file.write(data)
+        # mkstemp only lets the owner read the file
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, binary_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _read_header(binary_path):
+    '''
+    Reads the header of a compiled binary word list
+    Returns: tuple of (record width, digest of the source list)
+    Raises: ValueError if the file isn't a binary word list
+    '''
+    with open(binary_path, "rb") as binary_file:
+        header = binary_file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{binary_path} is not a binary word list")
+    magic, width, digest = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError(f"{binary_path} is not a binary word list")
+    return (width, digest)
+
+
+def _binary_width(binary_path):
+    '''
+    Reads the record width from the header of a compiled binary word list
+    '''
+    return _read_header(binary_path)[0]
+
+
+def _read_binary(binary_path):
+    '''
+    Reads a compiled binary word list via mmap
+    Arguments:
+        binary_path: the file to read
+    Returns: a tuple of words
+    Raises: ValueError if the file isn't a valid binary word list
+    '''
+    with open(binary_path, "rb") as binary_file:
+        if os.fstat(binary_file.fileno()).st_size <= HEADER_SIZE:
+            return ()
+
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{binary_path} is not a binary word list")
+            width = data[len(MAGIC)]
+            text = data[HEADER_SIZE:].decode("ascii")
+
+    if width == 0 or len(text) % width != 0:
+        raise ValueError(f"{binary_path} is corrupt")
+
+    return tuple(text[i:i + width] for i in range(0, len(text), width))
+
+
+def _read_words(path):
+    '''
+    Reads a word list: either json (in the form {"words": [...]}) or, for any other extension, plain-text with one word per line
+    Arguments:
+        path: the file to read
+    Returns: a tuple of words
+    '''
+    with open(path) as word_file:
+        if path.endswith(".json"):
+            return tuple(json.load(word_file)["words"])
+        return tuple(word for word in (line.strip() for line in word_file) if len(word) > 0)
+
+
+def _source_digest(path):
+    '''
+    Gets a digest of a source word list's contents, which its compiled binaries record so they can tell when it has changed.
+    File times can't be used for this as checking out or copying the files doesn't keep them in order
+    Returns: the digest bytes, or None if the list can't be read
+    '''
+    try:
+        with open(path, "rb") as source_file:
+            return hashlib.blake2b(source_file.read(), digest_size=DIGEST_SIZE).digest()
+    except OSError:
+        return None
+
+
+def _is_fresh(binary_path, digest):
+    '''
+    Can a compiled binary be used in place of its source list? It must exist and have been built from the source
+    as it is now (digest, see _source_digest), otherwise it may be missing words that have been added to the source
+    (or still hold ones that were removed). With no source (a digest of None) the binary is all there is
+    '''
+    if digest == None:
+        return os.path.exists(binary_path)
+    try:
+        width, binary_digest = _read_header(binary_path)
+    except (OSError, ValueError):
+        return False
+    return binary_digest == digest
+
+
+def _rebuild(build, json_path):
+    '''
+    Rebuilds out of date binaries with build_binary or build_partitions. Failing to isn't an error:
+    the caller falls back to reading the source list, just more slowly
+    '''
+    try:
+        build(json_path)
+    except (OSError, ValueError):
+        pass
+
+
+def _read_length(json_path, length):
+    '''
+    Reads just the words of one length from a word list, using the smallest up to date file available:
+    the partition for that length, then the binary for the whole list, then the source list itself.
+    Binaries that were built from an earlier version of the source list are rebuilt from it
+    '''
+    digest = _source_digest(json_path)
+
+    partition_path = binary_path_for(json_path, length)
+    if os.path.exists(partition_path) and not _is_fresh(partition_path, digest):
+        _rebuild(build_partitions, json_path)
+    if _is_fresh(partition_path, digest):
+        return _read_binary(partition_path)
+
+    binary_path = binary_path_for(json_path)
+    if os.path.exists(binary_path) and not _is_fresh(binary_path, digest):
+        _rebuild(build_binary, json_path)
+    if _is_fresh(binary_path, digest):
+        # Whole-list binaries only ever hold one length of word
+        if _binary_width(binary_path) != length:
+            return ()
+        return _read_binary(binary_path)
+
+    return tuple(word.lower() for word in _read_words(json_path)
+                 if len(word) == length and letterutils.is_word_naively_valid(word, length))
+
+
+class SharedWordList:
+    '''
+    An immutable, loaded word list that is shared by everything in the process that uses the same list.
+    The words are a tuple and the WordIndex is built the first time it's asked for; both are safe to use from any thread.
+    Entries are reference counted: get one with acquire() and hand it back with release() when finished,
+    and once nothing is using it the list is evicted from the registry so its memory can be freed.
+    Usage:
+        words = wordlist.acquire("./data/valid_words.json", 5)
+        "raise" in words.index
+        wordlist.release(words)
+    '''
+
+    __slots__ = ("_key", "_lock", "_words", "_index", "_refs", "_pinned")
+
+    def __init__(self, key):
+        self._key = key
+        self._lock = threading.Lock()
+        self._words = None
+        self._index = None
+        self._refs = 0
+        self._pinned = False
+
+
+    @property
+    def key(self):
+        ''' The (path, length) the list was loaded for '''
+        return self._key
+
+
+    @property
+    def refs(self):
+        ''' The number of acquire() calls that haven't been released yet '''
+        return self._refs
+
+
+    @property
+    def words(self):
+        ''' Tuple of the words in the list '''
+        words = self._words
+        if words == None:
+            with self._lock:
+                if self._words == None:
+                    json_path, length = self._key
+                    with instrumentation.timer("wordlist.read"):
+                        self._words = _read_list(json_path, length)
+                words = self._words
+        return words
+
+
+    @property
+    def index(self):
+        ''' The WordIndex over the words '''
+        index = self._index
+        if index == None:
+            words = self.words
+            with self._lock:
+                if self._index == None:
+                    with instrumentation.timer("wordlist.index"):
+                        self._index = WordIndex(words)
+                index = self._index
+        return index
+
+
+def _read_list(json_path, length):
+    '''
+    Reads a word list, preferring the compiled binary version if one has been built (see build_binary and build_partitions)
+    and it's up to date. Binaries that were built from an earlier version of the source list are rebuilt from it
+    '''
+    if length != None:
+        return _read_length(json_path, length)
+
+    digest = _source_digest(json_path)
+    binary_path = binary_path_for(json_path)
+    if os.path.exists(binary_path) and not _is_fresh(binary_path, digest):
+        _rebuild(build_binary, json_path)
+    if _is_fresh(binary_path, digest):
+        return _read_binary(binary_path)
+    return _read_words(json_path)
+
+
+def _entry_for(json_path, length, pin):
+    '''
+    Gets (creating if needed) the registry entry for a list and adds a reference to it, or pins it
+    '''
+    key = (json_path, length)
+    with _registry_lock:
+        entry = _registry.get(key)
+        if entry == None:
+            entry = SharedWordList(key)
+            _registry[key] = entry
+        else:
+            instrumentation.count("wordlist.cache_hits")
+
+        if pin:
+            entry._pinned = True
+        else:
+            entry._refs += 1
+    return entry
+
+
+def acquire(json_path, length=None):
+    '''
+    Gets a shared, reference counted, word list. Every call must be matched by a call to release()
+    Arguments:
+        json_path: the path to the (json or plain-text) word list
+        [optional] length: only load the words with this many letters. Defaults to every word in the list
+    Returns: the SharedWordList. The words are loaded on first use
+    '''
+    return _entry_for(json_path, length, False)
+
+
+def release(entry):
+    '''
+    Hands back a word list from acquire(). Once nothing is using a list it's evicted from the registry
+    (unless it's been loaded with load_word_list or load_word_index, which keep lists for the life of the process)
+    Arguments:
+        entry: the SharedWordList to release
+    Raises: ValueError if the list has already been released as many times as it was acquired
+    '''
+    with _registry_lock:
+        if entry._refs <= 0:
+            raise ValueError(f"{entry.key} released more times than it was acquired")
+        entry._refs -= 1
+        if entry._refs == 0 and not entry._pinned and _registry.get(entry.key) is entry:
+            del _registry[entry.key]
+
+
+def loaded_keys():
+    '''
+    Gets the word lists that are currently in the registry
+    Returns: list of (path, length) keys
+    '''
+    with _registry_lock:
+        return [key for key, entry in _registry.items() if entry._words != None]
+
+
+def load_word_list(json_path, length=None):
+    '''
+    Loads a word list, preferring the compiled binary version if one has been built (see build_binary and build_partitions)
+    from the list as it is now. Lists are cached for the life of the process so only the first load of each list (and length) pays the cost of reading it.
+    Arguments:
+        json_path: the path to the (json or plain-text) word list
+        [optional] length: only load the words with this many letters. Defaults to every word in the list
+    Returns: a tuple of words. This is shared between all callers so must not be modified
+    '''
+    return _entry_for(json_path, length, True).words
+
+
+def load_word_index(json_path, length=None):
+    '''
+    Gets a WordIndex over a word list. Like the lists themselves, indexes are built once and shared.
+    Arguments:
+        json_path: the path to the (json or plain-text) word list
+        [optional] length: only index the words with this many letters. Defaults to every word in the list
+    Returns: the WordIndex
+    '''
+    return _entry_for(json_path, length, True).index
+
+
+def clear_cache():
+    '''
+    Forgets all of the cached word lists so that they will be reloaded from disk on next use.
+    Lists that are still acquired stay usable by whoever holds them
+    '''
+    with _registry_lock:
+        _registry.clear()
+
+
+def main():
+    '''
+    Compiles the word lists passed on the command-line (or the game's default lists) into binary files.
+    Lists with words of more than one length are split into one file per length
+    '''
+    paths = sys.argv[1:] or ["./data/answers.json", "./data/valid_words.json"]
+    for path in paths:
+        try:
+            print(f"{path} -> {build_binary(path)}")
+        except ValueError:
+            print(f"{path} -> {', '.join(build_partitions(path))}")
+
+
+if __name__ == "__main__":
+    main()
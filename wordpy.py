@@ -1,10 +1,14 @@
+import instrumentation
 import letterutils
+import os
 import sys
 
 from gameconfig import GameConfig
-from game import Game
 from datetime import date
 
+# Only the modules needed to parse the command-line are imported up front. The game itself (colorama,
+# the word lists, etc.) is imported once we know we're going to run it, so -help and bad arguments return quickly
+
 def main():
     # Read in the command line options and create the matching game data
     try:
@@ -13,13 +17,55 @@ def main():
         print_usage(e)
         sys.exit()
 
+    # Instrumentation is opt-in via -profile <file> or the WORDPY_PROFILE environment variable
+    if game_data.profile:
+        instrumentation.enable(game_data.profile)
+    else:
+        instrumentation.enable_from_environment()
+
+    # Batch mode scores a stream of guesses rather than running an interactive game
+    if game_data.batch:
+        import batchmode
+        try:
+            errors = batchmode.run(game_data.batch)
+        except OSError as e:
+            print(e)
+            sys.exit(1)
+        sys.exit(1 if errors > 0 else 0)
+
+    # Schedule exports write out the daily answers rather than running an interactive game
+    if game_data.schedule:
+        import schedule
+        import wordlist
+        from game import ANSWERS_PATH
+        answers = wordlist.load_word_list(game_data.dictionary or ANSWERS_PATH, game_data.length)
+        start, end = game_data.schedule
+        try:
+            schedule.export_schedule(answers, start, end, game_data.output)
+        except (ValueError, OSError) as e:
+            print(e)
+            sys.exit(1)
+        return
+
+    # Simulations play every answer with a strategy rather than running an interactive game
+    if game_data.simulate:
+        import simulate
+        result = simulate.run_simulation(game_data.simulate)
+        print(result.format_report())
+        return
+
     # Now create our Game object and run it
+    from game import Game
     game = Game(game_data)
     try:
         game.run()
     # Capture Ctrl + C and quit gracefully
     except KeyboardInterrupt:
         sys.exit()
+    # The word lists are only loaded once the game starts, so e.g. a -dict without any words of the -length ends up here
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
 
 def create_game_data_from_args(argv):
     """
@@ -37,8 +83,21 @@ def create_game_data_from_args(argv):
     current_arg = 1
     game_date = None
     word = None
+    absurdle = False
+    boards = 1
     infinite = False
     random = False
+    strategy = None
+    hint = False
+    hard = False
+    profile = None
+    batch = None
+    history = None
+    length = letterutils.WORD_LENGTH
+    dictionary = None
+    schedule = None
+    output = None
+    word_index = None
 
     # Iterate through the provided arguments determining their meaning and performing any further validation
     while current_arg < num_args:
@@ -49,23 +108,78 @@ def create_game_data_from_args(argv):
                 # throwing here will result in the usage being printed out as desired.
                 raise ValueError()
 
+            case "-absurdle":
+                absurdle = True
+
+            # The -batch argument must be followed by the file to read (or - for stdin)
+            case "-batch":
+                current_arg += 1
+                batch = parse_batch(argv, current_arg)
+
+            # The -boards argument must be followed by the number of boards to play at once
+            case "-boards":
+                current_arg += 1
+                boards = parse_boards(argv, current_arg)
+
+            # The -dict argument must be followed by the path of a word list (json or one word per line)
+            case "-dict":
+                current_arg += 1
+                dictionary = parse_dictionary(argv, current_arg)
+
             # The -date argument must be followed by a date in ISO format (YYYY-MM-DD)
             case "-date":
                 # Need to increment current_arg to that we read the next argument
                 current_arg += 1
                 game_date = parse_date(argv, current_arg)
 
+            case "-hard":
+                hard = True
+
+            case "-hint":
+                hint = True
+
+            # The -history argument must be followed by the database file to record finished games in
+            case "-history":
+                current_arg += 1
+                history = parse_history(argv, current_arg)
+
+            # The -length argument must be followed by the number of letters in each word
+            case "-length":
+                current_arg += 1
+                length = parse_length(argv, current_arg)
+
             case "-infinite":
                 infinite = True
 
+            # The -profile argument must be followed by the file to write the profiling results to
+            case "-profile":
+                current_arg += 1
+                profile = parse_profile(argv, current_arg)
+
+            # The -output argument must be followed by the file to export the -schedule to
+            case "-output":
+                current_arg += 1
+                output = parse_output(argv, current_arg)
+
             case "-random":
                 random = True
 
-            # The -word argument must be followed by a 5 letter (a-zA-Z) word
+            # The -schedule argument must be followed by the first and last dates (ISO format) to export
+            case "-schedule":
+                schedule = (parse_date(argv, current_arg + 1), parse_date(argv, current_arg + 2))
+                current_arg += 2
+
+            # The -simulate argument must be followed by the name of a guessing strategy
+            case "-simulate":
+                current_arg += 1
+                strategy = parse_strategy(argv, current_arg)
+
+            # The -word argument must be followed by a (a-zA-Z) word with the right number of letters.
+            # It's checked once all of the arguments have been read, as -length might come after it
             case "-word":
                 # Need to increment current_arg to that we read the next argument
                 current_arg += 1
-                word = parse_word(argv, current_arg)
+                word_index = current_arg
 
             # Unexpected arguments mean that we should reject everything
             case _:
@@ -74,7 +188,12 @@ def create_game_data_from_args(argv):
         # Move on to the next argument
         current_arg += 1
 
-    return GameConfig(forceddate=game_date, word=word, infinite=infinite, random=random)
+    if word_index != None:
+        word = parse_word(argv, word_index, length)
+
+    return GameConfig(forceddate=game_date, word=word, infinite=infinite, random=random, simulate=strategy, hint=hint, hard=hard, profile=profile, batch=batch, history=history,
+                      length=length, dictionary=dictionary, absurdle=absurdle,
+                      schedule=schedule, output=output, boards=boards)
 
 
 def parse_date(argv, index):
@@ -104,13 +223,14 @@ def parse_date(argv, index):
         raise ValueError(f"Invalid date argument: {dateArg}")
 
 
-def parse_word(argv, index):
+def parse_word(argv, index, length=letterutils.WORD_LENGTH):
     """
     Parse the word parameter from the command-line args and return it
-    Input word is expected to be 5-letters all in the range of a-Z|A-Z
+    Input word is expected to be 5-letters (or the specified length) all in the range of a-Z|A-Z
     Arguments:
         argv: the command-line parameters passed to the program
         index: the index to read the word argument from
+        [optional] length: the number of letters the word must have
     Returns: the created date object
     Raises:
         IndexError: when negative index is supplied
@@ -125,11 +245,184 @@ def parse_word(argv, index):
 
     # Next check that the word is the correct length and character set
     wordArg = argv[index]
-    if letterutils.is_word_naively_valid(wordArg) == False:
+    if letterutils.is_word_naively_valid(wordArg, length) == False:
         raise ValueError(f"Invalid word argument: {wordArg}")
     return wordArg
 
 
+def parse_length(argv, index):
+    """
+    Parse the length parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the length argument from
+    Returns: the word length
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when length argument is missing, or is not a supported word length
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing length argument")
+
+    lengthArg = argv[index]
+    if not lengthArg.isdigit() or not letterutils.is_supported_length(int(lengthArg)):
+        raise ValueError(f"Invalid length argument: {lengthArg} (expected {letterutils.MIN_WORD_LENGTH}-{letterutils.MAX_WORD_LENGTH})")
+    return int(lengthArg)
+
+
+def parse_boards(argv, index):
+    """
+    Parse the boards parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the boards argument from
+    Returns: the number of boards
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when boards argument is missing or isn't a number
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing boards argument")
+
+    boardsArg = argv[index]
+    if not boardsArg.isdigit():
+        raise ValueError(f"Invalid boards argument: {boardsArg}")
+    return int(boardsArg)
+
+
+def parse_dictionary(argv, index):
+    """
+    Parse the dictionary parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the dictionary argument from
+    Returns: the path of the dictionary file
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when dictionary argument is missing, or the file doesn't exist
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing dictionary argument")
+
+    dictionaryArg = argv[index]
+    if not os.path.isfile(dictionaryArg):
+        raise ValueError(f"Dictionary not found: {dictionaryArg}")
+    return dictionaryArg
+
+
+def parse_strategy(argv, index):
+    """
+    Parse the strategy parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the strategy argument from
+    Returns: the strategy name
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when strategy argument is missing, or is not a known strategy
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing strategy argument")
+
+    import simulate
+    strategyArg = argv[index]
+    if strategyArg not in simulate.STRATEGIES:
+        raise ValueError(f"Invalid strategy argument: {strategyArg} (expected one of {', '.join(simulate.STRATEGIES)})")
+    return strategyArg
+
+
+def parse_batch(argv, index):
+    """
+    Parse the batch parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the batch argument from
+    Returns: the path of the file to read the batch from, or - for stdin
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when batch argument is missing
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing batch argument")
+
+    return argv[index]
+
+
+def parse_history(argv, index):
+    """
+    Parse the history parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the history argument from
+    Returns: the path of the history database
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when history argument is missing
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing history argument")
+
+    return argv[index]
+
+
+def parse_output(argv, index):
+    """
+    Parse the output parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the output argument from
+    Returns: the path of the file to write
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when output argument is missing
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing output argument")
+
+    return argv[index]
+
+
+def parse_profile(argv, index):
+    """
+    Parse the profile parameter from the command-line args and return it
+    Arguments:
+        argv: the command-line parameters passed to the program
+        index: the index to read the profile argument from
+    Returns: the path to write the profiling results to
+    Raises:
+        IndexError: when negative index is supplied
+        ValueError: when profile argument is missing
+    """
+    if index < 0:
+        raise IndexError(index)
+
+    if index >= len(argv):
+        raise ValueError(f"Missing profile argument")
+
+    return argv[index]
+
+
 def print_usage(errorStr = None):
     """
     Prints out the valid command-line usage for this program.
@@ -139,19 +432,54 @@ def print_usage(errorStr = None):
     if str and len(str(errorStr)) > 0: print(errorStr)
     print(  "usage project.py [option]\n" +
             "  options:\n" +
+            "   -absurdle         : adversarial mode. The answer isn't picked up front: after each guess\n" +
+            "                       the game keeps the largest group of answers that fit all of the hints\n" +
+            "                       Incompatible with -batch, -date, -simulate or -word\n" +
+            "   -batch <file>     : scores the guesses in a file (or - for stdin) without playing interactively\n" +
+            "                       Each line holds an answer followed by one or more guesses, and is output\n" +
+            "                       as: <answer> <guess> <score> [<guess> <score> ...] where each score has a\n" +
+            "                       digit per letter (0 = wrong, 1 = wrong place, 2 = correct)\n" +
+            "                       Incompatible with -date, -infinite, -random, -simulate or -word\n" +
+            "   -boards <n>       : plays n (2-16) boards at once, e.g. 4 for Quordle or 8 for Octordle.\n" +
+            "                       Each guess is played on every board, with n + 5 guesses to solve them all\n" +
+            "                       Incompatible with -absurdle, -hard, -hint, -history or -word\n" +
             "   -date <date>      : forces the game to use the word from the specified date\n" +
             "                       The date must be provided in ISO format: YYYY-MM-DD\n" +
             "                       Defaults to today's date\n" +
             "                       Incompatible with -infinite, -random or -word\n" +
+            "   -dict <file>      : uses the words in the file (json {\"words\": [...]} or one word per line)\n" +
+            "                       as both the answers and the valid guesses\n" +
+            "   -hard             : every guess must be consistent with all of the hints revealed so far\n" +
+            "                       Defaults to False\n" +
             "   -help, -?         : displays this usage help\n" +
+            "   -hint             : shows a suggested next guess while playing\n" +
+            "                       Defaults to False\n" +
+            "   -history <file>   : records each finished game in the file (an SQLite database) and shows\n" +
+            "                       your statistics (win rate, streaks and guess distribution) at the end\n" +
+            "   -length <n>       : plays with words of n letters (4-8). Defaults to 5\n" +
+            "                       Other lengths need a -dict with words of that length\n" +
             "   -infinite         : puts the game into infinite looping mode where you can play\n" +
             "                       continuously (implies -random)\n" +
             "                       Incompatible with -date or -word\n" +
             "                       Defaults to False\n" +
+            "   -output <file>    : writes the -schedule to a file: .json for a json {date: answer} object,\n" +
+            "                       .bin for a compact schedule index (as used by the game and server) and\n" +
+            "                       anything else for CSV. Defaults to CSV on stdout\n" +
+            "   -profile <file>   : records timings of word list loading, validation, scoring, rendering\n" +
+            "                       and input and writes them to the file on exit. A .json file gets a\n" +
+            "                       summary of counters and latency histograms, any other file gets\n" +
+            "                       cProfile (pstats) data. The WORDPY_PROFILE environment variable\n" +
+            "                       can be set to a file instead\n" +
             "   -random           : forces the game to use a random word\n" +
             "                       Incompatible with -date or -word\n" +
             "                       Defaults to False\n" +
-            "   -word <word>      : forces the use of the specified 5-letter word\n" +
+            "   -schedule <start> <end> : exports the daily answer for every date from start to end\n" +
+            "                       (ISO format: YYYY-MM-DD) rather than playing (see -output)\n" +
+            "                       Incompatible with -absurdle, -batch, -date, -infinite, -random, -simulate or -word\n" +
+            "   -simulate <name>  : plays every possible answer using the named guessing strategy\n" +
+            "                       and reports the results (e.g. -simulate candidate)\n" +
+            "                       Incompatible with -date, -infinite, -random or -word\n" +
+            "   -word <word>      : forces the use of the specified word (5 letters, or the -length)\n" +
             "                       Incompatible with -date, -infinite or -random")
 
 